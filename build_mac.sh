@@ -8,11 +8,14 @@ PYTHON=python3
 # 安装依赖
 $PYTHON -m pip install pyinstaller wxPython pillow
 
+# 预编译宠物包（打包后的应用启动时无需解码 GIF；同时编译 2x 版本供高 DPI 屏幕使用）
+$PYTHON -m gif_player.petpack oiiai_cat.gif --dpi 1 2
+
 # 清理之前的构建
 rm -rf build dist
 
 # 打包应用
-$PYTHON -m PyInstaller --onedir --windowed --name="桌面宠物" --add-data="oiiai_cat.gif:." --add-data="work_incentive/work_incentive_config.json.example:work_incentive" -y main.py
+$PYTHON -m PyInstaller --onedir --windowed --name="桌面宠物" --add-data="oiiai_cat.gif:." --add-data="oiiai_cat.petpack:." --add-data="oiiai_cat@2x.petpack:." --add-data="work_incentive/work_incentive_config.json.example:work_incentive" -y main.py
 
 # 复制配置文件示例到dist目录
 cp work_incentive/work_incentive_config.json.example dist/桌面宠物.app/Contents/Resources/work_incentive/
@@ -28,7 +28,44 @@ class Config:
         "DIALOG_ROUND_RADIUS": 15,                        # 圆角半径
         "DIALOG_AUTO_CLOSE_TIME": 3000,                   # 自动关闭时间（毫秒）
         "DIALOG_MAX_WIDTH": 200,                          # 对话框最大宽度
-        "DRAG_THRESHOLD": 5                               # 拖拽阈值（像素），小于此值视为点击
+        "DRAG_THRESHOLD": 5,                              # 拖拽阈值（像素），小于此值视为点击
+        "FRAME_CACHE_ENABLED": True,                      # 是否启用解码帧磁盘缓存
+        "FRAME_CACHE_MAX_MB": 256,                        # 帧缓存总大小上限（MB）
+        "DECODE_WORKERS": 0,                              # 并行缩放线程数（0 表示按 CPU 核数自动选择，1 表示串行）
+        "PARALLEL_DECODE_MIN_KB": 8192,                   # GIF 文件小于该大小（KB）时串行解码（合成只能串行，小文件并行没有收益）
+        "FRAME_MEMORY_BUDGET_MB": 0,                      # 常驻帧位图的内存预算（MB），0 表示不限制
+        "FRAME_PREFETCH": 2,                              # 播放时预先准备的后续帧数
+        "FRAME_ENCODING": "full",                         # 帧编码方式：full（完整帧）/ delta（关键帧 + 脏矩形）
+        "COALESCE_DUPLICATE_FRAMES": True,                # 是否合并重复帧（连续重复帧合并延迟，不相邻的共享位图）
+        "RENDER_SCALE": 0.5,                              # 宠物显示缩放比例（未设置 RENDER_BOX 时生效）
+        "RENDER_BOX": None,                               # 目标显示框 [宽, 高]，设置后宠物等比缩放到恰好放进该框
+        "RESAMPLE_QUALITY": "auto",                       # 缩放质量：fast / balanced / high / nearest / auto（按帧数 × 面积自动选择）
+        "FRAME_STORAGE": "bitmaps",                       # 帧存储方式：bitmaps（每帧一个位图）/ atlas（拼成图集）/ indexed（调色板索引，显示时展开）/ mipmap（多级纹理，缩放更清晰），仅 full 编码时生效
+        "ATLAS_MAX_SIZE": 2048,                           # 图集单页的最大边长（像素）
+        "INDEXED_BITMAP_CACHE": 8,                        # indexed 存储时就绪位图缓存的帧数
+        "BINARY_ALPHA_MASK": True,                        # 透明度只有 0/255 的帧改用 RGB + 掩码（bitmaps / atlas 存储时生效）
+        "BINARY_ALPHA_THRESHOLD": False,                  # 缩放产生的半透明边缘也按 50% 取阈值改用掩码（绘制更快，但边缘出现锯齿）
+        "STREAMING_MIN_MB": 64,                           # GIF 文件不小于该大小（MB）时流式播放，0 表示不启用
+        "STREAM_BUFFER_FRAMES": 8,                        # 流式播放时领先当前帧解码的帧数（环形缓冲容量）
+        "TRIM_TRANSPARENT_BORDER": True,                  # 是否裁剪所有帧共同的透明边缘（缩小位图、窗口和重绘面积；首次解码要等全部帧解码完才显示，流式播放不裁剪）
+        "PREFER_PETPACK": True,                           # GIF 同目录下有匹配的 .petpack 预编译宠物包时优先使用
+        "PREFLIGHT_MAX_FRAMES": 1000,                     # 最多保留的帧数，超出时抽帧（总时长不变），0 表示不限制
+        "PREFLIGHT_MAX_DECODED_MB": 512,                  # 缩放后所有帧的解码数据上限（MB），超出时自动缩小，0 表示不限制
+        "PREFLIGHT_MAX_CANVAS_MP": 16,                    # GIF 画布像素上限（百万像素），超出时拒绝加载，0 表示不限制
+        "DECODE_SANDBOX": False,                          # 是否在受限子进程中解码 GIF（畸形文件不会拖垮宠物进程，但要等整个文件解码完才显示首帧）
+        "SANDBOX_MEMORY_MB": 1024,                        # 解码子进程的地址空间上限（MB），0 表示不限制
+        "SANDBOX_CPU_SECONDS": 60,                        # 解码子进程的 CPU 时间上限（秒），0 表示不限制
+        "SANDBOX_TIMEOUT_SECONDS": 120,                   # 解码子进程的墙钟超时（秒），0 表示不限制
+        "DPI_AWARE_FRAMES": True,                         # 是否按所在屏幕的 DPI 缩放倍数构建帧（高 DPI 屏幕上更清晰）
+        "DPI_VARIANT_CACHE": 1,                           # 除当前显示的帧变体外，最多常驻内存的其他 DPI 变体数
+        "PET_ZOOM": 1.0,                                  # 宠物缩放倍数（鼠标滚轮或右键菜单调整，自动保存）
+        "ZOOM_MIN": 0.25,                                 # 最小缩放倍数
+        "ZOOM_MAX": 2.0,                                  # 最大缩放倍数
+        "ZOOM_BITMAP_CACHE": 0,                           # mipmap 存储在当前缩放倍数下最多缓存的位图数，0 表示不限制
+        "TICK_COALESCE_MS": 4,                            # 统一定时器合并截止时间相近的任务的窗口（毫秒）
+        "VISIBILITY_CHECK_MS": 2000,                      # 检查宠物是否在任何屏幕上、会话是否锁屏的间隔（毫秒）
+        "POWER_PROFILE": "auto",                          # 电源模式：auto（电池供电时省电，否则均衡）/ performance / balanced / battery，可在托盘菜单切换
+        "POWER_CHECK_MS": 30000                           # 自动电源模式下检查供电方式的间隔（毫秒）
     }
     
     # 用户配置文件路径
@@ -66,6 +103,43 @@ class Config:
     DIALOG_AUTO_CLOSE_TIME = DEFAULT_CONFIG["DIALOG_AUTO_CLOSE_TIME"]
     DIALOG_MAX_WIDTH = DEFAULT_CONFIG["DIALOG_MAX_WIDTH"]
     DRAG_THRESHOLD = DEFAULT_CONFIG["DRAG_THRESHOLD"]
+    FRAME_CACHE_ENABLED = DEFAULT_CONFIG["FRAME_CACHE_ENABLED"]
+    FRAME_CACHE_MAX_MB = DEFAULT_CONFIG["FRAME_CACHE_MAX_MB"]
+    DECODE_WORKERS = DEFAULT_CONFIG["DECODE_WORKERS"]
+    PARALLEL_DECODE_MIN_KB = DEFAULT_CONFIG["PARALLEL_DECODE_MIN_KB"]
+    FRAME_MEMORY_BUDGET_MB = DEFAULT_CONFIG["FRAME_MEMORY_BUDGET_MB"]
+    FRAME_PREFETCH = DEFAULT_CONFIG["FRAME_PREFETCH"]
+    FRAME_ENCODING = DEFAULT_CONFIG["FRAME_ENCODING"]
+    COALESCE_DUPLICATE_FRAMES = DEFAULT_CONFIG["COALESCE_DUPLICATE_FRAMES"]
+    RENDER_SCALE = DEFAULT_CONFIG["RENDER_SCALE"]
+    RENDER_BOX = DEFAULT_CONFIG["RENDER_BOX"]
+    RESAMPLE_QUALITY = DEFAULT_CONFIG["RESAMPLE_QUALITY"]
+    FRAME_STORAGE = DEFAULT_CONFIG["FRAME_STORAGE"]
+    ATLAS_MAX_SIZE = DEFAULT_CONFIG["ATLAS_MAX_SIZE"]
+    INDEXED_BITMAP_CACHE = DEFAULT_CONFIG["INDEXED_BITMAP_CACHE"]
+    BINARY_ALPHA_MASK = DEFAULT_CONFIG["BINARY_ALPHA_MASK"]
+    BINARY_ALPHA_THRESHOLD = DEFAULT_CONFIG["BINARY_ALPHA_THRESHOLD"]
+    STREAMING_MIN_MB = DEFAULT_CONFIG["STREAMING_MIN_MB"]
+    STREAM_BUFFER_FRAMES = DEFAULT_CONFIG["STREAM_BUFFER_FRAMES"]
+    TRIM_TRANSPARENT_BORDER = DEFAULT_CONFIG["TRIM_TRANSPARENT_BORDER"]
+    PREFER_PETPACK = DEFAULT_CONFIG["PREFER_PETPACK"]
+    PREFLIGHT_MAX_FRAMES = DEFAULT_CONFIG["PREFLIGHT_MAX_FRAMES"]
+    PREFLIGHT_MAX_DECODED_MB = DEFAULT_CONFIG["PREFLIGHT_MAX_DECODED_MB"]
+    PREFLIGHT_MAX_CANVAS_MP = DEFAULT_CONFIG["PREFLIGHT_MAX_CANVAS_MP"]
+    DECODE_SANDBOX = DEFAULT_CONFIG["DECODE_SANDBOX"]
+    SANDBOX_MEMORY_MB = DEFAULT_CONFIG["SANDBOX_MEMORY_MB"]
+    SANDBOX_CPU_SECONDS = DEFAULT_CONFIG["SANDBOX_CPU_SECONDS"]
+    SANDBOX_TIMEOUT_SECONDS = DEFAULT_CONFIG["SANDBOX_TIMEOUT_SECONDS"]
+    DPI_AWARE_FRAMES = DEFAULT_CONFIG["DPI_AWARE_FRAMES"]
+    DPI_VARIANT_CACHE = DEFAULT_CONFIG["DPI_VARIANT_CACHE"]
+    PET_ZOOM = DEFAULT_CONFIG["PET_ZOOM"]
+    ZOOM_MIN = DEFAULT_CONFIG["ZOOM_MIN"]
+    ZOOM_MAX = DEFAULT_CONFIG["ZOOM_MAX"]
+    ZOOM_BITMAP_CACHE = DEFAULT_CONFIG["ZOOM_BITMAP_CACHE"]
+    TICK_COALESCE_MS = DEFAULT_CONFIG["TICK_COALESCE_MS"]
+    VISIBILITY_CHECK_MS = DEFAULT_CONFIG["VISIBILITY_CHECK_MS"]
+    POWER_PROFILE = DEFAULT_CONFIG["POWER_PROFILE"]
+    POWER_CHECK_MS = DEFAULT_CONFIG["POWER_CHECK_MS"]
     
     # 用户配置
     user_config = DEFAULT_CONFIG.copy()
@@ -111,6 +185,28 @@ class Config:
         cls.user_config["GIF_PATH"] = gif_path
         cls.save_user_config()
     
+    @classmethod
+    def set_pet_zoom(cls, zoom):
+        """设置宠物缩放倍数并保存配置
+        
+        Args:
+            zoom: 缩放倍数
+        """
+        cls.PET_ZOOM = zoom
+        cls.user_config["PET_ZOOM"] = zoom
+        cls.save_user_config()
+    
+    @classmethod
+    def set_power_profile(cls, profile):
+        """设置电源模式并保存配置
+        
+        Args:
+            profile: 电源模式名称（auto / performance / balanced / battery）
+        """
+        cls.POWER_PROFILE = profile
+        cls.user_config["POWER_PROFILE"] = profile
+        cls.save_user_config()
+    
     @staticmethod
     def get_gif_path():
         """获取GIF文件的绝对路径
@@ -133,6 +229,15 @@ class Config:
             return Config.GIF_PATH
         return os.path.join(os.path.dirname(os.path.abspath(__file__)), Config.GIF_PATH)
     
+    @staticmethod
+    def get_frame_cache_dir():
+        """获取解码帧缓存目录（与用户配置文件位于同一目录）
+        
+        Returns:
+            str: 缓存目录的路径
+        """
+        return os.path.join(os.path.dirname(Config.USER_CONFIG_PATH), ".pet_frame_cache")
+    
     @staticmethod
     def get_dialog_texts():
         """获取对话框随机文本列表
@@ -8,6 +8,13 @@
 import wx
 import math
 
+import power
+from ticker import get_ticker
+
+# 出现动画和消失动画的总时长（毫秒），步数按电源模式的界面动画帧率计算
+SHOW_DURATION_MS = 384
+HIDE_DURATION_MS = 192
+
 
 class CuteDialog(wx.Dialog):
     """可爱的自定义对话框"""
@@ -61,6 +68,7 @@ class CuteDialog(wx.Dialog):
         # 绑定绘制事件
         self.Bind(wx.EVT_PAINT, self.on_paint)
         self.Bind(wx.EVT_ERASE_BACKGROUND, lambda event: None)  # 防止闪烁
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
         
         # 自动调整尺寸
         self.Fit()
@@ -72,7 +80,14 @@ class CuteDialog(wx.Dialog):
         self.start_position = wx.Point(0, 0)  # 动画起始位置
         self.end_position = wx.Point(0, 0)    # 动画结束位置
         self.bounce_amplitude = 15  # 回弹幅度
-    
+
+    def on_destroy(self, event):
+        """窗口销毁时取消动画任务（共享定时器不会随窗口一起停止）"""
+        if event.GetEventObject() is self and self.animation_timer:
+            self.animation_timer.stop()
+            self.animation_timer = None
+        event.Skip()
+
     def on_paint(self, event):
         """绘制可爱的对话框背景"""
         dc = wx.AutoBufferedPaintDC(self)
@@ -141,23 +156,23 @@ class CuteDialog(wx.Dialog):
         self.SetPosition(self.start_position)
         self.Show()
         
-        # 初始化动画变量
+        # 初始化动画变量（总时长固定，步数和刷新间隔由电源模式决定）
+        profile = power.active_profile()
         self.animation_step = 0
+        self.animation_max_steps = profile.ui_steps(SHOW_DURATION_MS)
         
         # 创建动画定时器
         if self.animation_timer:
-            self.animation_timer.Stop()
+            self.animation_timer.stop()
             self.animation_timer = None
         
-        self.animation_timer = wx.Timer(self)
-        self.Bind(wx.EVT_TIMER, self.on_animation_timer, self.animation_timer)
-        self.animation_timer.Start(16)  # 约60fps
+        self.animation_timer = get_ticker().call_every(profile.ui_interval, self.on_animation_timer)
     
-    def on_animation_timer(self, event):
+    def on_animation_timer(self):
         """动画定时器事件"""
         if self.animation_step >= self.animation_max_steps:
             # 动画结束，停止定时器
-            self.animation_timer.Stop()
+            self.animation_timer.stop()
             self.animation_timer = None
             return
         
@@ -195,9 +210,10 @@ class CuteDialog(wx.Dialog):
     def hide_with_animation(self):
         """显示对话框消失动画（嗖一下收起来的效果）"""
         print("执行对话框消失动画")
-        # 初始化消失动画变量
+        # 初始化消失动画变量（较快的动画）
+        profile = power.active_profile()
         self.animation_step = 0
-        self.animation_max_steps = 12  # 消失动画总步数，较快的动画
+        self.animation_max_steps = profile.ui_steps(HIDE_DURATION_MS)
         self.start_position = self.GetPosition()
         self.start_size = self.GetSize()
         self.end_size = (0, 0)  # 最终尺寸
@@ -205,21 +221,19 @@ class CuteDialog(wx.Dialog):
         # 创建动画定时器
         if self.animation_timer:
             print("停止并销毁已有动画定时器")
-            self.animation_timer.Stop()
+            self.animation_timer.stop()
             self.animation_timer = None
         
-        self.animation_timer = wx.Timer(self)
-        self.Bind(wx.EVT_TIMER, self.on_hide_animation_timer, self.animation_timer)
-        self.animation_timer.Start(16)  # 约60fps
+        self.animation_timer = get_ticker().call_every(profile.ui_interval, self.on_hide_animation_timer)
         print("消失动画定时器已启动")
 
-    def on_hide_animation_timer(self, event):
+    def on_hide_animation_timer(self):
         """消失动画定时器事件"""
         print(f"消失动画步骤: {self.animation_step}/{self.animation_max_steps}")
         if self.animation_step >= self.animation_max_steps:
             # 动画结束，关闭对话框
             print("消失动画结束，关闭对话框")
-            self.animation_timer.Stop()
+            self.animation_timer.stop()
             self.animation_timer = None
             self.Hide()
             self.Destroy()  # 动画结束后彻底销毁对话框
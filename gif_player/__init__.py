@@ -0,0 +1,40 @@
+import importlib
+
+from .decoder import DecodedFrame, decode_gif_frames, default_worker_count
+from .cache import FrameCache
+from .petpack import compile_petpack, load_petpack, petpack_dpi_scale
+from .preflight import GifInfo, PreflightPlan, inspect_gif, plan_gif_load
+from .sandbox import DecodeSandbox, SandboxError
+from .scaling import FrameScaling, resize_image, resolve_quality
+from .scheduler import FrameDelays, FrameScheduler
+from .variants import FrameVariantCache
+
+# 依赖 wx 的模块在第一次访问时才导入：解码沙箱子进程和 petpack 命令行
+# 只用到上面的纯图像处理模块，导入 gif_player 时不应加载 wx
+_LAZY_EXPORTS = {
+    "frame_to_bitmap": ".bitmap",
+    "image_to_bitmap": ".bitmap",
+    "AtlasBuilder": ".atlas",
+    "AtlasFrameStore": ".atlas",
+    "compute_atlas_layout": ".atlas",
+    "FrameCanvas": ".canvas",
+    "DeltaFrameStore": ".delta",
+    "IndexedFrameStore": ".indexed",
+    "GifLoader": ".loader",
+    "MipmapFrameStore": ".mipmap",
+    "FrameStore": ".store",
+    "StreamingFrameStore": ".stream",
+}
+
+
+def __getattr__(name):
+    """按需导入依赖 wx 的导出名"""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = ["GifLoader", "DecodedFrame", "decode_gif_frames", "frame_to_bitmap", "image_to_bitmap", "FrameCache", "FrameStore", "DeltaFrameStore", "AtlasFrameStore", "IndexedFrameStore", "StreamingFrameStore", "AtlasBuilder", "compute_atlas_layout", "FrameCanvas", "FrameScaling", "resize_image", "resolve_quality", "default_worker_count", "compile_petpack", "load_petpack", "petpack_dpi_scale", "GifInfo", "PreflightPlan", "inspect_gif", "plan_gif_load", "DecodeSandbox", "SandboxError", "FrameVariantCache", "MipmapFrameStore", "FrameDelays", "FrameScheduler"]
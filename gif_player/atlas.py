@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""图集帧存储模块
+
+把当前宠物的所有缩放后帧按网格拼进一张或几张大位图（图集），播放时只绘制当前帧所在的
+子矩形。在 Windows 上每个 wx.Bitmap 都对应一个 GDI 对象，用图集可以把几十上百个对象
+减少到几个。
+
+所有帧尺寸相同，布局只由帧尺寸和图集边长上限决定：第 n 个不重复画面放在第 n 个格子，
+按行优先依次填满每页。布局在加载时计算一次，并随帧缓存一起保存。
+"""
+
+from PIL import Image
+
+from .bitmap import frame_to_bitmap
+from .decoder import DecodedFrame
+
+
+def compute_atlas_layout(frame_width, frame_height, max_size):
+    """计算图集布局
+
+    Args:
+        frame_width: 帧宽度
+        frame_height: 帧高度
+        max_size: 图集单页的最大边长（像素）
+
+    Returns:
+        dict: 布局信息（帧尺寸、每页列数和行数、边长上限）
+    """
+    return {
+        "max_size": max_size,
+        "frame_width": frame_width,
+        "frame_height": frame_height,
+        "columns": max(1, max_size // frame_width),
+        "rows": max(1, max_size // frame_height),
+    }
+
+
+def slot_position(layout, slot):
+    """计算格子所在的页和子矩形
+
+    Args:
+        layout: 图集布局
+        slot: 格子编号
+
+    Returns:
+        tuple: (页编号, (x, y, 宽, 高))
+    """
+    per_page = layout["columns"] * layout["rows"]
+    page, cell = divmod(slot, per_page)
+    row, column = divmod(cell, layout["columns"])
+    width, height = layout["frame_width"], layout["frame_height"]
+    return page, (column * width, row * height, width, height)
+
+
+class AtlasBuilder:
+    """在工作线程中把帧图像拼成图集页"""
+
+    def __init__(self, layout):
+        """初始化构建器
+
+        Args:
+            layout: 图集布局
+        """
+        self.layout = layout
+        self.slot_count = 0
+        self.page_count = 0
+        self._page = None
+        self._page_slots = 0
+
+    def add(self, image):
+        """把一帧放入下一个格子
+
+        Args:
+            image: 缩放后的 RGBA 图像
+
+        Returns:
+            DecodedFrame: 当前页被填满时返回该页（index 为页编号），否则返回 None
+        """
+        page_index, (x, y, _, _) = slot_position(self.layout, self.slot_count)
+        if self._page is None:
+            width = self.layout["columns"] * self.layout["frame_width"]
+            height = self.layout["rows"] * self.layout["frame_height"]
+            self._page = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+
+        self._page.paste(image, (x, y))
+        self.slot_count += 1
+        self._page_slots += 1
+
+        if self._page_slots == self.layout["columns"] * self.layout["rows"]:
+            return self._flush(page_index)
+        return None
+
+    def finish(self):
+        """结束构建
+
+        Returns:
+            DecodedFrame: 未填满的最后一页（裁掉空白行），没有时返回 None
+        """
+        if self._page is None:
+            return None
+        page_index, _ = slot_position(self.layout, self.slot_count - 1)
+        return self._flush(page_index)
+
+    def _flush(self, page_index):
+        """输出当前页并开始新的一页"""
+        columns = self.layout["columns"]
+        used_rows = (self._page_slots + columns - 1) // columns
+        used_columns = min(self._page_slots, columns)
+        page = self._page.crop((0, 0, used_columns * self.layout["frame_width"],
+                                used_rows * self.layout["frame_height"]))
+
+        self._page = None
+        self._page_slots = 0
+        self.page_count = page_index + 1
+        return DecodedFrame.from_image(page_index, page, 0)
+
+
+class AtlasFrameStore:
+    """图集帧存储
+
+    加载过程中，所在页尚未拼好的帧先用单独的位图显示；整页到达后换成图集页位图，
+    并释放这些单独的位图。
+    """
+
+    limited = False
+
+    def __init__(self):
+        """初始化帧存储"""
+        self.layout = None
+        self._frame_slots = []   # 帧索引 -> 格子编号（重复帧指向同一格子）
+        self._slot_count = 0     # 已分配的格子数（即不重复画面数）
+        self._pending = {}       # 格子编号 -> 所在页尚未到达时使用的单独位图
+        self._pages = {}         # 页编号 -> 图集页位图
+        self.frame_size = None
+
+    def __len__(self):
+        return len(self._frame_slots)
+
+    def append(self, frame):
+        """追加一帧（所在页到达前先创建单独的位图）
+
+        Args:
+            frame: 解码后的帧
+
+        Returns:
+            wx.Bitmap: 该帧的临时位图，重复帧返回 None
+        """
+        if frame.alias_of is not None:
+            self._frame_slots.append(self._frame_slots[frame.alias_of])
+            return None
+
+        slot = self._slot_count
+        self._slot_count += 1
+        self._frame_slots.append(slot)
+        self.frame_size = (frame.width, frame.height)
+        bitmap = frame_to_bitmap(frame)
+        self._pending[slot] = bitmap
+        return bitmap
+
+    def add_page(self, page, layout):
+        """加入一张拼好的图集页，并释放该页各帧的单独位图
+
+        Args:
+            page: 图集页（DecodedFrame，index 为页编号）
+            layout: 图集布局
+        """
+        self.layout = layout
+        self._pages[page.index] = frame_to_bitmap(page)
+        for slot in list(self._pending):
+            if slot_position(self.layout, slot)[0] == page.index:
+                del self._pending[slot]
+
+    def render(self, index, canvas):
+        """把指定帧显示到画布上（绘制图集页中的子矩形）
+
+        Args:
+            index: 帧索引
+            canvas: FrameCanvas
+        """
+        slot = self._frame_slots[index]
+        bitmap = self._pending.get(slot)
+        if bitmap is not None:
+            canvas.SetBitmap(bitmap)
+            return
+
+        page_index, rect = slot_position(self.layout, slot)
+        canvas.SetBitmap(self._pages[page_index], source_rect=rect)
+
+    def prefetch(self, start, count):
+        """图集页全部常驻，无需预取"""
+
+    def clear(self):
+        """清空所有帧"""
+        self.layout = None
+        self._frame_slots.clear()
+        self._slot_count = 0
+        self._pending.clear()
+        self._pages.clear()
+        self.frame_size = None
+
+    def stats(self):
+        """获取帧存储统计信息
+
+        Returns:
+            dict: 帧数、图集页数、位图对象数和常驻字节数
+        """
+        page_bytes = sum(bitmap.GetWidth() * bitmap.GetHeight() * 4 for bitmap in self._pages.values())
+        frame_bytes = self.frame_size[0] * self.frame_size[1] * 4 if self.frame_size else 0
+        return {
+            "frames": len(self._frame_slots),
+            "pages": len(self._pages),
+            "bitmap_objects": len(self._pages) + len(self._pending),
+            "resident_bytes": page_bytes + len(self._pending) * frame_bytes,
+        }
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""位图转换模块
+
+把解码后的帧数据转换为 wx.Bitmap。位图属于 GUI 资源，只能在主线程（事件循环）中创建。
+
+帧数据是交错存放的非预乘 RGBA，直接交给 wx.Bitmap.FromBufferRGBA 一次拷贝进位图
+（需要预乘 Alpha 的平台由 wxPython 在拷贝时顺带完成），不再经过 wx.Image：
+旧路径要先拆出 RGB 和 Alpha 两份数据，再 SetData / SetAlpha 拷进 wx.Image，
+最后 ConvertToBitmap 又拷贝一次。
+
+带 1 位掩码的帧（见 mask 模块）创建为 RGB 位图加 wx.Mask，绘制时走掩码贴图。
+
+直接运行本模块可以对比两条路径的耗时：
+    python -m gif_player.bitmap [GIF 文件路径] [轮数]
+"""
+
+import sys
+import time
+
+import wx
+from PIL import Image
+
+
+def frame_to_bitmap(frame):
+    """把解码后的帧转换为 wx.Bitmap
+
+    Args:
+        frame: DecodedFrame 实例
+
+    Returns:
+        wx.Bitmap: 带 Alpha 通道的位图；二值透明的帧为带掩码的 RGB 位图
+    """
+    if frame.rgb is None:
+        return wx.Bitmap.FromBufferRGBA(frame.width, frame.height, frame.rgba)
+
+    bitmap = wx.Bitmap.FromBuffer(frame.width, frame.height, frame.rgb)
+    if frame.mask:
+        bitmap.SetMask(mask_from_bits(frame.width, frame.height, frame.mask))
+    return bitmap
+
+
+def mask_from_bits(width, height, bits):
+    """从 1 位掩码数据创建 wx.Mask
+
+    Args:
+        width: 宽度
+        height: 高度
+        bits: Pillow "1" 模式的掩码数据（1 为不透明）
+
+    Returns:
+        wx.Mask: 黑色（0）部分透明的掩码
+    """
+    mask_rgb = Image.frombytes("1", (width, height), bits).convert("RGB").tobytes()
+    return wx.Mask(wx.Bitmap.FromBuffer(width, height, mask_rgb), wx.BLACK)
+
+
+def image_to_bitmap(image):
+    """把 Pillow 图像转换为 wx.Bitmap
+
+    Args:
+        image: Pillow 图像（非 RGBA 模式时先转换）
+
+    Returns:
+        wx.Bitmap: 带 Alpha 通道的位图
+    """
+    if image.mode != 'RGBA':
+        image = image.convert('RGBA')
+    return wx.Bitmap.FromBufferRGBA(image.width, image.height, image.tobytes())
+
+
+def _image_to_bitmap_via_wx_image(image):
+    """旧的转换路径：拆分 RGB 和 Alpha 后经 wx.Image 转换（仅用于基准测试对比）"""
+    wx_image = wx.Image(image.width, image.height)
+    wx_image.SetData(image.convert('RGB').tobytes())
+    wx_image.SetAlpha(image.getchannel('A').tobytes())
+    return wx_image.ConvertToBitmap()
+
+
+def benchmark(gif_path, rounds=5):
+    """对比旧路径和 FromBufferRGBA 路径转换整组帧的耗时（需要已创建 wx.App）
+
+    Args:
+        gif_path: GIF 文件路径
+        rounds: 重复轮数，取最好成绩
+
+    Returns:
+        dict: 各路径的最短耗时（秒）和帧数
+    """
+    from .decoder import DecodedFrame, iter_decoded_frames
+
+    images = [image for image, _ in iter_decoded_frames(gif_path)]
+
+    def via_wx_image():
+        for image in images:
+            _image_to_bitmap_via_wx_image(image)
+
+    def via_buffer():
+        # 与实际加载流程一致：工作线程取一次 RGBA 数据，主线程创建位图
+        for index, image in enumerate(images):
+            frame_to_bitmap(DecodedFrame.from_image(index, image, 0))
+
+    results = {"frames": len(images)}
+    for name, convert in (("wx_image", via_wx_image), ("from_buffer_rgba", via_buffer)):
+        best = None
+        for _ in range(rounds):
+            start = time.perf_counter()
+            convert()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = best
+    return results
+
+
+if __name__ == "__main__":
+    app = wx.App(False)
+    path = sys.argv[1] if len(sys.argv) > 1 else "oiiai_cat.gif"
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    result = benchmark(path, count)
+    print(f"帧数: {result['frames']}")
+    print(f"wx.Image 路径: {result['wx_image'] * 1000:.1f} ms")
+    print(f"FromBufferRGBA 路径: {result['from_buffer_rgba'] * 1000:.1f} ms")
+    print(f"加速比: {result['wx_image'] / result['from_buffer_rgba']:.2f}x")
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""解码帧磁盘缓存模块
+
+把缩放后的 RGBA 帧和帧延迟原样写入磁盘，下次启动时直接用 mmap 映射读取，
+完全跳过 Pillow 的解码和缩放。
+
+缓存文件格式（所有整数均为小端序）：
+    [8 字节文件头魔数][帧数据：每帧 width*height*4 字节 RGBA，依次连续存放]
+    [JSON 元数据][4 字节 JSON 长度][8 字节文件尾魔数]
+
+元数据放在文件末尾，写入时可以边解码边追加帧数据，无需预先知道总帧数。
+需要裁剪透明边缘时，写入器在追加帧的同时累计不透明区域，完成时把帧裁剪到该区域
+（见 trim 模块），裁剪区域和偏移记入元数据。
+预编译的 .petpack 宠物包（见 petpack 模块）使用同样的格式，只是文件头魔数不同。
+缓存键由 GIF 文件内容哈希和缩放设置（尺寸与质量档位）组成，任何一项变化都会
+对应到新的缓存文件；旧文件按最近使用时间淘汰，总大小不超过上限。
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+from PIL import Image
+
+from .decoder import DecodedFrame
+from .trim import ContentBox, log_trim_saving
+
+# 文件格式常量
+CACHE_MAGIC = b"PETFRM01"
+CACHE_TRAILER_MAGIC = b"PETFRMND"
+CACHE_SUFFIX = ".frames"
+_TRAILER = struct.Struct("<I8s")
+
+
+class CachedFrames:
+    """通过 mmap 映射的缓存帧集合"""
+
+    def __init__(self, path, magic=CACHE_MAGIC):
+        """打开并校验缓存文件
+
+        Args:
+            path: 缓存文件路径
+            magic: 文件头魔数（8 字节）
+
+        Raises:
+            ValueError: 文件格式不正确或已损坏
+        """
+        self.path = path
+        self.magic = magic
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        try:
+            self.meta = self._read_meta()
+        except Exception:
+            self.close()
+            raise
+
+        self.width = self.meta["width"]
+        self.height = self.meta["height"]
+        self.delays = self.meta["delays"]
+        self.frame_bytes = self.width * self.height * 4
+
+    def _read_meta(self):
+        """读取并校验文件尾部的元数据"""
+        data = self._mmap
+        if len(data) < len(self.magic) + _TRAILER.size or data[:len(self.magic)] != self.magic:
+            raise ValueError("缓存文件头无效")
+
+        meta_len, trailer_magic = _TRAILER.unpack_from(data, len(data) - _TRAILER.size)
+        if trailer_magic != CACHE_TRAILER_MAGIC:
+            raise ValueError("缓存文件尾无效（可能写入未完成）")
+
+        meta_end = len(data) - _TRAILER.size
+        meta = json.loads(data[meta_end - meta_len:meta_end].decode("utf-8"))
+
+        # 帧数据长度必须和元数据一致
+        expected = len(self.magic) + meta["width"] * meta["height"] * 4 * len(meta["delays"])
+        if expected != meta_end - meta_len:
+            raise ValueError("缓存文件帧数据长度不匹配")
+        return meta
+
+    def __len__(self):
+        return len(self.delays)
+
+    def frame_buffer(self, index):
+        """获取指定帧的 RGBA 数据（零拷贝的 memoryview）
+
+        Args:
+            index: 帧索引
+
+        Returns:
+            memoryview: 该帧的 RGBA 数据
+        """
+        start = len(self.magic) + index * self.frame_bytes
+        return memoryview(self._mmap)[start:start + self.frame_bytes]
+
+    def iter_frames(self):
+        """逐帧产出缓存中的帧
+
+        Yields:
+            tuple: (直接引用映射内存的 RGBA 图像, 像素数据直接引用映射内存的 DecodedFrame)
+        """
+        size = (self.width, self.height)
+        for index, delay in enumerate(self.delays):
+            buffer = self.frame_buffer(index)
+            image = Image.frombuffer("RGBA", size, buffer, "raw", "RGBA", 0, 1)
+            yield image, DecodedFrame(index, self.width, self.height, buffer, delay)
+
+    def close(self):
+        """关闭映射和文件"""
+        try:
+            self._mmap.close()
+        except (AttributeError, BufferError):
+            # 仍有 memoryview 引用时无法立即关闭，交给垃圾回收处理
+            pass
+        self._file.close()
+
+
+class FrameFileWriter:
+    """帧文件写入器（边解码边追加帧，完成时原子替换）"""
+
+    def __init__(self, path, magic=CACHE_MAGIC, trim=False):
+        """初始化写入器
+
+        Args:
+            path: 目标文件路径
+            magic: 文件头魔数（8 字节）
+            trim: 是否在完成时裁剪所有帧共同的透明边缘
+        """
+        self.path = path
+        self.magic = magic
+        self.width = None
+        self.height = None
+        self.delays = []
+        self.content_box = ContentBox() if trim else None
+        self.tmp_path, self._file = self._create_tmp()
+        self._file.write(magic)
+
+    def _create_tmp(self):
+        """创建临时文件
+
+        文件名由 mkstemp 生成，同一进程内同时写入同一目标（换图、DPI 变体）时互不覆盖；
+        保留 .tmp 后缀，未完成的文件不会被当作缓存条目。
+
+        Returns:
+            tuple: (临时文件路径, 以写入方式打开的文件对象)
+        """
+        directory, name = os.path.split(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=f"{name}.", suffix=".tmp", dir=directory)
+        return tmp_path, os.fdopen(fd, "wb")
+
+    def append(self, image, delay):
+        """追加一帧
+
+        Args:
+            image: 缩放后的 RGBA 图像
+            delay: 帧延迟（毫秒）
+        """
+        if self.width is None:
+            self.width, self.height = image.size
+        elif image.size != (self.width, self.height):
+            raise ValueError("缓存中的所有帧尺寸必须一致")
+
+        self._file.write(image.tobytes())
+        self.delays.append(delay)
+        if self.content_box is not None:
+            self.content_box.add(image)
+
+    def finish(self, meta):
+        """写入元数据并把临时文件替换为正式文件
+
+        Args:
+            meta: 元数据字典（尺寸、帧延迟和裁剪信息会自动补充）
+        """
+        meta = dict(meta)
+        crop_box = self.content_box.crop_box((self.width, self.height)) if self.content_box else None
+        if crop_box:
+            log_trim_saving(crop_box, (self.width, self.height), len(self.delays))
+            self._crop(crop_box)
+            # 裁剪区域是裁剪前帧（已缩放）中的坐标，偏移就是裁掉的左上角
+            meta["trim"] = {"box": list(crop_box), "offset": list(crop_box[:2])}
+        meta.update(width=self.width, height=self.height, delays=self.delays)
+        meta_data = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+        self._file.write(meta_data)
+        self._file.write(_TRAILER.pack(len(meta_data), CACHE_TRAILER_MAGIC))
+        self._file.close()
+        os.chmod(self.tmp_path, 0o644)  # mkstemp 创建的文件只有所有者可读写
+        os.replace(self.tmp_path, self.path)
+
+    def _crop(self, box):
+        """把已写入的帧裁剪到 box，写入新的临时文件并替换原临时文件"""
+        self._file.close()
+        frame_bytes = self.width * self.height * 4
+        size = (self.width, self.height)
+        tmp_path, cropped = self._create_tmp()
+        try:
+            cropped.write(self.magic)
+            with open(self.tmp_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for index in range(len(self.delays)):
+                    start = len(self.magic) + index * frame_bytes
+                    image = Image.frombuffer("RGBA", size, data[start:start + frame_bytes], "raw", "RGBA", 0, 1)
+                    cropped.write(image.crop(box).tobytes())
+        except BaseException:
+            cropped.close()
+            os.remove(tmp_path)
+            raise
+        os.remove(self.tmp_path)
+        self.tmp_path, self._file = tmp_path, cropped
+        self.width, self.height = box[2] - box[0], box[3] - box[1]
+
+    def abort(self):
+        """放弃写入并删除临时文件"""
+        try:
+            self._file.close()
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+
+class CacheWriter(FrameFileWriter):
+    """缓存文件写入器（提交后按总大小上限淘汰旧缓存）"""
+
+    def __init__(self, cache, key, source_path, trim=False):
+        """初始化写入器
+
+        Args:
+            cache: 所属的 FrameCache
+            key: 缓存键
+            source_path: 源 GIF 文件路径
+            trim: 是否在提交时裁剪所有帧共同的透明边缘
+        """
+        super().__init__(cache.entry_path(key), trim=trim)
+        self.cache = cache
+        self.key = key
+        self.source_path = source_path
+        self.extra_meta = {}  # 随缓存保存的附加元数据（如图集布局）
+
+    def commit(self):
+        """写入元数据并把临时文件替换为正式缓存文件"""
+        meta = self.cache.entry_meta(self.key, self.source_path)
+        meta.update(self.extra_meta)
+        self.finish(meta)
+        print(f"帧缓存已写入: {self.path}")
+        self.cache.evict()
+
+
+class FrameCache:
+    """解码帧磁盘缓存"""
+
+    def __init__(self, cache_dir, max_bytes):
+        """初始化缓存
+
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 缓存总大小上限（字节）
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def file_hash(path):
+        """计算文件内容的 SHA-1 哈希
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            str: 十六进制哈希字符串
+        """
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def make_key(self, gif_path, scaling, variant=""):
+        """生成缓存键（内容哈希 + 缩放设置 + 其他影响像素的处理）
+
+        Args:
+            gif_path: GIF 文件路径
+            scaling: 缩放设置（FrameScaling）
+            variant: 可选的附加标记（如 "trim" 表示裁剪了透明边缘）
+
+        Returns:
+            str: 缓存键
+        """
+        key = f"{self.file_hash(gif_path)}-{scaling.cache_token()}"
+        return f"{key}-{variant}" if variant else key
+
+    def entry_path(self, key):
+        """获取缓存键对应的文件路径"""
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, name + CACHE_SUFFIX)
+
+    def load(self, key):
+        """读取缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            CachedFrames: 命中时返回映射后的帧集合，未命中或已损坏返回 None
+        """
+        path = self.entry_path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            cached = CachedFrames(path)
+        except Exception as e:
+            print(f"帧缓存损坏，已删除: {e}")
+            self._remove(path)
+            return None
+
+        if cached.meta.get("key") != key:
+            cached.close()
+            self._remove(path)
+            return None
+
+        # 更新修改时间，作为最近使用时间供淘汰参考
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return cached
+
+    def prepare_entry(self, key, source_path):
+        """为写入新缓存做准备：创建缓存目录并删除同一源文件已过期的缓存
+
+        Args:
+            key: 缓存键
+            source_path: 源 GIF 文件路径
+
+        Returns:
+            str: 缓存文件路径
+
+        Raises:
+            OSError: 无法创建缓存目录
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._remove_stale(key, source_path)
+        return self.entry_path(key)
+
+    def entry_meta(self, key, source_path):
+        """获取写入缓存文件的基本元数据
+
+        Args:
+            key: 缓存键
+            source_path: 源 GIF 文件路径
+
+        Returns:
+            dict: 元数据
+        """
+        return {
+            "key": key,
+            "source": os.path.abspath(source_path),
+        }
+
+    def open_writer(self, key, source_path, trim=False):
+        """创建缓存写入器
+
+        Args:
+            key: 缓存键
+            source_path: 源 GIF 文件路径
+            trim: 是否在提交时裁剪所有帧共同的透明边缘
+
+        Returns:
+            CacheWriter: 写入器，无法创建时返回 None
+        """
+        try:
+            self.prepare_entry(key, source_path)
+            return CacheWriter(self, key, source_path, trim)
+        except OSError as e:
+            print(f"无法创建帧缓存: {e}")
+            return None
+
+    def _entries(self):
+        """列出所有缓存文件及其大小、修改时间"""
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+
+        for name in names:
+            if not name.endswith(CACHE_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _remove_stale(self, key, source_path):
+        """删除同一源文件内容已过期的缓存（源文件被修改过）"""
+        content_hash = key.split("-", 1)[0]
+        source = os.path.abspath(source_path)
+        for _, _, path in self._entries():
+            try:
+                cached = CachedFrames(path)
+            except Exception:
+                self._remove(path)
+                continue
+            stale = cached.meta.get("source") == source and not cached.meta.get("key", "").startswith(content_hash)
+            cached.close()
+            if stale:
+                self._remove(path)
+
+    def evict(self):
+        """按最近使用时间淘汰缓存，使总大小不超过上限"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            print(f"淘汰帧缓存: {path}")
+
+    @staticmethod
+    def _remove(path):
+        """删除缓存文件（忽略错误）"""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""帧画布模块
+
+用于显示宠物帧的自绘控件。与 wx.StaticBitmap 相比，它支持只重绘发生变化的矩形区域，
+增量播放时每一帧只需重绘脏矩形；也支持只绘制位图中的子矩形，用于图集播放。
+位图按像素密度绘制：高 DPI 屏幕上帧位图的像素数多于窗口的逻辑尺寸，绘制时按比例换算，
+使每个位图像素对应一个物理像素。
+按压弹跳的挤压/拉伸效果也在绘制时以缩放变换实现，画布和窗口的尺寸始终不变：
+画面左右两侧预留空白边距，水平拉伸时画面伸进边距而不会被画布边缘裁掉。
+"""
+
+import math
+
+import wx
+
+
+class FrameCanvas(wx.Window):
+    """显示宠物帧的画布"""
+
+    def __init__(self, parent):
+        """初始化画布
+
+        Args:
+            parent: 父窗口（宠物窗口）
+        """
+        super().__init__(parent, wx.ID_ANY, style=wx.BORDER_NONE)
+        self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
+        self._bitmap = None
+        self._source_rect = None
+        self._pixel_scale = 1.0
+        self._margin = 0            # 画面左右两侧预留的空白边距（逻辑坐标）
+        self._squash = (1.0, 1.0)   # 挤压/拉伸的水平、垂直缩放倍数（以底边中点为锚点）
+
+        self.Bind(wx.EVT_PAINT, self.on_paint)
+        self.Bind(wx.EVT_MOUSE_EVENTS, self.on_mouse_event)
+
+    def SetBitmap(self, bitmap, dirty_rect=None, source_rect=None):
+        """设置要显示的位图
+
+        Args:
+            bitmap: 要显示的 wx.Bitmap
+            dirty_rect: 可选的 (x, y, 宽, 高)，只重绘该区域；为 None 时重绘整个画布
+            source_rect: 可选的 (x, y, 宽, 高)，只把位图中的该区域绘制到画布左上角（图集）
+        """
+        self._bitmap = bitmap
+        self._source_rect = source_rect
+        if dirty_rect is None or self._squash != (1.0, 1.0):
+            self.Refresh(eraseBackground=False)
+        elif dirty_rect[2] > 0 and dirty_rect[3] > 0:
+            self.RefreshRect(self._to_logical_rect(dirty_rect), eraseBackground=False)
+
+    def SetPixelScale(self, scale):
+        """设置位图像素密度
+
+        Args:
+            scale: 每个逻辑单位对应的位图像素数（位图按该比例缩小绘制）
+        """
+        if scale != self._pixel_scale:
+            self._pixel_scale = scale
+            self.Refresh(eraseBackground=False)
+
+    def GetPixelScale(self):
+        """获取位图像素密度"""
+        return self._pixel_scale
+
+    def SetContentMargin(self, margin):
+        """设置画面左右两侧的空白边距（画面从边距处开始绘制，供水平拉伸时伸展）
+
+        Args:
+            margin: 每侧的边距（逻辑坐标）
+        """
+        if margin != self._margin:
+            self._margin = margin
+            self.Refresh(eraseBackground=False)
+
+    def GetContentMargin(self):
+        """获取画面左右两侧的空白边距"""
+        return self._margin
+
+    def SetSquash(self, scale_x, scale_y):
+        """设置挤压/拉伸效果（只影响绘制，画布尺寸不变，水平拉伸不超过边距时不会被裁剪）
+
+        Args:
+            scale_x: 水平缩放倍数
+            scale_y: 垂直缩放倍数，画面以画布底边中点为锚点缩放
+        """
+        squash = (scale_x, scale_y)
+        if squash != self._squash:
+            self._squash = squash
+            self.Refresh(eraseBackground=False)
+
+    def _to_logical_rect(self, rect):
+        """把位图像素坐标的矩形换算为覆盖它的逻辑坐标矩形"""
+        x, y, width, height = rect
+        scale = self._pixel_scale
+        if scale == 1:
+            return wx.Rect(x + self._margin, y, width, height)
+        left, top = math.floor(x / scale), math.floor(y / scale)
+        right, bottom = math.ceil((x + width) / scale), math.ceil((y + height) / scale)
+        return wx.Rect(left + self._margin, top, right - left, bottom - top)
+
+    def GetBitmap(self):
+        """获取当前显示的位图"""
+        return self._bitmap
+
+    def on_paint(self, event):
+        """绘制当前位图（系统会把绘制裁剪到需要更新的区域）"""
+        dc = wx.AutoBufferedPaintDC(self)
+        dc.SetBackground(wx.Brush(self.GetParent().GetBackgroundColour()))
+        dc.Clear()
+        if not self._bitmap or not self._bitmap.IsOk():
+            return
+
+        # 之后的绘制都使用位图像素坐标，画面从左侧边距处开始
+        scale_x, scale_y = self._squash
+        if (scale_x, scale_y) != (1.0, 1.0):
+            # 挤压/拉伸：以底边中点为锚点缩放整个画面（画面左右边距相同，中点即画布中点）
+            width, height = self.GetClientSize()
+            dc.SetDeviceOrigin(round(width * (1 - scale_x) / 2 + self._margin * scale_x),
+                               round(height * (1 - scale_y)))
+            dc.SetUserScale(scale_x / self._pixel_scale, scale_y / self._pixel_scale)
+        else:
+            if self._margin:
+                dc.SetDeviceOrigin(self._margin, 0)
+            if self._pixel_scale != 1:
+                dc.SetUserScale(1 / self._pixel_scale, 1 / self._pixel_scale)
+
+        if self._source_rect is None:
+            dc.DrawBitmap(self._bitmap, 0, 0, True)
+            return
+
+        x, y, width, height = self._source_rect
+        source = wx.MemoryDC(self._bitmap)
+        dc.Blit(0, 0, width, height, source, x, y, wx.COPY, True)
+        source.SelectObject(wx.NullBitmap)
+
+    def on_mouse_event(self, event):
+        """把鼠标事件转交给宠物窗口处理（拖拽、点击、悬停等逻辑都绑定在宠物窗口上）
+
+        画布位于父窗口的 (0, 0) 处，事件坐标无需转换。
+        """
+        parent = self.GetParent()
+        event.SetEventObject(parent)
+        parent.GetEventHandler().ProcessEvent(event)
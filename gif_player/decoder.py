@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""GIF 解码模块
+
+负责用 Pillow 逐帧解码 GIF 并缩放，只做纯图像处理，不涉及任何 wx 对象，
+因此可以放在后台线程中运行。
+"""
+
+import os
+import zlib
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageSequence
+
+from .scaling import FrameScaling, resize_image, resolve_quality
+
+
+class DecodedFrame:
+    """解码后的单帧数据（已缩放，可直接用于创建位图）"""
+
+    def __init__(self, index, width, height, rgba, delay):
+        """初始化帧数据
+
+        Args:
+            index: 帧索引
+            width: 帧宽度
+            height: 帧高度
+            rgba: 交错存放的 RGBA 像素数据（bytes 或 memoryview，非预乘）
+            delay: 帧延迟（毫秒）
+        """
+        self.index = index
+        self.width = width
+        self.height = height
+        self.rgba = rgba
+        self.delay = delay
+        self.raw_delays = [delay]  # 合并重复帧前各源帧的原始延迟（供播放时按电源模式规范化）
+        self.packed = None  # zlib 压缩后的 RGBA 数据（调用 pack 后才有）
+        self.rect = None    # 增量编码时该帧在画面中的区域 (x, y, 宽, 高)，None 表示完整帧
+        self.alias_of = None  # 与之前某帧内容相同时，为共享位图的帧索引
+        self.indices = None     # 调色板索引存储时每像素 1 字节的索引数据
+        self.palette_id = None  # 调色板索引存储时使用的调色板编号
+        self.palette = None     # 调色板索引存储时的 RGBA 调色板数据
+        self.rgb = None   # 透明度只有 0/255 时改存的 RGB 数据（此时 rgba 为空）
+        self.mask = None  # 与 rgb 配套的 1 位透明掩码（Pillow "1" 模式数据），完全不透明时为 None
+        self.offset = None  # 裁剪透明边缘时，首帧携带裁掉的左上角偏移 (x, y)
+
+    @property
+    def alpha_mode(self):
+        """像素数据格式：rgba（完整 Alpha）、mask（RGB + 1 位掩码）或 opaque（纯 RGB）"""
+        if self.rgb is None:
+            return "rgba"
+        return "mask" if self.mask else "opaque"
+
+    @classmethod
+    def from_image(cls, index, image, delay):
+        """从 RGBA 模式的 Pillow 图像创建帧数据
+
+        Args:
+            index: 帧索引
+            image: RGBA 模式的 Pillow 图像
+            delay: 帧延迟（毫秒）
+
+        Returns:
+            DecodedFrame: 帧数据
+        """
+        # 直接取交错的 RGBA 数据（只复制一次），可原样交给 wx.Bitmap.FromBufferRGBA
+        return cls(index, image.width, image.height, image.tobytes(), delay)
+
+    def pack(self):
+        """把像素数据（RGBA，或 RGB 加掩码）压缩为紧凑的源数据（使用最快的压缩级别）
+
+        Returns:
+            bytes: 压缩后的数据
+        """
+        data = self.rgba if self.rgb is None else self.rgb + (self.mask or b"")
+        self.packed = zlib.compress(data, 1)
+        return self.packed
+
+    @classmethod
+    def unpack(cls, index, width, height, packed, delay=0, alpha_mode="rgba"):
+        """从 pack 得到的压缩数据还原帧
+
+        Args:
+            index: 帧索引
+            width: 帧宽度
+            height: 帧高度
+            packed: 压缩后的数据
+            delay: 帧延迟（毫秒）
+            alpha_mode: 压缩前帧的 alpha_mode
+
+        Returns:
+            DecodedFrame: 帧数据
+        """
+        data = zlib.decompress(packed)
+        if alpha_mode == "rgba":
+            return cls(index, width, height, data, delay)
+
+        frame = cls(index, width, height, b"", delay)
+        split = width * height * 3
+        frame.rgb = data[:split]
+        frame.mask = data[split:] or None
+        return frame
+
+
+def default_worker_count():
+    """默认的并行解码线程数（CPU 核数，最多 4 个）"""
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+# 估算帧数时假设每帧平均每像素约占 1 比特（多数动画 GIF 只存相对上一帧的变化区域；
+# 照片类 GIF 会被高估帧数，auto 档位因此偏向更快的档位，对大文件是安全的方向）
+ESTIMATED_BITS_PER_PIXEL = 1
+
+
+def estimate_frame_count(file_size, width, height):
+    """根据文件大小和画布面积粗略估算帧数
+
+    单遍解码不会预先扫描全文件，拿不到准确帧数，auto 质量档位用这个估算值代替。
+
+    Args:
+        file_size: GIF 文件字节数
+        width: 画布宽度
+        height: 画布高度
+
+    Returns:
+        int: 估算的帧数（至少为 1）
+    """
+    frame_bytes = max(1, width * height * ESTIMATED_BITS_PER_PIXEL // 8)
+    return max(1, round(file_size / frame_bytes))
+
+
+def iter_composed_frames(pil_image):
+    """按顺序合成 GIF 的每一帧（第一遍，只做解码和合成，不缩放）
+
+    用 ImageSequence 单遍向前读取文件：不访问 n_frames / is_animated（它们会让
+    Pillow 先把整个文件扫描一遍），每读到一帧就立即产出，首帧不必等全文件扫描完。
+    Pillow 顺序读取时会按各帧的 disposal 方式把当前帧合成到画布上，
+    copy 得到的就是完整的可显示画面。
+
+    Args:
+        pil_image: 已打开的 Pillow GIF 图像
+
+    Yields:
+        tuple: (帧索引, 原始尺寸的 RGBA 图像, 帧延迟毫秒数)
+    """
+    disposals = Counter()
+    count = 0
+
+    for i, current in enumerate(ImageSequence.Iterator(pil_image)):
+        # 复制当前帧
+        frame = current.copy()
+
+        # 获取帧延迟（单位：1/1000秒）
+        delay = current.info.get('duration', 100)  # 默认延迟 100ms
+        if delay < 10:  # 最小延迟 10ms
+            delay = 10
+
+        # 记录帧的 disposal 方式（合成已由 Pillow 完成，这里只做统计）
+        disposals[getattr(current, 'disposal_method', 0)] += 1
+        count = i + 1
+
+        # 确保所有帧都转换为 RGBA 模式以处理透明度
+        if frame.mode != 'RGBA':
+            frame = frame.convert('RGBA')
+
+        yield i, frame, delay
+
+    print(f"GIF 总帧数: {count}，disposal 分布: {dict(sorted(disposals.items()))}")
+    if count == 1:
+        print("警告: 这是一个静态 GIF 图像")
+
+
+def scale_frame(index, frame, delay, size, quality):
+    """缩放单帧并取出像素数据（第二遍，可在线程池中并行执行）
+
+    Args:
+        index: 帧索引
+        frame: 原始尺寸的 RGBA 图像
+        delay: 帧延迟（毫秒）
+        size: 目标尺寸 (宽, 高)
+        quality: 缩放质量档位（fast / balanced / high / nearest）
+
+    Returns:
+        tuple: (缩放后的 RGBA 图像, DecodedFrame)
+    """
+    image = resize_image(frame, size, quality)
+    return image, DecodedFrame.from_image(index, image, delay)
+
+
+def decimate_frames(composed, step):
+    """抽帧：每 step 帧保留第 1 帧，被丢弃帧的延迟累加到保留的帧上，总时长不变
+
+    所有帧仍要依次合成（GIF 的每一帧都依赖之前的画面），只是丢弃的帧不再缩放和交付。
+
+    Args:
+        composed: 产出 (帧索引, RGBA 图像, 帧延迟) 的可迭代对象
+        step: 抽帧间隔
+
+    Yields:
+        tuple: (重新编号的帧索引, RGBA 图像, 累加后的帧延迟)
+    """
+    kept = None
+    for index, frame, delay in composed:
+        if index % step == 0:
+            if kept:
+                yield kept
+            kept = (index // step, frame, delay)
+        else:
+            kept = (kept[0], kept[1], kept[2] + delay)
+    if kept:
+        yield kept
+
+
+def iter_decoded_frames(gif_path, scaling=None, workers=1, parallel_min_bytes=0, frame_step=1):
+    """逐帧解码 GIF 并缩放
+
+    合成必须按顺序进行，在当前线程完成；缩放和取像素数据互不依赖，文件足够大且
+    workers 大于 1 时分发到线程池并行处理（Pillow 在缩放和转换时会释放 GIL），
+    结果仍按帧顺序产出。小文件直接串行处理，省去线程调度开销。
+
+    Args:
+        gif_path: GIF 文件路径
+        scaling: 缩放设置（FrameScaling），为 None 时使用默认设置
+        workers: 并行线程数，小于等于 1 时串行处理
+        parallel_min_bytes: 文件小于该字节数时串行处理
+        frame_step: 抽帧间隔，大于 1 时每 frame_step 帧只保留 1 帧
+
+    Yields:
+        tuple: (缩放后的 RGBA 图像, DecodedFrame)
+    """
+    scaling = scaling or FrameScaling()
+    file_size = os.path.getsize(gif_path)
+    parallel = workers > 1 and file_size >= parallel_min_bytes
+
+    # 使用 Pillow 打开 GIF 图像
+    with Image.open(gif_path) as pil_image:
+        # 所有合成后的帧都是逻辑画布大小，目标尺寸和质量档位只需计算一次
+        # （质量档位用估算帧数，避免为了 n_frames 预先扫描整个文件）
+        size = scaling.target_size(*pil_image.size)
+        frame_estimate = estimate_frame_count(file_size, *pil_image.size)
+        quality = resolve_quality(scaling.quality, frame_estimate, *pil_image.size)
+        print(f"缩放设置: {pil_image.size} -> {size}，质量档位: {quality}")
+
+        composed = iter_composed_frames(pil_image)
+        if frame_step > 1:
+            composed = decimate_frames(composed, frame_step)
+
+        if not parallel:
+            for index, frame, delay in composed:
+                yield scale_frame(index, frame, delay, size, quality)
+            return
+
+        print(f"并行解码 GIF，线程数: {workers}")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="GifScale") as pool:
+            # 限制在途任务数量，既保证所有线程有活干，又不会一次性合成全部帧占用内存
+            pending = deque()
+            for index, frame, delay in composed:
+                pending.append(pool.submit(scale_frame, index, frame, delay, size, quality))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+
+
+def decode_gif_frames(gif_path, scaling=None, workers=1):
+    """逐帧解码 GIF 动画
+
+    每解码完一帧就立即产出，调用方可以边解码边播放。
+
+    Args:
+        gif_path: GIF 文件路径
+        scaling: 缩放设置（FrameScaling）
+        workers: 并行线程数
+
+    Yields:
+        DecodedFrame: 解码并缩放后的帧
+    """
+    for _, frame in iter_decoded_frames(gif_path, scaling, workers):
+        yield frame
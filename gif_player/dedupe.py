@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""重复帧合并模块
+
+很多导出的 GIF 含有连续若干张完全相同的帧，每一帧都要占用一个位图，还要多一次定时器唤醒。
+这里在加载时对合成后的帧计算哈希：连续相同的帧合并为一帧，延迟相加，播放时长不变；
+不相邻的重复帧则引用第一次出现的帧，共享同一个位图。
+"""
+
+import hashlib
+
+
+def frame_digest(frame):
+    """计算帧像素内容的哈希
+
+    Args:
+        frame: DecodedFrame
+
+    Returns:
+        bytes: 哈希值
+    """
+    digest = hashlib.blake2b(frame.rgba, digest_size=16)
+    return digest.digest()
+
+
+def coalesce_frames(frames, share_duplicates=True):
+    """合并重复帧
+
+    连续相同的帧要等到下一帧不同（或序列结束）时才能确定总延迟，因此会延后一帧产出。
+    产出的帧按合并后的顺序重新编号；共享位图的帧设置 alias_of 为被引用帧的新编号，
+    且不再携带像素数据。
+
+    Args:
+        frames: 产出 (RGBA 图像, DecodedFrame) 的可迭代对象
+        share_duplicates: 不相邻的重复帧是否共享位图（增量编码时应关闭）
+
+    Yields:
+        tuple: (RGBA 图像, 合并后的 DecodedFrame)
+    """
+    seen = {}           # 哈希 -> 首次出现时的新编号
+    pending = None      # 等待确定总延迟的 (图像, 帧, 哈希)
+    output_count = 0
+    merged_count = 0
+    shared_count = 0
+    frame_bytes = 0
+
+    def emit(image, frame, digest):
+        nonlocal output_count, shared_count
+        frame.index = output_count
+        if share_duplicates:
+            if digest in seen:
+                frame.alias_of = seen[digest]
+                frame.rgba = b""
+                shared_count += 1
+            else:
+                seen[digest] = output_count
+        output_count += 1
+        return image, frame
+
+    for image, frame in frames:
+        digest = frame_digest(frame)
+        frame_bytes = frame.width * frame.height * 4
+
+        if pending and pending[2] == digest:
+            # 与上一帧完全相同：合并延迟，丢弃当前帧（保留各自的原始延迟，规范化时逐个处理）
+            pending[1].delay += frame.delay
+            pending[1].raw_delays.extend(frame.raw_delays)
+            merged_count += 1
+            continue
+
+        if pending:
+            yield emit(*pending)
+        pending = (image, frame, digest)
+
+    if pending:
+        yield emit(*pending)
+
+    if merged_count or shared_count:
+        saved_bytes = (merged_count + shared_count) * frame_bytes
+        print(f"重复帧合并：连续重复 {merged_count} 帧已合并，共享位图 {shared_count} 帧，"
+              f"节省 {merged_count} 次定时器唤醒、约 {saved_bytes / 1024:.1f} KB 位图内存")
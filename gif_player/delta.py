@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""增量帧模块
+
+大多数宠物 GIF 相邻帧之间只有一小块区域发生变化。增量编码只保留首帧（关键帧）的完整
+画面，之后每帧只保存相对上一帧变化的矩形（脏矩形）。播放时把脏矩形写入常驻的后台缓冲
+位图，画布也只重绘该区域，从而同时降低内存占用和每次刷新的绘制开销。
+"""
+
+import wx
+from PIL import ImageChops
+
+from .bitmap import frame_to_bitmap
+from .decoder import DecodedFrame
+
+
+def dirty_box(previous, current):
+    """计算两帧之间发生变化的最小矩形
+
+    Args:
+        previous: 上一帧的 RGBA 图像
+        current: 当前帧的 RGBA 图像
+
+    Returns:
+        tuple: (left, upper, right, lower)，两帧完全相同时返回 None
+    """
+    diff = ImageChops.difference(previous, current)
+    # 合并四个通道的差异（取最大值），任一通道变化都算作变化
+    r, g, b, a = diff.split()
+    changed = ImageChops.lighter(ImageChops.lighter(r, g), ImageChops.lighter(b, a))
+    return changed.getbbox()
+
+
+def delta_encode_frames(frames):
+    """把帧序列编码为关键帧加脏矩形
+
+    首帧保持完整；之后每帧裁剪为相对上一帧的脏矩形，并在 rect 中记录其位置。
+    与上一帧完全相同的帧编码为空矩形。
+
+    Args:
+        frames: 产出 (RGBA 图像, DecodedFrame) 的可迭代对象
+
+    Yields:
+        tuple: (RGBA 图像, 编码后的 DecodedFrame)
+    """
+    previous = None
+    for image, frame in frames:
+        if previous is not None:
+            box = dirty_box(previous, image)
+            raw_delays = frame.raw_delays
+            if box is None:
+                frame = DecodedFrame(frame.index, 0, 0, b"", frame.delay)
+                frame.rect = (0, 0, 0, 0)
+            else:
+                frame = DecodedFrame.from_image(frame.index, image.crop(box), frame.delay)
+                frame.rect = (box[0], box[1], box[2] - box[0], box[3] - box[1])
+            frame.raw_delays = raw_delays
+        previous = image
+        yield image, frame
+
+
+class DeltaFrameStore:
+    """增量编码的帧存储
+
+    保存关键帧位图、每帧的脏矩形位图，以及一块常驻的后台缓冲位图。
+    顺序播放时每帧只把脏矩形写入后台缓冲；跳帧或循环回到首帧时从关键帧重新合成。
+    """
+
+    limited = False
+
+    def __init__(self):
+        """初始化帧存储"""
+        self._keyframe = None       # 首帧完整位图
+        self._back_buffer = None    # 当前画面的后台缓冲位图
+        self._patches = []          # 每帧的 (脏矩形位图, 矩形)；首帧为 (None, 完整矩形)
+        self._shown = -1            # 后台缓冲当前对应的帧索引
+        self.frame_size = None
+
+    def __len__(self):
+        return len(self._patches)
+
+    def append(self, frame):
+        """追加一帧
+
+        Args:
+            frame: 解码后的帧（首帧完整，其余帧带 rect 的脏矩形）
+
+        Returns:
+            wx.Bitmap: 该帧对应的位图（首帧为关键帧，其余为脏矩形位图，空矩形时为 None）
+        """
+        if frame.rect is None:
+            # 关键帧：另建一份位图作为后台缓冲，之后会被原地修改
+            self._keyframe = frame_to_bitmap(frame)
+            self._back_buffer = frame_to_bitmap(frame)
+            self.frame_size = (frame.width, frame.height)
+            self._patches.append((None, (0, 0, frame.width, frame.height)))
+            self._shown = 0
+            return self._keyframe
+
+        patch = frame_to_bitmap(frame) if frame.width and frame.height else None
+        self._patches.append((patch, frame.rect))
+        return patch
+
+    def render(self, index, canvas):
+        """把指定帧显示到画布上
+
+        Args:
+            index: 帧索引
+            canvas: FrameCanvas
+        """
+        if index == self._shown:
+            canvas.SetBitmap(self._back_buffer, (0, 0, 0, 0))
+            return
+
+        if index == self._shown + 1:
+            # 顺序播放：只写入当前帧的脏矩形
+            patch, rect = self._patches[index]
+            if patch:
+                self._blit([(patch, rect)])
+            dirty = rect
+        else:
+            # 跳帧或循环：从关键帧开始重新合成
+            width, height = self.frame_size
+            self._blit([(self._keyframe, (0, 0, width, height))] +
+                       [entry for entry in self._patches[1:index + 1] if entry[0]])
+            dirty = None
+
+        self._shown = index
+        canvas.SetBitmap(self._back_buffer, dirty)
+
+    def _blit(self, entries):
+        """把若干位图依次写入后台缓冲（直接替换像素，包括 Alpha 通道）"""
+        dc = wx.MemoryDC(self._back_buffer)
+        gc = wx.GraphicsContext.Create(dc)
+        gc.SetCompositionMode(wx.COMPOSITION_SOURCE)
+        for bitmap, (x, y, width, height) in entries:
+            gc.DrawBitmap(bitmap, x, y, width, height)
+        del gc
+        dc.SelectObject(wx.NullBitmap)
+
+    def prefetch(self, start, count):
+        """增量帧全部常驻，无需预取"""
+
+    def clear(self):
+        """清空所有帧"""
+        self._keyframe = None
+        self._back_buffer = None
+        self._patches.clear()
+        self._shown = -1
+        self.frame_size = None
+
+    def stats(self):
+        """获取帧存储统计信息
+
+        Returns:
+            dict: 帧数、常驻字节数，以及不做增量编码时的字节数
+        """
+        if not self.frame_size:
+            return {"frames": 0, "resident_bytes": 0, "full_frame_bytes": 0}
+
+        width, height = self.frame_size
+        full = width * height * 4
+        patch_bytes = sum(rect[2] * rect[3] * 4 for patch, rect in self._patches[1:] if patch)
+        return {
+            "frames": len(self._patches),
+            "resident_bytes": full * 2 + patch_bytes,
+            "full_frame_bytes": full * len(self._patches),
+        }
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""调色板索引帧存储模块
+
+GIF 本身是 8 位调色板图像，展开成 32 位 RGBA 位图后内存变为 4 倍。索引存储在工作线程中
+把每帧转换为「每像素 1 字节的索引 + RGBA 调色板」，只在帧即将显示时才用 Pillow 的查表
+转换（C 实现，整帧向量化处理）展开为 RGBA，放进一个很小的就绪位图缓存。
+
+索引存储的帧按最近邻缩放（加载器强制使用 nearest 档位），缩放不会产生源帧中没有的颜色，
+任意缩放比例下颜色不超过 256 种、透明度只有 0/255 的帧都无损转换，并尽量共用同一个调色板
+（GIF 有全局调色板时通常所有帧都能共用）。逐像素的映射全部由 Pillow 的查表和
+quantize(palette=...) 完成，不在 Python 中逐像素循环。颜色仍超过 256 种或带半透明的帧
+（如各帧局部调色板合成出更多颜色的 GIF）用 FASTOCTREE 量化到 256 色，会有轻微的颜色损失。
+"""
+
+from collections import OrderedDict
+
+from PIL import Image, ImageChops
+
+from .bitmap import image_to_bitmap
+
+# 调色板最多 256 种颜色
+MAX_PALETTE_COLORS = 256
+
+# 共用调色板中完全透明像素统一使用的颜色（透明像素的 RGB 不可见）
+TRANSPARENT = (0, 0, 0, 0)
+
+# 把 Alpha 通道转换为「完全透明处为 255」的掩码的查找表
+_TRANSPARENT_MASK_LUT = [255] + [0] * 255
+
+# 把两个 8 位通道的取值对 (x, y) 拆成三个 6 位数并各乘以 4，作为 RGB 三个分量的查找表。
+# 这样每个分量都落在 Pillow 调色板缓存格子（4 个取值一格）的起点上，
+# quantize(palette=...) 的最近色查找对调色板中已有的颜色是精确的
+_PAIR_HIGH = [(v >> 2) << 2 for v in range(256)]
+_PAIR_MID_X = [(v & 3) << 6 for v in range(256)]
+_PAIR_MID_Y = [(v >> 4) << 2 for v in range(256)]
+_PAIR_LOW = [(v & 15) << 2 for v in range(256)]
+_PAIR_BAND_LUT = _PAIR_HIGH + _PAIR_MID_X + _PAIR_LOW  # 一次查表得到 (x 高位, x 中位, y 低位)
+_PAIR_PADDING = b"\xff\xff\xff"  # 编码后的分量都是 4 的倍数，不会与填充色相同
+
+
+def _encode_pair(x, y):
+    """按与查找表相同的方式编码取值对"""
+    return bytes((_PAIR_HIGH[x], _PAIR_MID_X[x] + _PAIR_MID_Y[y], _PAIR_LOW[y]))
+
+
+def _pair_indices(x_band, y_band, pairs):
+    """把两个通道逐像素映射为取值对在 pairs 中的下标（逐像素的工作都由 Pillow 完成）
+
+    Args:
+        x_band: L 模式图像
+        y_band: 与 x_band 同尺寸的 L 模式图像
+        pairs: 图像中出现的全部 (x, y) 取值对（不超过 256 个）
+
+    Returns:
+        Image: L 模式的下标图像
+    """
+    high, mid, low = Image.merge("RGB", (x_band, x_band, y_band)).point(_PAIR_BAND_LUT).split()
+    coded = Image.merge("RGB", (high, ImageChops.add(mid, y_band.point(_PAIR_MID_Y)), low))
+    palette = bytearray(_PAIR_PADDING * MAX_PALETTE_COLORS)
+    for index, (x, y) in enumerate(pairs):
+        palette[index * 3:index * 3 + 3] = _encode_pair(x, y)
+    palette_image = Image.new("P", (1, 1))
+    palette_image.putpalette(palette)
+    indices = coded.quantize(palette=palette_image, dither=Image.Dither.NONE)
+    return Image.frombytes("L", indices.size, indices.tobytes())
+
+
+class PaletteBuilder:
+    """在工作线程中把 RGBA 帧转换为调色板索引，并在帧之间共用调色板"""
+
+    def __init__(self):
+        """初始化转换器"""
+        self.palette_count = 0
+        self.lossy_count = 0
+        self._shared_id = None
+        self._shared_lookup = {}    # 共用调色板：RGBA 颜色 -> 索引
+        self._shared_palette = bytearray()
+
+    def index(self, image):
+        """把 RGBA 图像转换为调色板索引
+
+        先把 (R, G) 映射为取值对下标，再把 (下标, B) 映射为本帧的颜色下标，
+        最后查表换成共用调色板的索引，完全透明的像素统一改为透明颜色的索引。
+
+        Args:
+            image: RGBA 模式的 Pillow 图像
+
+        Returns:
+            tuple: (索引数据 bytes, 调色板编号, 调色板 RGBA 数据 bytes)
+        """
+        colors = image.getcolors(MAX_PALETTE_COLORS)
+        if colors is None or any(0 < color[3] < 255 for _, color in colors):
+            return self._quantize(image)
+
+        # 本帧需要的颜色：不透明颜色按 RGB 区分，所有完全透明的像素共用一个颜色
+        needed = {(r, g, b, 255) if alpha else TRANSPARENT for _, (r, g, b, alpha) in colors}
+        new_colors = [color for color in needed if color not in self._shared_lookup]
+        if self._shared_id is None or len(self._shared_lookup) + len(new_colors) > MAX_PALETTE_COLORS:
+            # 当前调色板放不下，开启一个新的共用调色板
+            self._shared_id = self._next_id()
+            self._shared_lookup = {}
+            self._shared_palette = bytearray()
+            new_colors = list(needed)
+
+        # 只在末尾追加新颜色，已有颜色的索引保持不变，之前的帧仍可使用扩充后的调色板
+        for color in new_colors:
+            self._shared_lookup[color] = len(self._shared_lookup)
+            self._shared_palette += bytes(color)
+
+        red, green, blue, alpha = image.split()
+        rg_pairs = sorted({color[:2] for _, color in colors})
+        rg_lookup = {pair: index for index, pair in enumerate(rg_pairs)}
+        rgb_pairs = sorted({(rg_lookup[color[:2]], color[2]) for _, color in colors})
+        local = _pair_indices(_pair_indices(red, green, rg_pairs), blue, rgb_pairs)
+
+        # 本帧颜色下标 -> 共用调色板索引（只出现在透明像素上的 RGB 随后会被透明索引覆盖）
+        lut = [self._shared_lookup.get(rg_pairs[rg] + (b, 255), 0) for rg, b in rgb_pairs]
+        indices = local.point(lut + [0] * (MAX_PALETTE_COLORS - len(lut)))
+        if TRANSPARENT in needed:
+            indices.paste(self._shared_lookup[TRANSPARENT], mask=alpha.point(_TRANSPARENT_MASK_LUT))
+        return indices.tobytes(), self._shared_id, bytes(self._shared_palette)
+
+    def _quantize(self, image):
+        """颜色超过 256 种时量化（有损），使用单独的调色板"""
+        self.lossy_count += 1
+        quantized = image.quantize(MAX_PALETTE_COLORS, Image.Quantize.FASTOCTREE)
+        return quantized.tobytes(), self._next_id(), bytes(quantized.getpalette("RGBA"))
+
+    def _next_id(self):
+        """分配新的调色板编号"""
+        self.palette_count += 1
+        return self.palette_count - 1
+
+
+def palette_index_frames(frames):
+    """把帧序列转换为调色板索引
+
+    转换后的帧设置 indices / palette_id / palette，并释放 RGBA 数据。
+    重复帧（alias_of 不为 None）不携带像素数据，原样产出。
+
+    Args:
+        frames: 产出 (RGBA 图像, DecodedFrame) 的可迭代对象
+
+    Yields:
+        tuple: (RGBA 图像, 转换后的 DecodedFrame)
+    """
+    builder = PaletteBuilder()
+    rgba_bytes = 0
+    indexed_bytes = 0
+    palette_sizes = {}
+
+    for image, frame in frames:
+        if frame.alias_of is None:
+            frame.indices, frame.palette_id, frame.palette = builder.index(image)
+            frame.rgba = b""
+            rgba_bytes += frame.width * frame.height * 4
+            indexed_bytes += len(frame.indices)
+            palette_sizes[frame.palette_id] = len(frame.palette)
+        yield image, frame
+
+    indexed_bytes += sum(palette_sizes.values())
+    if rgba_bytes:
+        print(f"调色板索引存储：RGBA {rgba_bytes / 1024:.1f} KB -> 索引 {indexed_bytes / 1024:.1f} KB"
+              f"（{indexed_bytes / rgba_bytes:.0%}），调色板 {builder.palette_count} 个，"
+              f"有损量化 {builder.lossy_count} 帧")
+
+
+class IndexedFrameStore:
+    """调色板索引帧存储
+
+    常驻的只有索引数据和调色板；显示时展开为位图，最近显示的若干帧位图放在 LRU 缓存中。
+    """
+
+    limited = False
+
+    def __init__(self, cache_frames=8):
+        """初始化帧存储
+
+        Args:
+            cache_frames: 就绪位图缓存的帧数
+        """
+        self.cache_frames = max(1, cache_frames)
+        self._sources = []              # 每个不重复画面：(宽, 高, 索引数据, 调色板编号)
+        self._frame_sources = []        # 帧索引 -> 源数据索引（重复帧指向同一源数据）
+        self._palettes = {}             # 调色板编号 -> RGBA 调色板数据（共用调色板取最新的扩充版本）
+        self._bitmaps = OrderedDict()   # 就绪位图：源数据索引 -> wx.Bitmap，按最近使用排序
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._frame_sources)
+
+    @property
+    def frame_size(self):
+        """帧尺寸 (宽, 高)，尚无帧时为 None"""
+        if not self._sources:
+            return None
+        width, height, _, _ = self._sources[0]
+        return width, height
+
+    def append(self, frame):
+        """追加一帧（只保存索引数据，不创建位图）
+
+        Args:
+            frame: 经 palette_index_frames 转换后的 DecodedFrame
+        """
+        if frame.alias_of is not None:
+            self._frame_sources.append(self._frame_sources[frame.alias_of])
+            return
+
+        self._frame_sources.append(len(self._sources))
+        self._sources.append((frame.width, frame.height, frame.indices, frame.palette_id))
+        self._palettes[frame.palette_id] = frame.palette
+
+    def render(self, index, canvas):
+        """把指定帧显示到画布上（未缓存时先展开为位图）
+
+        Args:
+            index: 帧索引
+            canvas: FrameCanvas
+        """
+        source = self._frame_sources[index]
+        bitmap = self._bitmaps.get(source)
+        if bitmap is not None:
+            self.hits += 1
+            self._bitmaps.move_to_end(source)
+        else:
+            self.misses += 1
+            bitmap = self._expand(source)
+        canvas.SetBitmap(bitmap)
+
+    def prefetch(self, start, count):
+        """预先展开从 start 开始的若干帧（不超过缓存容量，避免互相淘汰）
+
+        Args:
+            start: 起始帧索引
+            count: 预取帧数
+        """
+        total = len(self._frame_sources)
+        count = min(count, self.cache_frames - 1, total)
+        for offset in range(count):
+            source = self._frame_sources[(start + offset) % total]
+            if source not in self._bitmaps:
+                self._expand(source)
+
+    def _expand(self, source):
+        """把索引数据展开为位图并放入缓存"""
+        width, height, indices, palette_id = self._sources[source]
+        image = Image.frombuffer("P", (width, height), indices, "raw", "P", 0, 1)
+        image.putpalette(self._palettes[palette_id], "RGBA")
+        bitmap = image_to_bitmap(image)
+
+        self._bitmaps[source] = bitmap
+        while len(self._bitmaps) > self.cache_frames:
+            self._bitmaps.popitem(last=False)
+        return bitmap
+
+    def clear(self):
+        """清空所有帧和统计数据"""
+        self._sources.clear()
+        self._frame_sources.clear()
+        self._palettes.clear()
+        self._bitmaps.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """获取帧存储统计信息
+
+        Returns:
+            dict: 帧数、不重复画面数、调色板数、展开为 RGBA 时的字节数、索引存储字节数、
+                就绪位图数及其字节数、命中/未命中次数
+        """
+        rgba_bytes = sum(width * height * 4 for width, height, _, _ in self._sources)
+        indexed_bytes = (sum(len(indices) for _, _, indices, _ in self._sources)
+                         + sum(len(palette) for palette in self._palettes.values()))
+        frame_bytes = self.frame_size[0] * self.frame_size[1] * 4 if self.frame_size else 0
+        return {
+            "frames": len(self._frame_sources),
+            "unique_frames": len(self._sources),
+            "palettes": len(self._palettes),
+            "rgba_bytes": rgba_bytes,
+            "indexed_bytes": indexed_bytes,
+            "resident": len(self._bitmaps),
+            "resident_bytes": len(self._bitmaps) * frame_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""后台 GIF 加载模块
+
+在工作线程中完成 GIF 的解码和缩放，每得到一帧就通过 wx.CallAfter 交回事件循环，
+由主线程创建位图。这样界面不会因为解码大 GIF 而卡住，首帧也能尽快显示。
+配置了磁盘帧缓存时，优先从缓存读取，未命中则边解码边写入缓存。
+启用增量编码时，除首帧外每帧只交付相对上一帧发生变化的矩形区域。
+交付前会合并连续的重复帧，并让不相邻的重复帧共享位图。
+启用调色板索引存储时，按最近邻缩放（不产生新颜色），并在工作线程中把帧转换为索引数据加调色板。
+启用二值透明检测时，透明度只有 0/255 的帧改为 RGB 加 1 位掩码交付（显式启用阈值时，
+缩放产生的半透明边缘也按阈值归入掩码）。
+启用透明边缘裁剪时，不在加载前扫描文件：解码时累计所有帧的不透明区域并暂存已缩放的帧，
+解码完后裁剪到该区域再交付和写入缓存（首帧要等全部解码完才显示），首帧携带裁掉的偏移；
+裁剪区域随帧缓存保存，命中缓存时直接使用裁剪后的帧。
+同目录下有匹配的预编译宠物包（.petpack）时优先使用，完全跳过解码。
+流式播放时不缓存、不保留帧：按播放顺序反复解码，把帧放进流式存储的环形缓冲，
+首遍解码时仍逐帧回调 on_frame 登记帧数和延迟。
+启用图集时，同时在工作线程中把帧拼成图集页，每拼好一页交付一次，图集布局随帧缓存保存。
+配置了解码沙箱时，未命中缓存的解码改在受限子进程中进行，结果写入缓存文件（未启用缓存时
+写入临时文件）后映射读取；流式播放不使用沙箱。
+"""
+
+import itertools
+import os
+import tempfile
+import threading
+import traceback
+
+import wx
+
+from .atlas import AtlasBuilder, compute_atlas_layout
+from .cache import CACHE_SUFFIX, CachedFrames
+from .decoder import iter_decoded_frames
+from .dedupe import coalesce_frames
+from .delta import delta_encode_frames
+from .indexed import palette_index_frames
+from .mask import apply_binary_alpha_to_page, binary_alpha_frames
+from .petpack import find_petpack
+from .scaling import FrameScaling, QUALITY_NEAREST
+from .trim import trim_frames
+
+
+class GifLoader:
+    """后台 GIF 加载器"""
+
+    def __init__(self, gif_path, on_frame, on_done, on_error, frame_cache=None,
+                 scaling=None, workers=1, parallel_min_bytes=0,
+                 pack_frames=False, delta_encode=False, coalesce=True,
+                 atlas_max_size=0, on_atlas_page=None, palette_index=False,
+                 binary_alpha=False, alpha_threshold=False, stream=None, trim=False, prefer_petpack=False,
+                 frame_step=1, sandbox=None):
+        """初始化加载器
+
+        Args:
+            gif_path: GIF 文件路径
+            on_frame: 每解码完一帧时在主线程调用，参数为 DecodedFrame
+            on_done: 全部帧解码完成时在主线程调用，参数为总帧数
+            on_error: 解码失败时在主线程调用，参数为异常对象
+            frame_cache: 可选的磁盘帧缓存（FrameCache），为 None 时不使用缓存
+            scaling: 缩放设置（FrameScaling），为 None 时使用默认设置
+            workers: 并行缩放的线程数，小于等于 1 时串行解码
+            parallel_min_bytes: GIF 文件小于该字节数时串行解码
+            pack_frames: 是否在工作线程中预先压缩帧源数据（供按预算淘汰的帧存储使用）
+            delta_encode: 是否把首帧之后的帧编码为相对上一帧的脏矩形
+            coalesce: 是否合并重复帧
+            atlas_max_size: 图集单页的最大边长，0 表示不拼图集
+            on_atlas_page: 每拼好一张图集页时在主线程调用，参数为 (图集页 DecodedFrame, 图集布局)
+            palette_index: 是否把帧转换为调色板索引（供 IndexedFrameStore 使用，此时强制按最近邻缩放）
+            binary_alpha: 是否把二值透明的帧转换为 RGB 加 1 位掩码（增量帧和调色板索引时不适用）
+            alpha_threshold: 是否把缩放产生的半透明像素按 50% 阈值归入掩码（边缘出现锯齿，所有帧都走掩码路径）
+            stream: 可选的流式帧存储（StreamingFrameStore），设置后改为流式播放
+            trim: 是否裁剪所有帧共同的透明边缘（首次解码时暂存全部帧后裁剪，流式播放不裁剪）
+            prefer_petpack: 是否优先使用同目录下匹配的 .petpack（gif_path 本身是 .petpack 时总是直接读取）
+            frame_step: 抽帧间隔（预检方案决定），大于 1 时每 frame_step 帧只保留 1 帧
+            sandbox: 可选的解码沙箱（DecodeSandbox），设置后在受限子进程中解码
+        """
+        self.gif_path = gif_path
+        self.on_frame = on_frame
+        self.on_done = on_done
+        self.on_error = on_error
+        self.frame_cache = frame_cache
+        self.scaling = scaling or FrameScaling()
+        if palette_index:
+            # 最近邻缩放不会产生源帧中没有的颜色，颜色不超过 256 种的帧可以无损转换为索引
+            self.scaling = self.scaling.with_quality(QUALITY_NEAREST)
+        self.workers = workers
+        self.parallel_min_bytes = parallel_min_bytes
+        self.pack_frames = pack_frames
+        self.delta_encode = delta_encode
+        self.coalesce = coalesce
+        self.atlas_max_size = atlas_max_size if on_atlas_page else 0
+        self.on_atlas_page = on_atlas_page
+        self.palette_index = palette_index
+        self.binary_alpha = binary_alpha and not delta_encode and not palette_index
+        self.alpha_threshold = alpha_threshold
+        self.stream = stream
+        self.trim = trim
+        self.prefer_petpack = prefer_petpack
+        self.frame_step = frame_step
+        self.sandbox = sandbox if stream is None else None
+        self._offset = (0, 0)      # 命中裁剪过的缓存或宠物包时首帧的偏移
+        self._writer = None        # 未命中缓存时的缓存写入器
+        self._cached_meta = None   # 命中缓存时的缓存元数据
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """启动后台解码线程"""
+        self._thread = threading.Thread(target=self._run, name="GifLoader", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """取消加载，尚未交付的帧和回调都会被丢弃"""
+        self._cancelled.set()
+        if self.stream is not None:
+            # 唤醒因缓冲已满而阻塞的加载线程
+            self.stream.close()
+        if self.sandbox is not None:
+            self.sandbox.terminate()
+
+    @property
+    def cancelled(self):
+        """是否已取消"""
+        return self._cancelled.is_set()
+
+    def _run(self):
+        """工作线程主函数"""
+        if self.stream is not None:
+            self._run_stream()
+            return
+
+        try:
+            count = 0
+            builder = None
+            frames = self._iter_frames()
+            if self.coalesce:
+                # 增量帧依赖上一帧的画面，不能跨帧共享位图，只合并连续重复帧
+                frames = coalesce_frames(frames, share_duplicates=not self.delta_encode)
+            if self.delta_encode:
+                frames = delta_encode_frames(frames)
+            if self.palette_index:
+                frames = palette_index_frames(frames)
+            if self.binary_alpha:
+                frames = binary_alpha_frames(frames, self.alpha_threshold)
+
+            for image, frame in frames:
+                if self.cancelled:
+                    return
+                if count == 0:
+                    frame.offset = self._offset
+                if self.pack_frames and frame.alias_of is None:
+                    frame.pack()
+                wx.CallAfter(self._deliver, self.on_frame, frame)
+                count += 1
+
+                if self.atlas_max_size and frame.alias_of is None:
+                    if builder is None:
+                        builder = AtlasBuilder(self._atlas_layout(frame.width, frame.height))
+                    page = builder.add(image)
+                    if page:
+                        self._deliver_atlas_page(page, builder.layout)
+
+            if count == 0:
+                raise ValueError("GIF 中没有可用的帧")
+
+            if builder:
+                page = builder.finish()
+                if page:
+                    self._deliver_atlas_page(page, builder.layout)
+                print(f"图集: {builder.slot_count} 个画面拼成 {builder.page_count} 页")
+
+            # 只有完整解码后才提交缓存
+            self._commit_cache(builder.layout if builder else None)
+            wx.CallAfter(self._deliver, self.on_done, count)
+        except Exception as e:
+            print(f"后台解码 GIF 失败: {e}")
+            traceback.print_exc()
+            wx.CallAfter(self._deliver, self.on_error, e)
+        finally:
+            # 被取消或出错时丢弃未完成的缓存
+            if self._writer:
+                self._writer.abort()
+                self._writer = None
+
+    def _run_stream(self):
+        """流式播放的工作线程主函数：按播放顺序循环解码，直到被取消"""
+        try:
+            while not self.cancelled:
+                count = 0
+                frames = iter_decoded_frames(self.gif_path, self.scaling, self.workers,
+                                             self.parallel_min_bytes, frame_step=self.frame_step)
+                if self.coalesce:
+                    # 流式播放不保留已播放的帧，只能合并连续重复帧
+                    frames = coalesce_frames(frames, share_duplicates=False)
+                if self.binary_alpha:
+                    frames = binary_alpha_frames(frames, self.alpha_threshold)
+
+                first_pass = self.stream.passes == 0
+                for _, frame in frames:
+                    if not self.stream.feed(frame):
+                        return
+                    if first_pass:
+                        wx.CallAfter(self._deliver, self.on_frame, frame)
+                    count += 1
+
+                if count == 0:
+                    raise ValueError("GIF 中没有可用的帧")
+
+                self.stream.finish_pass(count)
+                if first_pass:
+                    wx.CallAfter(self._deliver, self.on_done, count)
+        except Exception as e:
+            print(f"后台解码 GIF 失败: {e}")
+            traceback.print_exc()
+            wx.CallAfter(self._deliver, self.on_error, e)
+
+    def _deliver_atlas_page(self, page, layout):
+        """把拼好的图集页交给主线程（按需先做二值透明转换）"""
+        if self.binary_alpha:
+            apply_binary_alpha_to_page(page, self.alpha_threshold)
+        wx.CallAfter(self._deliver, self.on_atlas_page, page, layout)
+
+    def _atlas_layout(self, width, height):
+        """获取图集布局：缓存中已有相同设置的布局时直接复用，否则重新计算"""
+        layout = (self._cached_meta or {}).get("atlas")
+        if (layout and layout.get("max_size") == self.atlas_max_size
+                and (layout.get("frame_width"), layout.get("frame_height")) == (width, height)):
+            return layout
+        return compute_atlas_layout(width, height, self.atlas_max_size)
+
+    def _commit_cache(self, atlas_layout):
+        """提交缓存写入器，图集布局一并写入缓存元数据"""
+        if not self._writer:
+            return
+        if atlas_layout:
+            self._writer.extra_meta["atlas"] = atlas_layout
+        try:
+            self._writer.commit()
+        except OSError as e:
+            print(f"提交帧缓存失败: {e}")
+            self._writer.abort()
+        self._writer = None
+
+    def _iter_frames(self):
+        """按顺序产出帧：优先读预编译宠物包，其次读缓存，否则解码并写入缓存（由 _run 在全部交付后提交）
+
+        Yields:
+            tuple: (缩放后的 RGBA 图像, DecodedFrame)
+        """
+        # 宠物包保存的是全部帧，需要抽帧时不能使用
+        if (self.prefer_petpack and self.frame_step == 1) or self.gif_path.lower().endswith(".petpack"):
+            pack = find_petpack(self.gif_path, self.scaling, self.trim)
+            if pack:
+                print(f"使用预编译宠物包: {pack.path}")
+                yield from self._iter_prebuilt(pack)
+                return
+
+        cache_key = None
+        if self.frame_cache:
+            try:
+                cache_key = self.frame_cache.make_key(self.gif_path, self.scaling, self._cache_variant())
+                cached = self.frame_cache.load(cache_key)
+            except OSError as e:
+                print(f"读取帧缓存失败: {e}")
+                cached = None
+
+            if cached:
+                print(f"命中帧缓存: {cached.path}")
+                yield from self._iter_prebuilt(cached)
+                return
+
+        if self.sandbox is not None:
+            yield from self._iter_sandboxed(cache_key)
+            return
+
+        self._writer = self.frame_cache.open_writer(cache_key, self.gif_path) if cache_key else None
+        frames = iter_decoded_frames(self.gif_path, self.scaling, self.workers,
+                                     self.parallel_min_bytes, frame_step=self.frame_step)
+        if self.trim:
+            # 不预先扫描文件：解码时暂存已缩放的帧，全部解码完求出包围盒后裁剪再交付（取消时提前结束）
+            box, frames = trim_frames(itertools.takewhile(lambda _: not self.cancelled, frames))
+            if box:
+                self._offset = box[:2]
+                if self._writer:
+                    self._writer.extra_meta["trim"] = {"box": list(box), "offset": list(box[:2])}
+        for image, frame in frames:
+            if self._writer:
+                try:
+                    self._writer.append(image, frame.delay)
+                except (OSError, ValueError) as e:
+                    print(f"写入帧缓存失败: {e}")
+                    self._writer.abort()
+                    self._writer = None
+            yield image, frame
+
+    def _iter_sandboxed(self, cache_key):
+        """在解码沙箱中解码，子进程直接写入缓存文件（未启用缓存时写入临时文件），再映射读取
+
+        Yields:
+            tuple: (缩放后的 RGBA 图像, DecodedFrame)
+        """
+        output_path = None
+        meta = {}
+        if cache_key:
+            try:
+                output_path = self.frame_cache.prepare_entry(cache_key, self.gif_path)
+                meta = self.frame_cache.entry_meta(cache_key, self.gif_path)
+            except OSError as e:
+                print(f"无法创建帧缓存: {e}")
+
+        temporary = None
+        if output_path is None:
+            fd, output_path = tempfile.mkstemp(prefix="pet-sandbox-", suffix=CACHE_SUFFIX)
+            os.close(fd)
+            temporary = output_path
+
+        try:
+            self.sandbox.decode(self.gif_path, output_path, meta, self.scaling, self.trim,
+                                self.frame_step, self.workers, self.parallel_min_bytes)
+            frames_file = CachedFrames(output_path)
+        except BaseException:
+            if temporary:
+                _remove_quietly(temporary)
+            raise
+
+        if temporary is None:
+            self.frame_cache.evict()
+        elif _remove_quietly(temporary):
+            # 映射建立后即可删除临时文件（Windows 上映射期间无法删除，留到读取完成后）
+            temporary = None
+
+        try:
+            yield from self._iter_prebuilt(frames_file)
+        finally:
+            if temporary:
+                _remove_quietly(temporary)
+
+    def _cache_variant(self):
+        """缓存键的附加标记（裁剪、抽帧都会改变帧内容）"""
+        parts = []
+        if self.trim:
+            parts.append("trim")
+        if self.frame_step > 1:
+            parts.append(f"step{self.frame_step}")
+        return "-".join(parts)
+
+    def _iter_prebuilt(self, frames_file):
+        """从缓存或宠物包中产出帧，并读取其中保存的元数据（裁剪偏移、图集布局）"""
+        self._cached_meta = frames_file.meta
+        self._offset = tuple((frames_file.meta.get("trim") or {}).get("offset", (0, 0)))
+        try:
+            yield from frames_file.iter_frames()
+        finally:
+            frames_file.close()
+
+    def _deliver(self, callback, *args):
+        """在主线程中执行回调（加载已取消时直接丢弃）"""
+        if not self.cancelled:
+            callback(*args)
+
+
+def _remove_quietly(path):
+    """删除文件，返回是否成功"""
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
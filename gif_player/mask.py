@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""二值透明检测模块
+
+GIF 的透明是 1 位的：像素要么完全透明，要么完全不透明。这样的帧不需要 8 位
+Alpha 通道，改存 RGB 加 1 位掩码，创建位图时使用 wx.Mask，绘制时走掩码贴图，
+比逐像素 Alpha 混合更便宜。
+
+默认逐帧检查缩放后的 Alpha：缩放（如 LANCZOS）在边缘插值出半透明像素的帧保留完整 Alpha，
+不丢失抗锯齿边缘；最近邻缩放不产生半透明像素，这样的帧总能走掩码路径。
+显式启用阈值模式时，半透明像素按 50% 阈值归入掩码（相当于对源掩码做最近邻缩放），
+所有帧都走掩码路径，代价是边缘出现锯齿；颜色仍取滤镜缩放后的 RGB。
+"""
+
+from PIL import Image
+
+
+def apply_binary_alpha(frame, image, threshold=False):
+    """把 Alpha 只有 0 和 255 的帧改为 RGB 加 1 位掩码
+
+    Args:
+        frame: DecodedFrame（会被原地修改）
+        image: 与帧对应的 RGBA 图像
+        threshold: 是否把半透明像素按 50% 阈值归入掩码（否则有半透明像素的帧保留完整 Alpha）
+
+    Returns:
+        str: 转换后帧的 alpha_mode（rgba / mask / opaque）
+    """
+    alpha = image.getchannel("A")
+    histogram = alpha.histogram()
+    if not threshold and any(histogram[1:255]):
+        return frame.alpha_mode
+
+    frame.rgb = image.convert("RGB").tobytes()
+    # 不抖动的 "1" 模式转换按 128 取阈值；完全不透明的帧不需要掩码
+    opaque = not any(histogram[:128])
+    frame.mask = None if opaque else alpha.convert("1", dither=Image.Dither.NONE).tobytes()
+    frame.rgba = b""
+    return frame.alpha_mode
+
+
+def binary_alpha_frames(frames, threshold=False):
+    """对帧序列做二值透明转换
+
+    重复帧（alias_of 不为 None）不携带像素数据，原样产出。
+
+    Args:
+        frames: 产出 (RGBA 图像, DecodedFrame) 的可迭代对象
+        threshold: 是否把半透明像素按 50% 阈值归入掩码
+
+    Yields:
+        tuple: (RGBA 图像, 转换后的 DecodedFrame)
+    """
+    modes = {"rgba": 0, "mask": 0, "opaque": 0}
+    for image, frame in frames:
+        if frame.alias_of is None:
+            modes[apply_binary_alpha(frame, image, threshold)] += 1
+        yield image, frame
+
+    print(f"二值透明：掩码 {modes['mask']} 帧，不透明 {modes['opaque']} 帧，"
+          f"需要完整 Alpha {modes['rgba']} 帧")
+
+
+def apply_binary_alpha_to_page(page, threshold=False):
+    """对图集页做二值透明转换
+
+    Args:
+        page: 图集页（DecodedFrame，像素数据为 RGBA）
+        threshold: 是否把半透明像素按 50% 阈值归入掩码
+
+    Returns:
+        str: 转换后图集页的 alpha_mode
+    """
+    image = Image.frombuffer("RGBA", (page.width, page.height), page.rgba, "raw", "RGBA", 0, 1)
+    return apply_binary_alpha(page, image, threshold)
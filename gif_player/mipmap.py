@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""多级纹理（mipmap）帧存储模块
+
+运行时缩放宠物时不重新加载 GIF：每个不重复的画面在加入时构建一次 mipmap 金字塔
+（1×、½×、¼× …，逐级用 Image.reduce 做 2×2 盒式平均），任意缩放倍数都从不小于目标
+尺寸的最近一级做一次双线性缩放得到（缩小比例不超过一半，既快又不会产生锯齿）。
+当前缩放倍数下生成的位图按帧缓存，缩放变化时只丢弃缓存，之后每帧在首次显示时才生成，
+因此再长的 GIF 缩放也只需要处理当前帧。
+"""
+
+from collections import OrderedDict
+
+from PIL import Image
+
+from .bitmap import frame_to_bitmap, image_to_bitmap
+
+# 金字塔最小一级的最短边（像素）
+MIN_LEVEL_SIDE = 8
+
+
+def build_mipmaps(image, min_side=MIN_LEVEL_SIDE):
+    """构建 mipmap 金字塔
+
+    Args:
+        image: RGBA 图像（第 0 级）
+        min_side: 最小一级的最短边下限
+
+    Returns:
+        list: 各级图像，第 i 级尺寸为原图的 1/2^i
+    """
+    levels = [image]
+    while min(levels[-1].size) // 2 >= min_side:
+        levels.append(levels[-1].reduce(2))
+    return levels
+
+
+def select_level(levels, size):
+    """选择用于缩放到目标尺寸的级别：不小于目标尺寸的最小一级
+
+    Args:
+        levels: build_mipmaps 得到的各级图像
+        size: 目标尺寸 (宽, 高)
+
+    Returns:
+        Image: 选中的级别
+    """
+    chosen = levels[0]
+    for level in levels[1:]:
+        if level.width < size[0] or level.height < size[1]:
+            break
+        chosen = level
+    return chosen
+
+
+class MipmapFrameStore:
+    """支持运行时缩放的帧存储
+
+    原始尺寸的位图常驻；缩放后的位图只缓存当前缩放倍数下已经显示过的帧。
+    """
+
+    limited = False
+
+    def __init__(self, zoom=1.0, zoom_cache_frames=0):
+        """初始化帧存储
+
+        Args:
+            zoom: 初始缩放倍数
+            zoom_cache_frames: 当前缩放倍数下最多缓存的位图数，0 表示不限制
+        """
+        self._zoom = zoom
+        self.zoom_cache_frames = zoom_cache_frames
+        self._levels = []               # 每个不重复画面的 mipmap 金字塔
+        self._bitmaps = []              # 每个不重复画面的原始尺寸位图
+        self._frame_sources = []        # 帧索引 -> 画面索引（重复帧指向同一画面）
+        self._zoomed = OrderedDict()    # 当前缩放倍数下的位图：画面索引 -> wx.Bitmap
+        self.zoom_builds = 0            # 生成缩放位图的次数
+
+    def __len__(self):
+        return len(self._frame_sources)
+
+    @property
+    def base_size(self):
+        """原始帧尺寸 (宽, 高)，尚无帧时为 None"""
+        if not self._levels:
+            return None
+        return self._levels[0][0].size
+
+    @property
+    def frame_size(self):
+        """按当前缩放倍数显示的帧尺寸 (宽, 高)，尚无帧时为 None"""
+        return self.zoomed_size(self._zoom)
+
+    @property
+    def zoom(self):
+        """当前缩放倍数"""
+        return self._zoom
+
+    def zoomed_size(self, zoom):
+        """计算指定缩放倍数下的帧尺寸
+
+        Args:
+            zoom: 缩放倍数
+
+        Returns:
+            tuple: (宽, 高)，尚无帧时为 None
+        """
+        size = self.base_size
+        if size is None:
+            return None
+        return max(1, round(size[0] * zoom)), max(1, round(size[1] * zoom))
+
+    def set_zoom(self, zoom):
+        """设置缩放倍数（缩放后的位图在显示时按需生成）
+
+        Args:
+            zoom: 缩放倍数
+        """
+        if zoom == self._zoom:
+            return
+        self._zoom = zoom
+        self._zoomed.clear()
+
+    def append(self, frame):
+        """追加一帧，构建其 mipmap 金字塔和原始尺寸位图
+
+        Args:
+            frame: 解码后的帧（DecodedFrame，RGBA 格式）
+        """
+        if frame.alias_of is not None:
+            # 与之前的帧内容相同，共享其金字塔和位图
+            self._frame_sources.append(self._frame_sources[frame.alias_of])
+            return
+
+        self._frame_sources.append(len(self._levels))
+        # 复制一份像素数据，不引用加载器的缓冲区或缓存文件映射
+        image = Image.frombytes("RGBA", (frame.width, frame.height), bytes(frame.rgba))
+        self._levels.append(build_mipmaps(image))
+        self._bitmaps.append(frame_to_bitmap(frame))
+
+    def _zoomed_bitmap(self, source):
+        """获取当前缩放倍数下的位图（未缓存时从最近一级缩放生成）"""
+        bitmap = self._zoomed.get(source)
+        if bitmap is not None:
+            self._zoomed.move_to_end(source)
+            return bitmap
+
+        size = self.frame_size
+        level = select_level(self._levels[source], size)
+        image = level if level.size == size else level.resize(size, Image.Resampling.BILINEAR)
+        bitmap = image_to_bitmap(image)
+        self.zoom_builds += 1
+
+        self._zoomed[source] = bitmap
+        if self.zoom_cache_frames:
+            while len(self._zoomed) > self.zoom_cache_frames:
+                self._zoomed.popitem(last=False)
+        return bitmap
+
+    def render(self, index, canvas):
+        """把指定帧按当前缩放倍数显示到画布上
+
+        Args:
+            index: 帧索引
+            canvas: FrameCanvas
+        """
+        source = self._frame_sources[index]
+        if self.frame_size == self.base_size:
+            canvas.SetBitmap(self._bitmaps[source])
+        else:
+            canvas.SetBitmap(self._zoomed_bitmap(source))
+
+    def prefetch(self, start, count):
+        """预先生成从 start 开始的若干帧在当前缩放倍数下的位图
+
+        Args:
+            start: 起始帧索引
+            count: 预取帧数
+        """
+        total = len(self._frame_sources)
+        if not total or self.frame_size == self.base_size:
+            return
+        if self.zoom_cache_frames:
+            count = min(count, self.zoom_cache_frames - 1)
+        for offset in range(min(count, total)):
+            source = self._frame_sources[(start + offset) % total]
+            if source not in self._zoomed:
+                self._zoomed_bitmap(source)
+
+    def clear(self):
+        """清空所有帧"""
+        self._levels.clear()
+        self._bitmaps.clear()
+        self._frame_sources.clear()
+        self._zoomed.clear()
+        self.zoom_builds = 0
+
+    def stats(self):
+        """获取帧存储统计信息
+
+        Returns:
+            dict: 帧数、不重复画面数、金字塔级数、金字塔字节数、当前缩放倍数、缓存的缩放位图数、生成次数
+        """
+        pyramid_bytes = sum(level.width * level.height * 4 for levels in self._levels for level in levels)
+        return {
+            "frames": len(self._frame_sources),
+            "unique_frames": len(self._levels),
+            "levels": len(self._levels[0]) if self._levels else 0,
+            "pyramid_bytes": pyramid_bytes,
+            "zoom": self._zoom,
+            "zoomed_resident": len(self._zoomed),
+            "zoom_builds": self.zoom_builds,
+        }
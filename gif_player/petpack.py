@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""预编译宠物包（.petpack）模块
+
+.petpack 把一个宠物形象预先裁剪、缩放好的 RGBA 帧、帧延迟、裁剪偏移和元数据放进
+一个文件，格式与解码帧缓存相同（只是文件头魔数不同），可以直接 mmap 映射读取，
+加载时完全不需要 Pillow 解码和缩放。
+
+加载 GIF 时如果同目录下有同名的 .petpack，且其源文件哈希、缩放设置和裁剪设置都与
+当前一致，就直接使用它；也可以直接把 .petpack 文件选为宠物形象。
+高 DPI 屏幕上帧按 DPI 倍数放大构建，对应的宠物包另外编译，文件名带倍数后缀
+（如 pet@2x.petpack），查找时同名的各倍数宠物包都会检查。
+
+命令行批量编译（多进程并行）：
+    python -m gif_player.petpack 目录或GIF文件... [-o 输出目录] [--scale 0.5]
+        [--box 宽x高] [--quality auto] [--dpi 1 2] [--no-trim] [-j 进程数]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .cache import CachedFrames, FrameCache, FrameFileWriter
+from .decoder import iter_decoded_frames
+from .scaling import FrameScaling, RESAMPLE_BY_QUALITY, QUALITY_AUTO
+
+# 文件格式常量
+PETPACK_MAGIC = b"PETPACK1"
+PETPACK_SUFFIX = ".petpack"
+PETPACK_VERSION = 1
+
+
+def petpack_path_for(gif_path, output_dir=None, dpi_scale=1):
+    """获取 GIF 对应的 .petpack 路径（默认与 GIF 同目录同名）
+
+    Args:
+        gif_path: GIF 文件路径
+        output_dir: 可选的输出目录
+        dpi_scale: 宠物包的 DPI 缩放倍数，不为 1 时文件名带倍数后缀（如 @2x）
+
+    Returns:
+        str: .petpack 文件路径
+    """
+    stem = os.path.splitext(os.path.basename(gif_path))[0]
+    if dpi_scale != 1:
+        stem += f"@{dpi_scale:g}x"
+    return os.path.join(output_dir or os.path.dirname(os.path.abspath(gif_path)), stem + PETPACK_SUFFIX)
+
+
+def compile_petpack(gif_path, output_path=None, scaling=None, trim=True, dpi_scale=1):
+    """把 GIF 编译为 .petpack
+
+    Args:
+        gif_path: GIF 文件路径
+        output_path: 输出路径，为 None 时按 DPI 倍数写到 GIF 同目录
+        scaling: 缩放设置（FrameScaling），为 None 时使用默认设置
+        trim: 是否裁剪所有帧共同的透明边缘
+        dpi_scale: DPI 缩放倍数，帧在 scaling 的基础上再放大该倍数（与宠物窗口构建高 DPI 帧变体的方式一致）
+
+    Returns:
+        str: 生成的 .petpack 路径
+    """
+    scaling = scaling or FrameScaling()
+    if dpi_scale != 1:
+        scaling = scaling.scaled(dpi_scale)
+    output_path = output_path or petpack_path_for(gif_path, dpi_scale=dpi_scale)
+
+    # 写入器在写完所有帧后裁剪透明边缘，裁剪区域和偏移记入元数据
+    writer = FrameFileWriter(output_path, PETPACK_MAGIC, trim)
+    try:
+        for image, frame in iter_decoded_frames(gif_path, scaling):
+            writer.append(image, frame.delay)
+        writer.finish({
+            "format": "petpack",
+            "version": PETPACK_VERSION,
+            "source": os.path.basename(gif_path),
+            "source_hash": FrameCache.file_hash(gif_path),
+            "scaling": scaling.cache_token(),
+            "dpi_scale": dpi_scale,
+            "trim_enabled": trim,
+        })
+    except BaseException:
+        writer.abort()
+        raise
+    return output_path
+
+
+def load_petpack(path):
+    """打开 .petpack
+
+    Args:
+        path: .petpack 文件路径
+
+    Returns:
+        CachedFrames: 映射后的帧集合
+
+    Raises:
+        ValueError: 文件格式不正确或版本不支持
+    """
+    pack = CachedFrames(path, PETPACK_MAGIC)
+    if pack.meta.get("format") != "petpack" or pack.meta.get("version") != PETPACK_VERSION:
+        pack.close()
+        raise ValueError("不支持的宠物包版本")
+    return pack
+
+
+def find_petpack(gif_path, scaling, trim):
+    """查找与 GIF 匹配的预编译宠物包（同名的各 DPI 倍数宠物包中缩放设置一致的那个）
+
+    Args:
+        gif_path: GIF 文件路径（本身就是 .petpack 时直接打开）
+        scaling: 当前的缩放设置
+        trim: 当前是否裁剪透明边缘
+
+    Returns:
+        CachedFrames: 匹配时返回映射后的帧集合，否则返回 None
+    """
+    if gif_path.lower().endswith(PETPACK_SUFFIX):
+        return load_petpack(gif_path)
+
+    path = petpack_path_for(gif_path)
+    candidates = glob.glob(glob.escape(path[:-len(PETPACK_SUFFIX)]) + "@*x" + PETPACK_SUFFIX)
+    if os.path.exists(path):
+        candidates.insert(0, path)
+
+    source_hash = None
+    for path in candidates:
+        try:
+            pack = load_petpack(path)
+        except (OSError, ValueError) as e:
+            print(f"宠物包无效，忽略: {path}（{e}）")
+            continue
+
+        meta = pack.meta
+        if meta.get("scaling") == scaling.cache_token() and meta.get("trim_enabled") == trim:
+            if source_hash is None:
+                source_hash = FrameCache.file_hash(gif_path)
+            if meta.get("source_hash") == source_hash:
+                return pack
+        pack.close()
+
+    if candidates:
+        print(f"没有与当前 GIF 和缩放设置（{scaling.cache_token()}）一致的宠物包，忽略: "
+              f"{', '.join(os.path.basename(path) for path in candidates)}")
+    return None
+
+
+def petpack_dpi_scale(path):
+    """读取宠物包构建时的 DPI 缩放倍数
+
+    Args:
+        path: .petpack 文件路径
+
+    Returns:
+        float: DPI 缩放倍数（旧版宠物包没有记录时为 1）
+    """
+    pack = load_petpack(path)
+    try:
+        return pack.meta.get("dpi_scale", 1)
+    finally:
+        pack.close()
+
+
+def _collect_gifs(sources):
+    """展开命令行给出的文件和目录，得到所有 GIF 路径"""
+    gifs = []
+    for source in sources:
+        if os.path.isdir(source):
+            for name in sorted(os.listdir(source)):
+                if name.lower().endswith(".gif"):
+                    gifs.append(os.path.join(source, name))
+        else:
+            gifs.append(source)
+    return gifs
+
+
+def _parse_box(value):
+    """解析 "宽x高" 形式的目标框"""
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def main(argv=None):
+    """命令行入口：并行编译多个 GIF
+
+    Returns:
+        int: 进程退出码（有失败时为 1）
+    """
+    parser = argparse.ArgumentParser(description="把 GIF 批量编译为 .petpack 宠物包")
+    parser.add_argument("sources", nargs="+", help="GIF 文件或包含 GIF 的目录")
+    parser.add_argument("-o", "--output-dir", help="输出目录（默认与 GIF 同目录）")
+    parser.add_argument("--scale", type=float, default=0.5, help="缩放比例（默认 0.5）")
+    parser.add_argument("--box", type=_parse_box, help="目标框，如 200x200（指定时忽略 --scale）")
+    parser.add_argument("--quality", default=QUALITY_AUTO,
+                        choices=sorted(RESAMPLE_BY_QUALITY) + [QUALITY_AUTO], help="缩放质量档位")
+    parser.add_argument("--dpi", type=float, nargs="+", default=[1.0],
+                        help="DPI 缩放倍数，每个倍数编译一个宠物包（如 --dpi 1 2，默认 1）")
+    parser.add_argument("--no-trim", action="store_true", help="不裁剪透明边缘")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="并行进程数")
+    args = parser.parse_args(argv)
+
+    gifs = _collect_gifs(args.sources)
+    if not gifs:
+        print("没有找到 GIF 文件")
+        return 1
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    scaling = FrameScaling(args.scale, args.box, args.quality)
+    start = time.perf_counter()
+    failed = 0
+    with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(gifs)))) as pool:
+        futures = {
+            pool.submit(compile_petpack, gif, petpack_path_for(gif, args.output_dir, dpi_scale), scaling,
+                        not args.no_trim, dpi_scale): gif
+            for gif in gifs for dpi_scale in args.dpi
+        }
+        for future in as_completed(futures):
+            gif = futures[future]
+            try:
+                print(f"已编译: {gif} -> {future.result()}")
+            except Exception as e:
+                failed += 1
+                print(f"编译失败: {gif}（{e}）")
+
+    print(f"共 {len(futures)} 个宠物包，失败 {failed} 个，耗时 {time.perf_counter() - start:.2f} 秒")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""GIF 预检模块
+
+在做任何解码之前，只遍历 GIF 的块结构（跳过 LZW 像素数据，不解码）读出画布尺寸、帧数
+和总时长，再按资源预算制定加载方案：帧数过多时抽帧，解码后总字节数过大时自动缩小，
+无法在预算内处理的文件直接拒绝并给出明确的原因。
+"""
+
+import math
+import mmap
+import os
+
+# GIF 块类型
+_EXTENSION_INTRODUCER = 0x21
+_IMAGE_SEPARATOR = 0x2C
+_TRAILER = 0x3B
+_GRAPHIC_CONTROL_LABEL = 0xF9
+
+# 缩小后帧的最短边不能小于该像素数，否则拒绝
+MIN_SCALED_SIDE = 16
+
+
+class GifInfo:
+    """GIF 预检信息"""
+
+    def __init__(self, width, height, frame_count, duration, file_size):
+        """初始化预检信息
+
+        Args:
+            width: 画布宽度
+            height: 画布高度
+            frame_count: 帧数
+            duration: 总时长（毫秒，按播放时的最小延迟规则计算）
+            file_size: 文件字节数
+        """
+        self.width = width
+        self.height = height
+        self.frame_count = frame_count
+        self.duration = duration
+        self.file_size = file_size
+
+    def __repr__(self):
+        return (f"GifInfo({self.width}x{self.height}, {self.frame_count} 帧, "
+                f"{self.duration} ms, {self.file_size} 字节)")
+
+
+def _skip_sub_blocks(data, pos):
+    """跳过一串数据子块，返回其后的位置（数据被截断时返回 None）"""
+    size = len(data)
+    while pos < size:
+        block_size = data[pos]
+        pos += 1 + block_size
+        if block_size == 0:
+            return pos
+    return None
+
+
+def _color_table_size(flags):
+    """根据描述符标志位计算颜色表字节数"""
+    return 3 * (2 << (flags & 0x07)) if flags & 0x80 else 0
+
+
+def inspect_gif(path):
+    """只读取块结构，获取 GIF 的尺寸、帧数和总时长（不解码像素）
+
+    Args:
+        path: GIF 文件路径
+
+    Returns:
+        GifInfo: 预检信息
+
+    Raises:
+        ValueError: 不是有效的 GIF 文件
+    """
+    file_size = os.path.getsize(path)
+    if file_size < 13:
+        raise ValueError("文件太小，不是有效的 GIF")
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if data[:6] not in (b"GIF87a", b"GIF89a"):
+            raise ValueError("不是有效的 GIF 文件")
+
+        width = int.from_bytes(data[6:8], "little")
+        height = int.from_bytes(data[8:10], "little")
+        pos = 13 + _color_table_size(data[10])
+
+        frame_count = 0
+        duration = 0
+        delay = 100  # 与解码时一致：没有图形控制扩展时默认 100ms
+        size = len(data)
+        while pos < size:
+            block = data[pos]
+            if block == _TRAILER:
+                break
+            if block == _EXTENSION_INTRODUCER:
+                if pos + 1 >= size:
+                    break
+                if data[pos + 1] == _GRAPHIC_CONTROL_LABEL and pos + 7 < size:
+                    # 图形控制扩展：延迟单位为 1/100 秒
+                    delay = int.from_bytes(data[pos + 4:pos + 6], "little") * 10
+                pos = _skip_sub_blocks(data, pos + 2)
+                if pos is None:
+                    break
+            elif block == _IMAGE_SEPARATOR:
+                if pos + 10 > size:
+                    break
+                flags = data[pos + 9]
+                # 图像描述符（10 字节）、局部颜色表、LZW 最小码长（1 字节），然后是像素数据子块
+                pos = _skip_sub_blocks(data, pos + 10 + _color_table_size(flags) + 1)
+                if pos is None:
+                    # 像素数据被截断：与 Pillow 一致，之前完整的帧仍然可以解码播放
+                    break
+                frame_count += 1
+                duration += max(delay, 10)
+            else:
+                # 无法识别的块：之后的数据不可信，按已读到的帧处理（与 Pillow 的容错一致）
+                break
+
+    if frame_count == 0:
+        raise ValueError("GIF 中没有任何帧")
+    if not width or not height:
+        raise ValueError("GIF 画布尺寸无效")
+    return GifInfo(width, height, frame_count, duration, file_size)
+
+
+class PreflightPlan:
+    """按预算调整后的加载方案"""
+
+    def __init__(self, info, scaling, frame_step=1, notes=None):
+        """初始化加载方案
+
+        Args:
+            info: 预检信息（GifInfo）
+            scaling: 实际使用的缩放设置（可能比配置更小）
+            frame_step: 抽帧间隔，1 表示保留所有帧
+            notes: 对原配置所做调整的说明列表
+        """
+        self.info = info
+        self.scaling = scaling
+        self.frame_step = frame_step
+        self.notes = notes or []
+
+    @property
+    def adjusted(self):
+        """是否对原配置做了调整"""
+        return bool(self.notes)
+
+
+def plan_gif_load(info, scaling, max_frames=0, max_decoded_bytes=0, max_canvas_pixels=0):
+    """按资源预算制定加载方案
+
+    Args:
+        info: 预检信息（GifInfo）
+        scaling: 配置的缩放设置（FrameScaling）
+        max_frames: 最多保留的帧数，超出时抽帧，0 表示不限制
+        max_decoded_bytes: 缩放后所有帧 RGBA 数据的总字节数上限，超出时自动缩小，0 表示不限制
+        max_canvas_pixels: 画布像素数上限（解码时每帧都要先合成原始尺寸的画面），超出时拒绝，0 表示不限制
+
+    Returns:
+        PreflightPlan: 加载方案
+
+    Raises:
+        ValueError: 无法在预算内加载（附带原因）
+    """
+    notes = []
+    canvas_pixels = info.width * info.height
+    if max_canvas_pixels and canvas_pixels > max_canvas_pixels:
+        raise ValueError(f"GIF 画布过大（{info.width}x{info.height}），"
+                         f"超过上限 {max_canvas_pixels / 1_000_000:g} 百万像素")
+
+    frame_step = 1
+    frame_count = info.frame_count
+    if max_frames and frame_count > max_frames:
+        frame_step = math.ceil(frame_count / max_frames)
+        frame_count = math.ceil(frame_count / frame_step)
+        notes.append(f"帧数 {info.frame_count} 超过上限 {max_frames}，每 {frame_step} 帧保留 1 帧"
+                     f"（保留 {frame_count} 帧，总时长不变）")
+
+    width, height = scaling.target_size(info.width, info.height)
+    decoded_bytes = width * height * 4 * frame_count
+    if max_decoded_bytes and decoded_bytes > max_decoded_bytes:
+        factor = math.sqrt(max_decoded_bytes / decoded_bytes)
+        scaling = scaling.scaled(factor)
+        width, height = scaling.target_size(info.width, info.height)
+        if min(width, height) < MIN_SCALED_SIDE:
+            raise ValueError(f"GIF 解码后约需 {decoded_bytes / 1024 / 1024:.0f} MB，"
+                             f"缩小到预算 {max_decoded_bytes / 1024 / 1024:.0f} MB 内后画面过小")
+        notes.append(f"解码后约需 {decoded_bytes / 1024 / 1024:.0f} MB，超过预算 "
+                     f"{max_decoded_bytes / 1024 / 1024:.0f} MB，自动缩小到 {width}x{height}")
+
+    return PreflightPlan(info, scaling, frame_step, notes)
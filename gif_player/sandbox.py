@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""解码沙箱模块
+
+用户选择的 GIF 可能是畸形文件或"解压炸弹"，在界面进程内解码时一旦崩溃或占满内存，
+常驻的桌面宠物也会跟着出问题。沙箱把解码、缩放和透明边缘裁剪放到独立的子进程中执行，
+子进程用 resource 限制地址空间和 CPU 时间，父进程再加一道墙钟超时。
+
+子进程把结果按帧缓存格式直接写入文件（启用帧缓存时就是缓存文件本身），父进程只需
+mmap 映射读取，帧数据不经过进程间管道复制。超时、超限和子进程异常退出都以
+SandboxError 抛出，按普通的加载失败处理。
+
+子进程只导入本包中不依赖 wx 的模块（解码、缓存写入），不加载界面；代价是要等子进程
+解码完整个文件才能显示首帧，因此沙箱默认关闭，只在需要隔离来源不明的文件时开启。
+"""
+
+import multiprocessing
+import signal
+import time
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块，只能依靠墙钟超时
+    resource = None
+
+from .cache import FrameFileWriter
+from .decoder import iter_decoded_frames
+
+# 等待子进程时检查取消和超时的间隔（秒）
+_POLL_INTERVAL = 0.1
+
+
+class SandboxError(RuntimeError):
+    """沙箱解码失败（超时、超出资源限制或子进程异常退出）"""
+
+
+def _apply_limits(memory_bytes, cpu_seconds):
+    """在子进程中设置资源限制（平台不支持时只打印提示）"""
+    if resource is None:
+        if memory_bytes or cpu_seconds:
+            print("当前平台不支持 resource 资源限制，解码沙箱只使用超时限制")
+        return
+
+    limits = []
+    if memory_bytes:
+        limits.append((resource.RLIMIT_AS, memory_bytes, memory_bytes))
+    if cpu_seconds:
+        # 软限制到达时收到 SIGXCPU，硬限制多留 1 秒兜底
+        limits.append((resource.RLIMIT_CPU, cpu_seconds, cpu_seconds + 1))
+
+    for kind, soft, hard in limits:
+        try:
+            resource.setrlimit(kind, (soft, hard))
+        except (ValueError, OSError) as e:
+            print(f"设置解码沙箱资源限制失败: {e}")
+
+
+def _sandbox_main(conn, gif_path, output_path, meta, scaling, trim, frame_step,
+                  workers, parallel_min_bytes, memory_bytes, cpu_seconds):
+    """子进程入口：在资源限制下解码 GIF 并写入帧文件，结果通过管道返回"""
+    _apply_limits(memory_bytes, cpu_seconds)
+
+    writer = None
+    try:
+        writer = FrameFileWriter(output_path, trim=trim)
+        frames = iter_decoded_frames(gif_path, scaling, workers, parallel_min_bytes, frame_step=frame_step)
+        for image, frame in frames:
+            writer.append(image, frame.delay)
+        if writer.width is None:
+            raise ValueError("GIF 中没有任何帧")
+        writer.finish(meta)
+        conn.send(("ok", len(writer.delays)))
+    except MemoryError:
+        if writer:
+            writer.abort()
+        conn.send(("error", "解码所需内存超出沙箱限制"))
+    except Exception as e:
+        if writer:
+            writer.abort()
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+class DecodeSandbox:
+    """在受限子进程中解码 GIF"""
+
+    def __init__(self, memory_bytes=0, cpu_seconds=0, timeout=0):
+        """初始化沙箱
+
+        Args:
+            memory_bytes: 子进程地址空间上限（字节），0 表示不限制
+            cpu_seconds: 子进程 CPU 时间上限（秒），0 表示不限制
+            timeout: 墙钟超时（秒），0 表示不限制
+        """
+        self.memory_bytes = memory_bytes
+        self.cpu_seconds = cpu_seconds
+        self.timeout = timeout
+        self._process = None
+        self._terminated = False
+
+    def decode(self, gif_path, output_path, meta, scaling, trim=False, frame_step=1,
+               workers=1, parallel_min_bytes=0):
+        """在子进程中解码 GIF 并写入帧文件（阻塞到子进程结束，在加载线程中调用）
+
+        Args:
+            gif_path: GIF 文件路径
+            output_path: 输出的帧文件路径（帧缓存格式，完成时原子替换）
+            meta: 写入帧文件的元数据（裁剪区域由子进程补充）
+            scaling: 缩放设置（FrameScaling）
+            trim: 是否裁剪所有帧共同的透明边缘
+            frame_step: 抽帧间隔
+            workers: 子进程中并行缩放的线程数
+            parallel_min_bytes: GIF 文件小于该字节数时串行解码
+
+        Returns:
+            int: 解码出的帧数
+
+        Raises:
+            SandboxError: 超时、超出资源限制、子进程异常退出或解码失败
+        """
+        # 使用 spawn 启动全新的解释器，不继承界面进程的线程和 wx 状态
+        context = multiprocessing.get_context("spawn")
+        reader, writer = context.Pipe(duplex=False)
+        process = context.Process(
+            target=_sandbox_main,
+            args=(writer, gif_path, output_path, meta, scaling, trim, frame_step,
+                  workers, parallel_min_bytes, self.memory_bytes, self.cpu_seconds),
+            name="GifDecodeSandbox",
+            daemon=True,
+        )
+        self._process = process
+        start = time.monotonic()
+        process.start()
+        writer.close()
+
+        try:
+            result = None
+            while result is None:
+                if self._terminated:
+                    raise SandboxError("解码已取消")
+                if reader.poll(_POLL_INTERVAL):
+                    try:
+                        result = reader.recv()
+                    except EOFError:
+                        # 子进程没有返回结果就退出了（被信号终止或崩溃）
+                        process.join()
+                        if self._terminated:
+                            raise SandboxError("解码已取消")
+                        raise SandboxError(self._describe_exit(process.exitcode))
+                elif self.timeout and time.monotonic() - start > self.timeout:
+                    raise SandboxError(f"解码超时（超过 {self.timeout} 秒）")
+            process.join()
+        finally:
+            reader.close()
+            if process.is_alive():
+                process.kill()
+                process.join()
+            self._process = None
+
+        status, value = result
+        if status != "ok":
+            raise SandboxError(f"解码失败: {value}")
+        print(f"沙箱解码完成: {value} 帧，耗时 {time.monotonic() - start:.2f} 秒")
+        return value
+
+    def terminate(self):
+        """终止正在运行的子进程（可在任意线程调用）"""
+        self._terminated = True
+        process = self._process
+        if process is not None and process.is_alive():
+            process.kill()
+
+    def _describe_exit(self, exitcode):
+        """把子进程的退出码转换为错误说明"""
+        if exitcode is not None and exitcode < 0:
+            signum = -exitcode
+            if signum == getattr(signal, "SIGXCPU", None):
+                return f"解码超出 CPU 时间限制（{self.cpu_seconds} 秒）"
+            if signum == getattr(signal, "SIGKILL", None):
+                return "解码进程被系统终止（可能超出内存限制）"
+            if signum == getattr(signal, "SIGSEGV", None):
+                return "解码进程崩溃（文件可能已损坏）"
+            return f"解码进程被信号 {signum} 终止"
+        return f"解码进程异常退出（退出码 {exitcode}）"
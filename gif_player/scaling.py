@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""帧缩放模块
+
+决定宠物帧的显示尺寸和缩放质量。尺寸可以按比例缩放，也可以按目标框等比适配；
+质量分为三档：
+    fast：整数倍缩小时用 Image.reduce（盒式平均），否则用 NEAREST，适合像素风
+    balanced：BILINEAR
+    high：LANCZOS，效果最好也最慢
+    nearest：始终用 NEAREST，不会产生源图像中没有的颜色（调色板索引存储使用）
+auto 会根据帧数 × 单帧像素面积估算总工作量自动选择档位，不会选到 nearest。
+"""
+
+from PIL import Image
+
+# 质量档位
+QUALITY_FAST = "fast"
+QUALITY_BALANCED = "balanced"
+QUALITY_HIGH = "high"
+QUALITY_NEAREST = "nearest"
+QUALITY_AUTO = "auto"
+
+# 各档位使用的重采样滤镜
+RESAMPLE_BY_QUALITY = {
+    QUALITY_FAST: Image.Resampling.NEAREST,
+    QUALITY_BALANCED: Image.Resampling.BILINEAR,
+    QUALITY_HIGH: Image.Resampling.LANCZOS,
+    QUALITY_NEAREST: Image.Resampling.NEAREST,
+}
+
+# auto 档位的阈值：帧数 × 单帧像素面积（原始尺寸）
+AUTO_HIGH_MAX_PIXELS = 40_000_000
+AUTO_BALANCED_MAX_PIXELS = 160_000_000
+
+
+def resolve_quality(quality, frame_count, width, height):
+    """把配置的质量档位解析为具体档位
+
+    Args:
+        quality: 配置的档位（fast / balanced / high / nearest / auto）
+        frame_count: 帧数
+        width: 原始帧宽度
+        height: 原始帧高度
+
+    Returns:
+        str: fast、balanced、high 或 nearest
+    """
+    if quality in RESAMPLE_BY_QUALITY:
+        return quality
+
+    workload = frame_count * width * height
+    if workload <= AUTO_HIGH_MAX_PIXELS:
+        return QUALITY_HIGH
+    if workload <= AUTO_BALANCED_MAX_PIXELS:
+        return QUALITY_BALANCED
+    return QUALITY_FAST
+
+
+def resize_image(image, size, quality):
+    """按质量档位缩放图像
+
+    Args:
+        image: Pillow 图像
+        size: 目标尺寸 (宽, 高)
+        quality: 具体档位（fast / balanced / high / nearest）
+
+    Returns:
+        Image: 缩放后的图像
+    """
+    if image.size == tuple(size):
+        return image
+
+    if quality == QUALITY_FAST:
+        # 整数倍缩小时用 reduce，比任何滤镜都快
+        factor_x, factor_y = image.width // size[0], image.height // size[1]
+        if (factor_x > 1 and factor_y > 1
+                and image.width == size[0] * factor_x and image.height == size[1] * factor_y):
+            return image.reduce((factor_x, factor_y))
+
+    return image.resize(size, RESAMPLE_BY_QUALITY.get(quality, Image.Resampling.LANCZOS))
+
+
+class FrameScaling:
+    """帧缩放设置"""
+
+    def __init__(self, scale=0.5, box=None, quality=QUALITY_AUTO):
+        """初始化缩放设置
+
+        Args:
+            scale: 缩放比例（未指定目标框时使用）
+            box: 可选的目标框 (宽, 高)，帧会等比缩放到恰好放进该框
+            quality: 质量档位（fast / balanced / high / nearest / auto）
+        """
+        self.scale = scale
+        self.box = tuple(box) if box else None
+        self.quality = quality if quality in RESAMPLE_BY_QUALITY or quality == QUALITY_AUTO else QUALITY_AUTO
+
+    def target_size(self, width, height):
+        """计算缩放后的帧尺寸
+
+        Args:
+            width: 原始宽度
+            height: 原始高度
+
+        Returns:
+            tuple: (宽度, 高度)，每一边至少为 1 像素
+        """
+        factor = self.factor(width, height)
+        return max(1, int(width * factor)), max(1, int(height * factor))
+
+    def factor(self, width, height):
+        """计算实际缩放倍数
+
+        Args:
+            width: 原始宽度
+            height: 原始高度
+
+        Returns:
+            float: 缩放倍数
+        """
+        if self.box:
+            return min(self.box[0] / width, self.box[1] / height)
+        return self.scale
+
+    def scaled(self, factor):
+        """得到在当前设置基础上再缩放 factor 倍的缩放设置
+
+        Args:
+            factor: 额外的缩放倍数（小于 1 为缩小，大于 1 为放大）
+
+        Returns:
+            FrameScaling: 新的缩放设置（质量档位不变）
+        """
+        if self.box:
+            box = (max(1, int(self.box[0] * factor)), max(1, int(self.box[1] * factor)))
+            return FrameScaling(self.scale, box, self.quality)
+        return FrameScaling(round(self.scale * factor, 4), None, self.quality)
+
+    def with_quality(self, quality):
+        """得到只更换质量档位的缩放设置
+
+        Args:
+            quality: 新的质量档位
+
+        Returns:
+            FrameScaling: 新的缩放设置（尺寸设置不变）
+        """
+        return FrameScaling(self.scale, self.box, quality)
+
+    def cache_token(self):
+        """用于缓存键的设置描述（设置不同则缓存不同）"""
+        size = f"box{self.box[0]}x{self.box[1]}" if self.box else f"s{self.scale:g}"
+        return f"{size}-{self.quality}"
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""帧调度模块
+
+按单调时钟计算每一帧应当显示的时间：第 i 帧的截止时间是播放起点加上前 i 帧延迟之和，
+与定时器实际在什么时候触发无关，因此事件循环的延迟和定时器重启的开销不会逐帧累积，
+动画在负载较高时也不会越放越慢。定时器触发晚了时，直接跳到当前时间应当显示的帧，
+而不是把每一帧都推迟播放。同时统计实际显示时间相对预定时间的偏差。
+还可以限制切换帧的最高频率（到点的帧过密时按时间线跳过）。
+帧延迟列表（FrameDelays）保存每帧合并重复帧之前的原始延迟，逐个规范化后求和，
+规范化规则（电源模式）变化时原地重新计算，无需重新加载帧；调度器直接使用最终的延迟。
+"""
+
+import time
+from bisect import bisect_right
+
+
+class FrameDelays(list):
+    """播放用的帧延迟列表（毫秒），同时保存每帧合并前的原始延迟
+
+    合并重复帧后的一帧可能由几帧源帧组成，必须逐个规范化原始延迟再求和，
+    否则几帧极短延迟合并后的总延迟会逃过规范化，播放时长也会随是否合并而变。
+    """
+
+    def __init__(self, normalize_delay=None):
+        """初始化延迟列表
+
+        Args:
+            normalize_delay: 帧延迟规范化函数（参数和返回值都是毫秒），为 None 时不规范化
+        """
+        super().__init__()
+        self.normalize_delay = normalize_delay
+        self.raw = []  # 每帧合并前各源帧的原始延迟
+
+    def add(self, raw_delays):
+        """追加一帧
+
+        Args:
+            raw_delays: 该帧合并前各源帧的原始延迟（DecodedFrame.raw_delays）
+        """
+        raw = tuple(raw_delays)
+        self.raw.append(raw)
+        self.append(self._total(raw))
+
+    def set_normalize(self, normalize_delay):
+        """更换规范化函数，并按原始延迟原地重新计算所有帧的延迟
+
+        Args:
+            normalize_delay: 同 __init__
+
+        Returns:
+            bool: 规范化函数是否变化（变化时正在使用该列表的调度器需要调用 reload_delays）
+        """
+        if normalize_delay == self.normalize_delay:
+            return False
+        self.normalize_delay = normalize_delay
+        self[:] = [self._total(raw) for raw in self.raw]
+        return True
+
+    def _total(self, raw):
+        """一帧规范化后的总延迟"""
+        if self.normalize_delay is None:
+            return sum(raw)
+        return sum(self.normalize_delay(delay) for delay in raw)
+
+
+class FrameScheduler:
+    """基于单调时钟、不累积误差的帧调度器"""
+
+    def __init__(self, delays, clock=time.monotonic, min_interval=0):
+        """初始化调度器
+
+        Args:
+            delays: 帧延迟列表（毫秒）。直接引用该列表，后台加载追加的帧会自动加入循环
+            clock: 返回秒数的单调时钟（每帧至少按 1ms 计时）
+            min_interval: 两次切换帧之间的最短间隔（毫秒），0 表示不限制
+        """
+        self.delays = delays
+        self.clock = clock
+        self.min_interval = min_interval
+        self._ends = []          # 第 i 帧在一个循环内的结束时间（毫秒，延迟的前缀和）
+        self._cycle_start = 0.0  # 当前循环的起点（秒）
+        self._frame = 0          # 最近一次调度的帧
+        self._running = False
+        self.shown = 0           # 显示的帧数
+        self.skipped = 0         # 因为落后而跳过的帧数
+        self.late_total = 0.0    # 显示时间晚于预定时间的累计值（毫秒）
+        self.late_max = 0.0      # 最大的延后（毫秒）
+
+    def _sync(self):
+        """把新追加的帧延迟加入前缀和"""
+        total = self._ends[-1] if self._ends else 0
+        for delay in self.delays[len(self._ends):]:
+            total += max(1, delay)
+            self._ends.append(total)
+
+    def set_min_interval(self, min_interval):
+        """更换最短切换间隔（正在调度时从当前帧的开始处重新计时）
+
+        Args:
+            min_interval: 同 __init__
+
+        Returns:
+            int: 正在调度时返回距离下一帧的等待时间（毫秒），否则返回 None
+        """
+        self.min_interval = min_interval
+        if self._running:
+            return self.start(self._frame)
+        return None
+
+    def reload_delays(self):
+        """帧延迟被原地修改后重新计算前缀和（当前帧保持不变）
+
+        Returns:
+            int: 正在调度时从当前帧的开始处重新计时，返回距离下一帧的等待时间（毫秒），否则返回 None
+        """
+        self._ends = []
+        self._sync()
+        if self._running:
+            return self.start(self._frame)
+        return None
+
+    def _frame_start(self, index):
+        """第 index 帧在一个循环内的开始时间（毫秒）"""
+        return self._ends[index - 1] if index else 0
+
+    @property
+    def running(self):
+        """是否正在调度"""
+        return self._running
+
+    def start(self, frame=0):
+        """从指定帧的开始处起播
+
+        Args:
+            frame: 起始帧索引
+
+        Returns:
+            int: 距离下一帧的等待时间（毫秒）
+        """
+        self._sync()
+        frame = min(frame, max(0, len(self._ends) - 1))
+        self._frame = frame
+        self._cycle_start = self.clock() - self._frame_start(frame) / 1000
+        self._running = True
+        return self._wait(self._elapsed_ms())
+
+    def stop(self):
+        """停止调度（之后用 start 从指定帧重新起播，或用 resume 按原来的时间线继续）"""
+        self._running = False
+
+    def resume(self):
+        """按原来的时间线继续播放：得到此刻应当显示的帧，就像播放从未中断过一样
+
+        停止期间经过的帧不计入跳帧统计。
+
+        Returns:
+            tuple: (帧索引, 等待毫秒数)
+        """
+        self._sync()
+        self._running = True
+        if not self._ends:
+            return 0, 1
+        elapsed = self._elapsed_ms()
+        self._frame = min(bisect_right(self._ends, elapsed), len(self._ends) - 1)
+        return self._frame, self._wait(elapsed)
+
+    def _elapsed_ms(self):
+        """当前循环已经播放的时间（毫秒），超过一个循环时把起点移到当前循环"""
+        elapsed = (self.clock() - self._cycle_start) * 1000
+        total = self._ends[-1] if self._ends else 0
+        if total and elapsed >= total:
+            cycles = int(elapsed // total)
+            self._cycle_start += cycles * total / 1000
+            elapsed -= cycles * total
+        return elapsed
+
+    def _wait(self, elapsed):
+        """距离当前帧结束（下一帧的截止时间）的毫秒数"""
+        if not self._ends:
+            return 1
+        return max(1, int(self._ends[self._frame] - elapsed + 0.999), int(self.min_interval + 0.999))
+
+    def tick(self):
+        """定时器触发时调用：得到当前时间应当显示的帧和到下一帧的等待时间
+
+        Returns:
+            tuple: (帧索引, 等待毫秒数)
+        """
+        self._sync()
+        if not self._ends:
+            return 0, 1
+
+        previous = self._frame
+        elapsed = self._elapsed_ms()
+        frame = min(bisect_right(self._ends, elapsed), len(self._ends) - 1)
+
+        if frame != previous:
+            # 按播放顺序从上一帧数到当前帧，中间经过的帧都被跳过
+            passed = (frame - previous) % len(self._ends)
+            self.skipped += passed - 1
+            self.shown += 1
+            late = elapsed - self._frame_start(frame)
+            self.late_total += late
+            self.late_max = max(self.late_max, late)
+        self._frame = frame
+        return frame, self._wait(elapsed)
+
+    def stats(self):
+        """获取计时统计
+
+        Returns:
+            dict: 显示帧数、跳过帧数、平均延后和最大延后（毫秒）、一个循环的预定时长（毫秒）
+        """
+        return {
+            "shown": self.shown,
+            "skipped": self.skipped,
+            "avg_late_ms": round(self.late_total / self.shown, 2) if self.shown else 0.0,
+            "max_late_ms": round(self.late_max, 2),
+            "cycle_ms": self._ends[-1] if self._ends else 0,
+        }
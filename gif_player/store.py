@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""帧存储模块
+
+按内存预算管理 GIF 帧位图。常用的帧以 wx.Bitmap 形式常驻，超出预算时按最近最少
+使用（LRU）淘汰，被淘汰的帧在需要时再从压缩后的源数据重建。
+内容相同的帧共享同一份源数据和位图。
+"""
+
+from collections import OrderedDict
+
+from .bitmap import frame_to_bitmap
+from .decoder import DecodedFrame
+
+
+class FrameStore:
+    """带内存预算和 LRU 淘汰的帧存储
+
+    用法与列表类似：append 追加帧，len 获取帧数，下标访问得到 wx.Bitmap。
+    预算为 0 时不限制内存，所有帧位图常驻，也不保存压缩源数据。
+    """
+
+    def __init__(self, budget_bytes=0):
+        """初始化帧存储
+
+        Args:
+            budget_bytes: 常驻位图的内存预算（字节），0 表示不限制
+        """
+        self.budget_bytes = budget_bytes
+        self._sources = []              # 每个不重复画面的紧凑源数据：(宽, 高, zlib 压缩的像素数据, 像素格式)
+        self._frame_sources = []        # 帧索引 -> 源数据索引（重复帧指向同一源数据）
+        self._bitmaps = OrderedDict()   # 常驻位图：源数据索引 -> wx.Bitmap，按最近使用排序
+        self._bitmap_bytes = 0          # 单帧位图的估算字节数
+        self.hits = 0                   # 命中常驻位图的次数
+        self.misses = 0                 # 需要重建位图的次数
+        self.evictions = 0              # 淘汰位图的次数
+
+    @property
+    def limited(self):
+        """是否设置了内存预算"""
+        return self.budget_bytes > 0
+
+    @property
+    def capacity(self):
+        """预算内最多可常驻的位图数量"""
+        if not self.limited or not self._bitmap_bytes:
+            return len(self._sources)
+        return max(1, self.budget_bytes // self._bitmap_bytes)
+
+    def __len__(self):
+        return len(self._frame_sources)
+
+    @property
+    def frame_size(self):
+        """帧尺寸 (宽, 高)，尚无帧时为 None"""
+        if not self._sources:
+            return None
+        width, height, _, _ = self._sources[0]
+        return width, height
+
+    def append(self, frame):
+        """追加一帧并创建其位图
+
+        Args:
+            frame: 解码后的帧（DecodedFrame）
+
+        Returns:
+            wx.Bitmap: 该帧的位图
+        """
+        if frame.alias_of is not None:
+            # 与之前的帧内容相同，共享其源数据和位图
+            self._frame_sources.append(self._frame_sources[frame.alias_of])
+            return self[len(self._frame_sources) - 1]
+
+        index = len(self._sources)
+        self._frame_sources.append(index)
+        if self.limited:
+            packed = frame.packed if frame.packed is not None else frame.pack()
+        else:
+            packed = None
+        self._sources.append((frame.width, frame.height, packed, frame.alpha_mode))
+        self._bitmap_bytes = frame.width * frame.height * 4
+
+        bitmap = frame_to_bitmap(frame)
+        self._put(index, bitmap)
+        return bitmap
+
+    def __getitem__(self, index):
+        """获取指定帧的位图（未常驻时从源数据重建）
+
+        Args:
+            index: 帧索引
+
+        Returns:
+            wx.Bitmap: 该帧的位图
+        """
+        source = self._frame_sources[index]
+        bitmap = self._bitmaps.get(source)
+        if bitmap is not None:
+            self.hits += 1
+            self._bitmaps.move_to_end(source)
+            return bitmap
+
+        self.misses += 1
+        return self._rebuild(source)
+
+    def render(self, index, canvas):
+        """把指定帧显示到画布上
+
+        Args:
+            index: 帧索引
+            canvas: FrameCanvas
+        """
+        canvas.SetBitmap(self[index])
+
+    def prefetch(self, start, count):
+        """预先重建从 start 开始的若干帧位图（按播放顺序循环）
+
+        预取数量不会超过预算容量，避免预取的帧互相淘汰。
+
+        Args:
+            start: 起始帧索引
+            count: 预取帧数
+        """
+        total = len(self._frame_sources)
+        if not total or not self.limited:
+            return
+
+        count = min(count, self.capacity - 1, total)
+        for offset in range(count):
+            source = self._frame_sources[(start + offset) % total]
+            if source not in self._bitmaps:
+                self._rebuild(source)
+
+    def _rebuild(self, source):
+        """从压缩源数据重建位图并放入常驻集合"""
+        width, height, packed, alpha_mode = self._sources[source]
+        bitmap = frame_to_bitmap(DecodedFrame.unpack(source, width, height, packed, alpha_mode=alpha_mode))
+        self._put(source, bitmap)
+        return bitmap
+
+    def _put(self, source, bitmap):
+        """放入常驻集合，超出预算时淘汰最久未使用的位图"""
+        self._bitmaps[source] = bitmap
+        self._bitmaps.move_to_end(source)
+        if not self.limited:
+            return
+
+        while len(self._bitmaps) > self.capacity:
+            self._bitmaps.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """清空所有帧和统计数据"""
+        self._sources.clear()
+        self._frame_sources.clear()
+        self._bitmaps.clear()
+        self._bitmap_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """获取帧存储统计信息
+
+        Returns:
+            dict: 帧数、不重复画面数、常驻位图数、常驻字节数、压缩源数据字节数及命中/未命中/淘汰次数
+        """
+        return {
+            "frames": len(self._frame_sources),
+            "unique_frames": len(self._sources),
+            "resident": len(self._bitmaps),
+            "resident_bytes": len(self._bitmaps) * self._bitmap_bytes,
+            "source_bytes": sum(len(packed) for _, _, packed, _ in self._sources if packed),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
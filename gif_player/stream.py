@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""流式帧存储模块
+
+超大的 GIF（录屏得到的几百帧大图）无法把所有帧都留在内存里。流式播放时，后台加载线程
+按播放顺序反复解码整个文件，每次只领先当前帧 N 帧，把解码结果放进固定容量的环形缓冲；
+动画定时器从缓冲中取帧并创建位图，用完即丢弃。无论 GIF 多长，内存占用都只有 N 帧。
+
+缓冲已满时加载线程阻塞等待；定时器到点而下一帧还没解码好时记为一次欠载（underrun），
+保持当前画面，迟到的帧在之后被跳过。流式播放只能顺序前进，不支持跳到任意帧。
+"""
+
+import threading
+from collections import deque
+
+from .bitmap import frame_to_bitmap
+
+
+class StreamingFrameStore:
+    """固定容量环形缓冲的流式帧存储
+
+    加载线程调用 feed 放入帧，主线程调用 render 取帧显示。
+    """
+
+    limited = False
+
+    def __init__(self, buffer_frames=8):
+        """初始化帧存储
+
+        Args:
+            buffer_frames: 环形缓冲的容量（领先当前帧解码的帧数）
+        """
+        self.capacity = max(2, buffer_frames)
+        self._ring = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._total = None        # 一遍完整解码后才知道总帧数
+        self._count = 0           # 已知的帧数（首遍解码时逐帧增长）
+        self._shown = None        # 当前显示的帧索引
+        self.frame_size = None
+        self.passes = 0           # 已完成的完整解码遍数
+        self.underruns = 0        # 到点时下一帧尚未解码好的次数
+        self.dropped = 0          # 迟到而被跳过的帧数
+
+    def __len__(self):
+        return self._count
+
+    def feed(self, frame):
+        """放入一帧（在加载线程中调用，缓冲已满时阻塞）
+
+        Args:
+            frame: 解码后的帧
+
+        Returns:
+            bool: 是否放入成功，存储已关闭时返回 False
+        """
+        with self._cond:
+            while len(self._ring) >= self.capacity and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return False
+            self._ring.append(frame)
+            return True
+
+    def finish_pass(self, count):
+        """一遍完整解码结束（在加载线程中调用）
+
+        Args:
+            count: 本遍的帧数
+        """
+        with self._cond:
+            self._total = count
+            self.passes += 1
+
+    def append(self, frame):
+        """首遍解码时登记一帧（只记录帧数和尺寸，像素数据经环形缓冲交付）
+
+        Args:
+            frame: 解码后的帧
+        """
+        self._count = max(self._count, frame.index + 1)
+        self.frame_size = (frame.width, frame.height)
+
+    def render(self, index, canvas):
+        """从缓冲中取出指定帧并显示
+
+        Args:
+            index: 帧索引
+            canvas: FrameCanvas
+        """
+        if index == self._shown:
+            return
+
+        with self._cond:
+            # 丢弃已经迟到的帧
+            while self._ring and self._is_behind(self._ring[0].index, index):
+                self._ring.popleft()
+                self.dropped += 1
+
+            if not self._ring or self._ring[0].index != index:
+                self.underruns += 1
+                self._cond.notify_all()
+                return
+
+            frame = self._ring.popleft()
+            self._cond.notify_all()
+
+        canvas.SetBitmap(frame_to_bitmap(frame))
+        self._shown = index
+
+    def _is_behind(self, head, index):
+        """缓冲头部的帧是否落后于要显示的帧"""
+        if self._total is None:
+            return head < index
+        distance = (index - head) % self._total
+        return 0 < distance <= self._total // 2
+
+    def prefetch(self, start, count):
+        """预读由加载线程完成，这里无需处理"""
+
+    def close(self):
+        """关闭存储并唤醒阻塞中的加载线程"""
+        with self._cond:
+            self._closed = True
+            self._ring.clear()
+            self._cond.notify_all()
+
+    def clear(self):
+        """清空所有帧并关闭存储"""
+        self.close()
+        self._total = None
+        self._count = 0
+        self._shown = None
+        self.frame_size = None
+
+    def stats(self):
+        """获取帧存储统计信息
+
+        Returns:
+            dict: 帧数、缓冲容量、缓冲中的帧数、已完成遍数、欠载次数、跳过帧数、缓冲字节数
+        """
+        with self._cond:
+            buffered = len(self._ring)
+        frame_bytes = self.frame_size[0] * self.frame_size[1] * 4 if self.frame_size else 0
+        return {
+            "frames": self._count,
+            "capacity": self.capacity,
+            "buffered": buffered,
+            "passes": self.passes,
+            "underruns": self.underruns,
+            "dropped": self.dropped,
+            "buffer_bytes": self.capacity * frame_bytes,
+        }
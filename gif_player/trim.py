@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""透明边缘裁剪模块
+
+很多宠物 GIF 四周有大片完全透明的边缘，它们会撑大位图、窗口尺寸以及每次刷新的重绘
+面积。裁剪不在加载时预先扫描整个文件：解码时顺带累计所有帧（已缩放）不透明像素的
+并集包围盒，并暂存已缩放的帧，全部解码完后把它们裁剪到该包围盒再交付（见 trim_frames），
+首帧携带裁掉的左上角偏移，供宠物窗口保持画面位置不变，窗口只需按裁剪后的尺寸调整一次。
+裁剪后的帧直接写入帧缓存，之后命中缓存时不再裁剪。
+
+沙箱子进程和宠物包编译不交付帧，由写入器在写完后裁剪文件中的帧并在元数据中记录偏移。
+流式播放不暂存帧，因此不裁剪。
+"""
+
+from .decoder import DecodedFrame
+
+
+class ContentBox:
+    """逐帧累计不透明像素的并集包围盒"""
+
+    def __init__(self):
+        """初始化包围盒"""
+        self.box = None
+        self.frame_count = 0
+
+    def add(self, image):
+        """并入一帧的不透明区域
+
+        对 Alpha 通道做一次 getbbox（C 实现，整帧向量化处理），再与已有的包围盒合并。
+
+        Args:
+            image: RGBA 模式的 Pillow 图像
+        """
+        self.frame_count += 1
+        frame_box = image.getchannel("A").getbbox()
+        if frame_box is None:
+            return
+        if self.box is None:
+            self.box = frame_box
+        else:
+            box = self.box
+            self.box = (min(box[0], frame_box[0]), min(box[1], frame_box[1]),
+                        max(box[2], frame_box[2]), max(box[3], frame_box[3]))
+
+    def crop_box(self, size):
+        """获取值得裁剪的包围盒
+
+        Args:
+            size: 帧尺寸 (宽, 高)
+
+        Returns:
+            tuple: 包围盒 (left, upper, right, lower)；所有帧都完全透明或没有可裁剪的边缘时为 None
+        """
+        if self.box is None or self.box == (0, 0) + tuple(size):
+            return None
+        return self.box
+
+
+def log_trim_saving(box, frame_size, frame_count):
+    """打印裁剪节省的像素和字节数
+
+    Args:
+        box: 裁剪包围盒
+        frame_size: 裁剪前的帧尺寸
+        frame_count: 帧数
+    """
+    full = frame_size[0] * frame_size[1]
+    trimmed = (box[2] - box[0]) * (box[3] - box[1])
+    saved = full - trimmed
+    print(f"透明边缘裁剪: {frame_size[0]}x{frame_size[1]} -> {box[2] - box[0]}x{box[3] - box[1]}，"
+          f"每帧节省 {saved} 像素（{saved / full:.0%}），"
+          f"{frame_count} 帧共节省约 {saved * 4 * frame_count / 1024:.1f} KB")
+
+
+def trim_frames(frames):
+    """暂存整个帧序列并累计不透明区域，全部读完后返回裁剪到并集包围盒的帧
+
+    Args:
+        frames: 产出 (已缩放的 RGBA 图像, DecodedFrame) 的可迭代对象
+
+    Returns:
+        tuple: (裁剪包围盒，无需裁剪时为 None, 产出裁剪后 (图像, DecodedFrame) 的迭代器)
+    """
+    content_box = ContentBox()
+    buffered = []
+    for image, frame in frames:
+        content_box.add(image)
+        buffered.append((image, frame))
+    if not buffered:
+        return None, iter(())
+
+    size = buffered[0][0].size
+    box = content_box.crop_box(size)
+    if box:
+        log_trim_saving(box, size, len(buffered))
+    return box, _crop_buffered(buffered, box)
+
+
+def _crop_buffered(buffered, box):
+    """按顺序产出暂存的帧（需要时先裁剪），产出后即释放未裁剪的图像"""
+    buffered.reverse()
+    while buffered:
+        image, frame = buffered.pop()
+        if box:
+            image = image.crop(box)
+            frame = DecodedFrame.from_image(frame.index, image, frame.delay)
+        yield image, frame
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""帧变体缓存模块
+
+同一个宠物形象在不同像素密度（DPI 缩放倍数）的屏幕上需要不同分辨率的帧。
+宠物在多块 DPI 不同的显示器之间拖动时，已经构建过的变体留在内存里，切回时立即可用；
+常驻的变体数量有上限，超出时按最近使用顺序释放最久未用的变体。
+"""
+
+from collections import OrderedDict
+
+
+class FrameVariantCache:
+    """按键（如 DPI 缩放倍数）缓存暂不显示的帧变体（LRU）
+
+    变体对象需要有 frames 属性（帧存储），被淘汰时调用其 clear() 释放位图。
+    """
+
+    def __init__(self, max_variants=1):
+        """初始化变体缓存
+
+        Args:
+            max_variants: 最多常驻的变体数（不含当前显示的变体），0 表示不保留
+        """
+        self.max_variants = max_variants
+        self._variants = OrderedDict()
+
+    def __len__(self):
+        return len(self._variants)
+
+    def __contains__(self, key):
+        return key in self._variants
+
+    def take(self, key):
+        """取出变体（取出后由调用方负责，不再计入缓存）
+
+        Args:
+            key: 变体键
+
+        Returns:
+            缓存的变体，不存在时返回 None
+        """
+        return self._variants.pop(key, None)
+
+    def put(self, key, variant):
+        """放入变体，超出上限时释放最久未用的变体
+
+        Args:
+            key: 变体键
+            variant: 变体对象
+        """
+        old = self._variants.pop(key, None)
+        if old is not None and old is not variant:
+            old.frames.clear()
+        self._variants[key] = variant
+        while len(self._variants) > self.max_variants:
+            evicted_key, evicted = self._variants.popitem(last=False)
+            evicted.frames.clear()
+            print(f"释放帧变体: {evicted_key}")
+
+    def clear(self):
+        """释放所有变体"""
+        for variant in self._variants.values():
+            variant.frames.clear()
+        self._variants.clear()
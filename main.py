@@ -24,15 +24,19 @@
 pip install pillow wxPython
 """
 
-import wx
 import sys
 import os
-from pet import FinalGIFDesktopPet
-from taskbar import PetTaskBarIcon
+import multiprocessing
 
 
 def main():
     """程序主入口"""
+    # 界面相关的模块在这里才导入：解码沙箱子进程启动时会重新执行本文件的顶层代码，
+    # 顶层只保留标准库导入，子进程就不会加载 wx 和宠物界面
+    import wx
+    from pet import FinalGIFDesktopPet
+    from taskbar import PetTaskBarIcon
+
     print(f"Python 版本: {sys.version}")
     print(f"wxPython 版本: {wx.__version__}")
     print(f"操作系统: {sys.platform}")
@@ -54,4 +58,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包后的程序以解码沙箱子进程身份启动时，在这里转入子进程入口（此时尚未导入 wx）
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
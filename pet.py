@@ -8,12 +8,27 @@
 import wx
 import os
 import sys
+import math
 import random
 import datetime
-from PIL import Image
 import config
+import power
 from dialog import CuteDialog
+from session import is_session_locked
+from ticker import get_ticker
 from work_incentive import WorkIncentiveManager
+from gif_player import AtlasFrameStore, DeltaFrameStore, DecodeSandbox, FrameCache, FrameCanvas, FrameDelays, FrameScaling, FrameStore, FrameScheduler, FrameVariantCache, GifLoader, IndexedFrameStore, MipmapFrameStore, StreamingFrameStore, default_worker_count, inspect_gif, load_petpack, petpack_dpi_scale, plan_gif_load
+
+
+# 右键菜单中的缩放档位
+ZOOM_PRESETS = (0.5, 0.75, 1.0, 1.25, 1.5, 2.0)
+# 滚轮每格的缩放倍数
+ZOOM_WHEEL_STEP = 1.1
+# 按压弹跳动画的总时长（毫秒），步数按电源模式的界面动画帧率计算
+BOUNCE_DURATION_MS = 256
+# 按压到底时的水平拉伸和垂直压缩比例（画布两侧为水平拉伸预留边距）
+BOUNCE_STRETCH_X = 0.1
+BOUNCE_SQUASH_Y = 0.2
 
 
 class FinalGIFDesktopPet(wx.Frame):
@@ -26,827 +41,46 @@ class FinalGIFDesktopPet(wx.Frame):
         
         # 更换形象选项
         change_image_item = menu.Append(wx.ID_ANY, "更换形象")
-        self.Bind(wx.EVT_MENU, self.on_change_image, change_image_item)
-        
-        # 上班激励选项
-        work_incentive_item = menu.Append(wx.ID_ANY, "上班激励")
-        self.Bind(wx.EVT_MENU, self.on_work_incentive, work_incentive_item)
-        
-        # 自定义提示语选项
-        custom_texts_item = menu.Append(wx.ID_ANY, "自定义提示语")
-        self.Bind(wx.EVT_MENU, self.on_custom_texts, custom_texts_item)
-        
-        # 退出选项
-        exit_item = menu.Append(wx.ID_EXIT, "退出")
-        self.Bind(wx.EVT_MENU, self.on_close, exit_item)
-        
-        # 显示菜单 - 在Windows上使用鼠标位置确保正确显示
-        mouse_pos = event.GetPosition()
-        self.PopupMenu(menu, mouse_pos)
-        
-        menu.Destroy()
-        event.Skip()
-    
-    def on_work_incentive(self, event):
-        """上班激励选项点击事件"""
-        # 使用管理器显示配置对话框
-        self.work_incentive_manager.show_config_dialog()
-    
-    def on_custom_texts(self, event):
-        """自定义提示语选项点击事件"""
-        # 使用管理器显示自定义提示语设置对话框
-        self.work_incentive_manager.show_custom_texts_dialog()
-    
-    def __init__(self, gif_path=config.Config.get_gif_path()):
-        """初始化桌面宠物
-        
-        Args:
-            gif_path: GIF动画文件路径
-        """
-        # 设置窗口样式：无边框、无任务栏图标、置顶
-        style = wx.FRAME_NO_TASKBAR | wx.STAY_ON_TOP | wx.NO_BORDER
-        super().__init__(parent=None, id=wx.ID_ANY, title='Cute Pet', pos=wx.DefaultPosition, size=(100, 100), style=style)
-        
-        # 配置属性
-        self.GIF_PATH = gif_path
-        self.INIT_X = -100  # 初始 X 坐标（-100 表示屏幕右侧内缩 100px）
-        self.INIT_Y = 100  # 初始 Y 坐标（顶部往下 100px）
-        self.TRANSPARENT_ALPHA = 255  # 窗口透明度（0-255）
-        
-        # 状态变量初始化
-        self.is_dragging = False
-        self.drag_pos = wx.Point(0, 0)
-        self.click_start_pos = wx.Point(0, 0)  # 初始化点击起始位置
-        
-        # GIF 动画相关变量
-        self.gif_frames = []      # GIF 帧列表
-        self.frame_delays = []    # 帧延迟列表
-        self.current_frame = 0    # 当前播放帧
-        self.animation_timer = None  # 动画定时器
-        self.is_paused = False    # 动画暂停状态
-        
-        # 对话框相关变量
-        self.dialog = None  # 保存对话框引用
-        self.auto_close_timer = None  # 自动关闭定时器
-        
-        # 弹跳效果相关变量
-        self.bounce_timer = None  # 弹跳定时器
-        self.bounce_offset = 0  # 当前弹跳偏移量
-        self.bounce_direction = -1  # 弹跳方向 (-1: 向上, 1: 向下)
-        self.bounce_amplitude = 20  # 弹跳幅度
-        self.bounce_speed = 2  # 弹跳速度
-        self.original_position = wx.Point(0, 0)  # 原始位置
-        
-        # 上班激励功能相关变量
-        self.work_incentive_manager = WorkIncentiveManager(self)  # 使用新的管理器类
-        
-        # 收益提示定时器
-        self.income_timer = None  # 每分钟弹出收益提示的定时器
-        
-        # 创建图像控件
-        self.image_ctrl = wx.StaticBitmap(self, wx.ID_ANY)
-        
-        # 初始化流程
-        self.load_gif()
-        self.setup_transparent_window()
-        self.bind_events()
-        self.set_initial_position()
-        # 配置已经在WorkIncentiveConfig初始化时加载
-        
-        # 启动收益提示定时器（每分钟弹出一次）
-        self.income_timer = wx.Timer(self)
-        self.Bind(wx.EVT_TIMER, self.on_income_timer, self.income_timer)
-        self.income_timer.Start(60000)  # 60秒间隔
-        
-        # 显示窗口
-        self.Show()
-    
-    def bounce(self):
-        """实现史莱姆按压效果"""
-        if self.bounce_timer is None:
-            self.bounce_timer = wx.Timer(self)
-            self.Bind(wx.EVT_TIMER, self.on_bounce_timer, self.bounce_timer)
-            # 记录原始位置和尺寸
-            self.original_position = self.GetPosition()
-            self.original_size = self.GetSize()
-            # 重置弹跳参数
-            self.bounce_step = 0
-            self.bounce_max_steps = 16  # 弹跳总步数，增加以获得更平滑的效果
-            self.bounce_timer.Start(16)  # 约60fps
-            return
-        
-        # 使用正弦函数创建更自然的弹跳效果
-        import math
-        
-        # 计算当前弹跳进度 (0-1)
-        progress = self.bounce_step / self.bounce_max_steps
-        
-        # 使用正弦函数计算弹跳高度，创建缓动效果
-        # 前半部分(0-0.5)是按压阶段，后半部分(0.5-1)是回弹阶段
-        if progress <= 0.5:
-            # 按压阶段：压缩宠物
-            compression_progress = progress * 2  # 0-1
-            compression_factor = math.sin(compression_progress * math.pi / 2)
-            
-            # 计算新尺寸：垂直压缩，水平略微扩展
-            new_height = int(self.original_size.height * (1 - 0.2 * compression_factor))
-            new_width = int(self.original_size.width * (1 + 0.1 * compression_factor))
-            
-            # 更新窗口位置和尺寸
-            new_pos = wx.Point(
-                self.original_position.x - (new_width - self.original_size.width) // 2,
-                self.original_position.y + (self.original_size.height - new_height)
-            )
-            self.SetPosition(new_pos)
-            self.SetSize((new_width, new_height))
-            self.image_ctrl.SetSize((new_width, new_height))
-        else:
-            # 回弹阶段：恢复原始尺寸
-            rebound_progress = (progress - 0.5) * 2  # 0-1
-            rebound_factor = math.sin(rebound_progress * math.pi / 2)
-            
-            # 计算新尺寸：逐渐恢复原始尺寸
-            new_height = int(self.original_size.height * (1 - 0.2 * (1 - rebound_factor)))
-            new_width = int(self.original_size.width * (1 + 0.1 * (1 - rebound_factor)))
-            
-            # 更新窗口位置和尺寸
-            new_pos = wx.Point(
-                self.original_position.x - (new_width - self.original_size.width) // 2,
-                self.original_position.y + (self.original_size.height - new_height)
-            )
-            self.SetPosition(new_pos)
-            self.SetSize((new_width, new_height))
-            self.image_ctrl.SetSize((new_width, new_height))
-        
-        # 更新步数
-        self.bounce_step += 1
-        
-        # 检查是否完成弹跳
-        if self.bounce_step >= self.bounce_max_steps:
-            # 恢复到原始位置和尺寸
-            self.SetPosition(self.original_position)
-            self.SetSize(self.original_size)
-            self.image_ctrl.SetSize(self.original_size)
-            # 清理定时器
-            self.bounce_timer.Stop()
-            self.bounce_timer = None
-            self.bounce_step = 0
-    
-    def on_bounce_timer(self, event):
-        """弹跳定时器事件"""
-        self.bounce()
-    
-    def load_gif(self):
-        """使用 Pillow 加载 GIF 动画"""
-        try:
-            if not os.path.exists(self.GIF_PATH):
-                raise FileNotFoundError(f"GIF 文件不存在: {self.GIF_PATH}")
-            
-            # 使用 Pillow 打开 GIF 图像
-            pil_image = Image.open(self.GIF_PATH)
-            
-            # 检查是否为动画 GIF
-            if not pil_image.is_animated:
-                print("警告: 这是一个静态 GIF 图像")
-            
-            # 获取总帧数
-            num_frames = pil_image.n_frames
-            print(f"GIF 总帧数: {num_frames}")
-            
-            # 提取所有帧
-            for i in range(num_frames):
-                # 定位到当前帧
-                pil_image.seek(i)
-                
-                # 复制当前帧
-                frame = pil_image.copy()
-                
-                # 获取帧延迟（单位：1/1000秒）
-                if 'duration' in pil_image.info:
-                    delay = pil_image.info['duration']
-                else:
-                    delay = 100  # 默认延迟 100ms
-                
-                if delay < 10:  # 最小延迟 10ms
-                    delay = 10
-                
-                # 确保所有帧都转换为 RGBA 模式以处理透明度
-                if frame.mode != 'RGBA':
-                    frame = frame.convert('RGBA')
-                
-                # 将图像缩小为原来的一半
-                new_size = (frame.width // 2, frame.height // 2)
-                frame = frame.resize(new_size, Image.Resampling.LANCZOS)
-                
-                # 打印帧信息（用于调试）
-                print(f"帧 {i+1}/{num_frames}: 模式={frame.mode}, 尺寸={new_size}, 延迟={delay}ms")
-                
-                # 创建 wx.Image
-                wx_image = wx.Image(*new_size)
-                
-                # 设置 RGB 数据
-                rgb_data = frame.convert('RGB').tobytes()
-                wx_image.SetData(rgb_data)
-                
-                # 设置 Alpha 通道
-                if frame.mode == 'RGBA':
-                    alpha_data = frame.getchannel('A').tobytes()
-                    wx_image.SetAlpha(alpha_data)
-                else:
-                    # 如果没有 Alpha 通道，创建完全不透明的通道
-                    alpha_data = bytes([255] * (frame.width * frame.height))
-                    wx_image.SetAlpha(alpha_data)
-                
-                # 转换为 wx.Bitmap
-                wx_bitmap = wx_image.ConvertToBitmap()
-                
-                # 添加到帧列表
-                self.gif_frames.append(wx_bitmap)
-                self.frame_delays.append(delay)
-            
-            # 设置初始帧
-            self.image_ctrl.SetBitmap(self.gif_frames[0])
-            
-            # 调整窗口大小
-            size = self.gif_frames[0].GetSize()
-            self.SetSize(size)
-            self.image_ctrl.SetSize(size)
-            
-            # 启动动画
-            self.start_animation()
-            
-            print(f"成功加载并启动 GIF 动画: {self.GIF_PATH}")
-            print(f"GIF 尺寸: {size}")
-            
-        except Exception as e:
-            print(f"加载 GIF 失败: {e}")
-            import traceback
-            traceback.print_exc()
-            wx.MessageBox(f"加载 GIF 失败: {e}", "错误", wx.OK | wx.ICON_ERROR)
-            self.Destroy()
-            sys.exit(1)
-    
-    def start_animation(self):
-        """启动 GIF 动画"""
-        if self.animation_timer is None:
-            self.animation_timer = wx.Timer(self)
-            self.Bind(wx.EVT_TIMER, self.on_animation_timer, self.animation_timer)
-        
-        # 设置定时器间隔并启动
-        self.animation_timer.Start(self.frame_delays[self.current_frame])
-        print(f"动画已启动，初始延迟: {self.frame_delays[self.current_frame]}ms")
-    
-    def pause_animation(self, frame_index=None):
-        """暂停 GIF 动画
-        
-        Args:
-            frame_index: 可选参数，指定暂停时显示的帧索引
-        """
-        if self.animation_timer and self.animation_timer.IsRunning():
-            self.animation_timer.Stop()
-            self.is_paused = True
-            
-            # 如果指定了帧索引，跳转到该帧
-            if frame_index is not None and 0 <= frame_index < len(self.gif_frames):
-                self.current_frame = frame_index
-                self.image_ctrl.SetBitmap(self.gif_frames[self.current_frame])
-                print(f"动画已暂停在第 {frame_index+1} 帧")
-            else:
-                print("动画已暂停")
-    
-    def resume_animation(self):
-        """恢复 GIF 动画"""
-        if self.animation_timer and not self.animation_timer.IsRunning():
-            self.animation_timer.Start(self.frame_delays[self.current_frame])
-            self.is_paused = False
-            print("动画已恢复")
-    
-    def on_animation_timer(self, event):
-        """动画定时器事件"""
-        if self.is_paused:
-            return
-        
-        # 切换到下一帧
-        self.current_frame = (self.current_frame + 1) % len(self.gif_frames)
-        
-        # 更新图像
-        self.image_ctrl.SetBitmap(self.gif_frames[self.current_frame])
-        
-        # 重新设置定时器间隔
-        if self.animation_timer and self.animation_timer.IsRunning():
-            self.animation_timer.Stop()
-        self.animation_timer.Start(self.frame_delays[self.current_frame])
-    
-    def setup_transparent_window(self):
-        """设置窗口透明"""
-        try:
-            # 根据不同系统设置透明
-            if sys.platform == "win32":
-                # Windows：设置透明
-                self.SetTransparent(255)
-            elif sys.platform == "darwin":
-                # macOS：设置透明样式
-                self.SetWindowStyle(self.GetWindowStyle() | wx.FRAME_TOOL_WINDOW)
-                self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
-            else:
-                # Linux：设置透明
-                self.SetTransparent(255)
-            
-            print("窗口透明设置完成")
-        except Exception as e:
-            print(f"窗口透明设置失败: {e}")
-    
-    def bind_events(self):
-        """绑定事件"""
-        # 鼠标事件
-        self.Bind(wx.EVT_LEFT_DOWN, self.on_mouse_left_down)
-        self.Bind(wx.EVT_LEFT_UP, self.on_mouse_left_up)
-        self.Bind(wx.EVT_MOTION, self.on_mouse_motion)
-        self.Bind(wx.EVT_ENTER_WINDOW, self.on_mouse_enter)
-        self.Bind(wx.EVT_LEAVE_WINDOW, self.on_mouse_leave)
-        self.Bind(wx.EVT_RIGHT_DOWN, self.on_mouse_right_down)  # 添加右键点击事件
-        
-        # 窗口事件
-        self.Bind(wx.EVT_CLOSE, self.on_close)
-    
-    def on_mouse_left_down(self, event):
-        """鼠标左键按下事件（开始拖拽）"""
-        self.is_dragging = True
-        self.drag_pos = event.GetPosition()
-        self.CaptureMouse()
-        # 记录按下位置用于检测点击
-        self.click_start_pos = event.GetPosition()
-        event.Skip()
-    
-    def on_mouse_left_up(self, event):
-        """鼠标左键释放事件（停止拖拽）"""
-        if self.is_dragging:
-            self.is_dragging = False
-            if self.HasCapture():
-                self.ReleaseMouse()
-                
-            # 检测是否为点击事件（移动距离小于5像素）
-            click_end_pos = event.GetPosition()
-            distance = ((click_end_pos[0] - self.click_start_pos[0])**2 + 
-                      (click_end_pos[1] - self.click_start_pos[1])**2)**0.5
-            
-            if distance < 5:
-                # 执行弹跳效果
-                self.bounce()
-                # 显示可爱对话框
-                self.show_cute_dialog()
-        event.Skip()
-    
-    def on_mouse_motion(self, event):
-        """鼠标移动事件（处理拖拽）"""
-        if self.is_dragging and self.HasCapture():
-            pos = event.GetPosition()
-            delta = (pos[0] - self.drag_pos[0], pos[1] - self.drag_pos[1])
-            new_pos = self.ClientToScreen(delta)
-            self.Move(new_pos)
-            
-            # 更新对话框位置跟随宠物移动
-            self.update_dialog_position()
-        event.Skip()
-    
-    def on_mouse_enter(self, event):
-        """鼠标进入窗口事件"""
-        # 鼠标悬停时暂停动画并跳转到第一帧
-        self.pause_animation(0)
-        event.Skip()
-    
-    def on_mouse_leave(self, event):
-        """鼠标离开窗口事件"""
-        # 鼠标离开时恢复动画
-        self.resume_animation()
-        event.Skip()
-    
-    def on_change_image(self, event):
-        """更换形象选项点击事件"""
-        # 创建文件选择对话框
-        file_dialog = wx.FileDialog(
-            self,
-            message="选择GIF动画文件",
-            defaultDir="",
-            defaultFile="",
-            wildcard="GIF文件 (*.gif)|*.gif",
-            style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST
-        )
-        
-        # 显示对话框并等待用户选择
-        if file_dialog.ShowModal() == wx.ID_OK:
-            # 获取用户选择的文件路径
-            selected_path = file_dialog.GetPath()
-            
-            # 验证文件是否为GIF格式
-            if selected_path.lower().endswith('.gif'):
-                try:
-                    # 验证GIF文件是否有效
-                    from PIL import Image
-                    with Image.open(selected_path) as img:
-                        if img.format != 'GIF':
-                            wx.MessageBox("选择的文件不是有效的GIF格式", "错误", wx.OK | wx.ICON_ERROR)
-                            return
-                    
-                    # 更新配置并重新加载宠物形象
-                    self.change_pet_image(selected_path)
-                except Exception as e:
-                    wx.MessageBox(f"无法加载GIF文件: {e}", "错误", wx.OK | wx.ICON_ERROR)
-            else:
-                wx.MessageBox("请选择GIF格式的文件", "错误", wx.OK | wx.ICON_ERROR)
-        
-        # 关闭对话框
-        file_dialog.Destroy()
-    
-    def on_work_incentive(self, event):
-        """上班激励选项点击事件"""
-        # 使用管理器显示配置对话框
-        self.work_incentive_manager.show_config_dialog()
-    
-    def __init__(self, gif_path=config.Config.get_gif_path()):
-        """初始化桌面宠物
-        
-        Args:
-            gif_path: GIF动画文件路径
-        """
-        # 设置窗口样式：无边框、无任务栏图标、置顶
-        style = wx.FRAME_NO_TASKBAR | wx.STAY_ON_TOP | wx.NO_BORDER
-        super().__init__(parent=None, id=wx.ID_ANY, title='Cute Pet', pos=wx.DefaultPosition, size=(100, 100), style=style)
-        
-        # 配置属性
-        self.GIF_PATH = gif_path
-        self.INIT_X = -100  # 初始 X 坐标（-100 表示屏幕右侧内缩 100px）
-        self.INIT_Y = 100  # 初始 Y 坐标（顶部往下 100px）
-        self.TRANSPARENT_ALPHA = 255  # 窗口透明度（0-255）
-        
-        # 状态变量初始化
-        self.is_dragging = False
-        self.drag_pos = wx.Point(0, 0)
-        self.click_start_pos = wx.Point(0, 0)  # 初始化点击起始位置
-        
-        # GIF 动画相关变量
-        self.gif_frames = []      # GIF 帧列表
-        self.frame_delays = []    # 帧延迟列表
-        self.current_frame = 0    # 当前播放帧
-        self.animation_timer = None  # 动画定时器
-        self.is_paused = False    # 动画暂停状态
-        
-        # 对话框相关变量
-        self.dialog = None  # 保存对话框引用
-        self.auto_close_timer = None  # 自动关闭定时器
-        
-        # 弹跳效果相关变量
-        self.bounce_timer = None  # 弹跳定时器
-        self.bounce_offset = 0  # 当前弹跳偏移量
-        self.bounce_direction = -1  # 弹跳方向 (-1: 向上, 1: 向下)
-        self.bounce_amplitude = 20  # 弹跳幅度
-        self.bounce_speed = 2  # 弹跳速度
-        self.original_position = wx.Point(0, 0)  # 原始位置
-        
-        # 上班激励功能相关变量
-        self.work_incentive_manager = WorkIncentiveManager(self)  # 使用新的管理器类
-        
-        # 收益提示定时器
-        self.income_timer = None  # 每分钟弹出收益提示的定时器
-        
-        # 创建图像控件
-        self.image_ctrl = wx.StaticBitmap(self, wx.ID_ANY)
-        
-        # 初始化流程
-        self.load_gif()
-        self.setup_transparent_window()
-        self.bind_events()
-        self.set_initial_position()
-        # 配置已经在WorkIncentiveConfig初始化时加载
-        
-        # 启动收益提示定时器（每分钟弹出一次）
-        self.income_timer = wx.Timer(self)
-        self.Bind(wx.EVT_TIMER, self.on_income_timer, self.income_timer)
-        self.income_timer.Start(60000)  # 60秒间隔
-        
-        # 显示窗口
-        self.Show()
-    
-    def bounce(self):
-        """实现史莱姆按压效果"""
-        if self.bounce_timer is None:
-            self.bounce_timer = wx.Timer(self)
-            self.Bind(wx.EVT_TIMER, self.on_bounce_timer, self.bounce_timer)
-            # 记录原始位置和尺寸
-            self.original_position = self.GetPosition()
-            self.original_size = self.GetSize()
-            # 重置弹跳参数
-            self.bounce_step = 0
-            self.bounce_max_steps = 16  # 弹跳总步数，增加以获得更平滑的效果
-            self.bounce_timer.Start(16)  # 约60fps
-            return
-        
-        # 使用正弦函数创建更自然的弹跳效果
-        import math
-        
-        # 计算当前弹跳进度 (0-1)
-        progress = self.bounce_step / self.bounce_max_steps
-        
-        # 使用正弦函数计算弹跳高度，创建缓动效果
-        # 前半部分(0-0.5)是按压阶段，后半部分(0.5-1)是回弹阶段
-        if progress <= 0.5:
-            # 按压阶段：压缩宠物
-            compression_progress = progress * 2  # 0-1
-            compression_factor = math.sin(compression_progress * math.pi / 2)
-            
-            # 计算新尺寸：垂直压缩，水平略微扩展
-            new_height = int(self.original_size.height * (1 - 0.2 * compression_factor))
-            new_width = int(self.original_size.width * (1 + 0.1 * compression_factor))
-            
-            # 更新窗口位置和尺寸
-            new_pos = wx.Point(
-                self.original_position.x - (new_width - self.original_size.width) // 2,
-                self.original_position.y + (self.original_size.height - new_height)
-            )
-            self.SetPosition(new_pos)
-            self.SetSize((new_width, new_height))
-            self.image_ctrl.SetSize((new_width, new_height))
-        else:
-            # 回弹阶段：恢复原始尺寸
-            rebound_progress = (progress - 0.5) * 2  # 0-1
-            rebound_factor = math.sin(rebound_progress * math.pi / 2)
-            
-            # 计算新尺寸：逐渐恢复原始尺寸
-            new_height = int(self.original_size.height * (1 - 0.2 * (1 - rebound_factor)))
-            new_width = int(self.original_size.width * (1 + 0.1 * (1 - rebound_factor)))
-            
-            # 更新窗口位置和尺寸
-            new_pos = wx.Point(
-                self.original_position.x - (new_width - self.original_size.width) // 2,
-                self.original_position.y + (self.original_size.height - new_height)
-            )
-            self.SetPosition(new_pos)
-            self.SetSize((new_width, new_height))
-            self.image_ctrl.SetSize((new_width, new_height))
-        
-        # 更新步数
-        self.bounce_step += 1
-        
-        # 检查是否完成弹跳
-        if self.bounce_step >= self.bounce_max_steps:
-            # 恢复到原始位置和尺寸
-            self.SetPosition(self.original_position)
-            self.SetSize(self.original_size)
-            self.image_ctrl.SetSize(self.original_size)
-            # 清理定时器
-            self.bounce_timer.Stop()
-            self.bounce_timer = None
-            self.bounce_step = 0
-    
-    def on_bounce_timer(self, event):
-        """弹跳定时器事件"""
-        self.bounce()
-    
-    def load_gif(self):
-        """使用 Pillow 加载 GIF 动画"""
-        try:
-            if not os.path.exists(self.GIF_PATH):
-                raise FileNotFoundError(f"GIF 文件不存在: {self.GIF_PATH}")
-            
-            # 使用 Pillow 打开 GIF 图像
-            pil_image = Image.open(self.GIF_PATH)
-            
-            # 检查是否为动画 GIF
-            if not pil_image.is_animated:
-                print("警告: 这是一个静态 GIF 图像")
-            
-            # 获取总帧数
-            num_frames = pil_image.n_frames
-            print(f"GIF 总帧数: {num_frames}")
-            
-            # 提取所有帧
-            for i in range(num_frames):
-                # 定位到当前帧
-                pil_image.seek(i)
-                
-                # 复制当前帧
-                frame = pil_image.copy()
-                
-                # 获取帧延迟（单位：1/1000秒）
-                if 'duration' in pil_image.info:
-                    delay = pil_image.info['duration']
-                else:
-                    delay = 100  # 默认延迟 100ms
-                
-                if delay < 10:  # 最小延迟 10ms
-                    delay = 10
-                
-                # 确保所有帧都转换为 RGBA 模式以处理透明度
-                if frame.mode != 'RGBA':
-                    frame = frame.convert('RGBA')
-                
-                # 将图像缩小为原来的一半
-                new_size = (frame.width // 2, frame.height // 2)
-                frame = frame.resize(new_size, Image.Resampling.LANCZOS)
-                
-                # 打印帧信息（用于调试）
-                print(f"帧 {i+1}/{num_frames}: 模式={frame.mode}, 尺寸={new_size}, 延迟={delay}ms")
-                
-                # 创建 wx.Image
-                wx_image = wx.Image(*new_size)
-                
-                # 设置 RGB 数据
-                rgb_data = frame.convert('RGB').tobytes()
-                wx_image.SetData(rgb_data)
-                
-                # 设置 Alpha 通道
-                if frame.mode == 'RGBA':
-                    alpha_data = frame.getchannel('A').tobytes()
-                    wx_image.SetAlpha(alpha_data)
-                else:
-                    # 如果没有 Alpha 通道，创建完全不透明的通道
-                    alpha_data = bytes([255] * (frame.width * frame.height))
-                    wx_image.SetAlpha(alpha_data)
-                
-                # 转换为 wx.Bitmap
-                wx_bitmap = wx_image.ConvertToBitmap()
-                
-                # 添加到帧列表
-                self.gif_frames.append(wx_bitmap)
-                self.frame_delays.append(delay)
-            
-            # 设置初始帧
-            self.image_ctrl.SetBitmap(self.gif_frames[0])
-            
-            # 调整窗口大小
-            size = self.gif_frames[0].GetSize()
-            self.SetSize(size)
-            self.image_ctrl.SetSize(size)
-            
-            # 启动动画
-            self.start_animation()
-            
-            print(f"成功加载并启动 GIF 动画: {self.GIF_PATH}")
-            print(f"GIF 尺寸: {size}")
-            
-        except Exception as e:
-            print(f"加载 GIF 失败: {e}")
-            import traceback
-            traceback.print_exc()
-            wx.MessageBox(f"加载 GIF 失败: {e}", "错误", wx.OK | wx.ICON_ERROR)
-            self.Destroy()
-            sys.exit(1)
-    
-    def start_animation(self):
-        """启动 GIF 动画"""
-        if self.animation_timer is None:
-            self.animation_timer = wx.Timer(self)
-            self.Bind(wx.EVT_TIMER, self.on_animation_timer, self.animation_timer)
-        
-        # 设置定时器间隔并启动
-        self.animation_timer.Start(self.frame_delays[self.current_frame])
-        print(f"动画已启动，初始延迟: {self.frame_delays[self.current_frame]}ms")
-    
-    def pause_animation(self, frame_index=None):
-        """暂停 GIF 动画
-        
-        Args:
-            frame_index: 可选参数，指定暂停时显示的帧索引
-        """
-        if self.animation_timer and self.animation_timer.IsRunning():
-            self.animation_timer.Stop()
-            self.is_paused = True
-            
-            # 如果指定了帧索引，跳转到该帧
-            if frame_index is not None and 0 <= frame_index < len(self.gif_frames):
-                self.current_frame = frame_index
-                self.image_ctrl.SetBitmap(self.gif_frames[self.current_frame])
-                print(f"动画已暂停在第 {frame_index+1} 帧")
-            else:
-                print("动画已暂停")
-    
-    def resume_animation(self):
-        """恢复 GIF 动画"""
-        if self.animation_timer and not self.animation_timer.IsRunning():
-            self.animation_timer.Start(self.frame_delays[self.current_frame])
-            self.is_paused = False
-            print("动画已恢复")
-    
-    def on_animation_timer(self, event):
-        """动画定时器事件"""
-        if self.is_paused:
-            return
-        
-        # 切换到下一帧
-        self.current_frame = (self.current_frame + 1) % len(self.gif_frames)
-        
-        # 更新图像
-        self.image_ctrl.SetBitmap(self.gif_frames[self.current_frame])
-        
-        # 重新设置定时器间隔
-        if self.animation_timer and self.animation_timer.IsRunning():
-            self.animation_timer.Stop()
-        self.animation_timer.Start(self.frame_delays[self.current_frame])
-    
-    def setup_transparent_window(self):
-        """设置窗口透明"""
-        try:
-            # 根据不同系统设置透明
-            if sys.platform == "win32":
-                # Windows：设置透明样式和透明色
-                # 设置窗口背景为透明色
-                self.SetBackgroundStyle(wx.BG_STYLE_TRANSPARENT)
-                # 创建一个透明的画笔和画刷
-                self.SetBackgroundColour(wx.Colour(0, 0, 0, 0))
-                # 尝试设置窗口为分层窗口（Windows特有的透明实现）
-                try:
-                    # 使用Windows API设置分层窗口
-                    import win32gui
-                    import win32con
-                    import win32api
-                    hwnd = self.GetHandle()
-                    # 设置窗口为分层窗口
-                    win32gui.SetWindowLong(hwnd, win32con.GWL_EXSTYLE, 
-                                          win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE) | win32con.WS_EX_LAYERED)
-                    # 设置窗口透明度为255（完全不透明，但支持透明通道）
-                    win32gui.SetLayeredWindowAttributes(hwnd, 0, 255, win32con.LWA_ALPHA | win32con.LWA_COLORKEY)
-                    print("Windows分层窗口设置成功")
-                except Exception as e:
-                    print(f"Windows API设置失败，使用wxPython默认透明方式: {e}")
-                    # 如果Windows API不可用，使用wxPython的透明设置
-                    self.SetTransparent(255)
-            elif sys.platform == "darwin":
-                # macOS：设置透明样式
-                self.SetWindowStyle(self.GetWindowStyle() | wx.FRAME_TOOL_WINDOW)
-                self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
-            else:
-                # Linux：设置透明
-                self.SetTransparent(255)
-                self.SetBackgroundStyle(wx.BG_STYLE_TRANSPARENT)
-            
-            print("窗口透明设置完成")
-        except Exception as e:
-            print(f"窗口透明设置失败: {e}")
-    
-    def bind_events(self):
-        """绑定事件"""
-        # 鼠标事件
-        self.Bind(wx.EVT_LEFT_DOWN, self.on_mouse_left_down)
-        self.Bind(wx.EVT_LEFT_UP, self.on_mouse_left_up)
-        self.Bind(wx.EVT_MOTION, self.on_mouse_motion)
-        self.Bind(wx.EVT_ENTER_WINDOW, self.on_mouse_enter)
-        self.Bind(wx.EVT_LEAVE_WINDOW, self.on_mouse_leave)
-        self.Bind(wx.EVT_RIGHT_DOWN, self.on_mouse_right_down)  # 添加右键点击事件
-        
-        # 窗口事件
-        self.Bind(wx.EVT_CLOSE, self.on_close)
-    
-    def on_mouse_left_down(self, event):
-        """鼠标左键按下事件（开始拖拽）"""
-        self.is_dragging = True
-        self.drag_pos = event.GetPosition()
-        self.CaptureMouse()
-        # 记录按下位置用于检测点击
-        self.click_start_pos = event.GetPosition()
-        event.Skip()
-    
-    def on_mouse_left_up(self, event):
-        """鼠标左键释放事件（停止拖拽）"""
-        if self.is_dragging:
-            self.is_dragging = False
-            if self.HasCapture():
-                self.ReleaseMouse()
-                
-            # 检测是否为点击事件（移动距离小于5像素）
-            click_end_pos = event.GetPosition()
-            distance = ((click_end_pos[0] - self.click_start_pos[0])**2 + 
-                      (click_end_pos[1] - self.click_start_pos[1])**2)**0.5
-            
-            if distance < 5:
-                # 执行弹跳效果
-                self.bounce()
-                # 显示可爱对话框
-                self.show_cute_dialog()
-        event.Skip()
-    
-    def on_mouse_motion(self, event):
-        """鼠标移动事件（处理拖拽）"""
-        if self.is_dragging and self.HasCapture():
-            pos = event.GetPosition()
-            delta = (pos[0] - self.drag_pos[0], pos[1] - self.drag_pos[1])
-            new_pos = self.ClientToScreen(delta)
-            self.Move(new_pos)
-            
-            # 更新对话框位置跟随宠物移动
-            self.update_dialog_position()
+        self.Bind(wx.EVT_MENU, self.on_change_image, change_image_item)
+        
+        # 缩放选项（也可以在宠物上滚动鼠标滚轮）
+        zoom_menu = wx.Menu()
+        for zoom in ZOOM_PRESETS:
+            if not config.Config.ZOOM_MIN <= zoom <= config.Config.ZOOM_MAX:
+                continue
+            zoom_item = zoom_menu.AppendRadioItem(wx.ID_ANY, f"{zoom:.0%}")
+            zoom_item.Check(abs(zoom - self.zoom) < 0.005)
+            self.Bind(wx.EVT_MENU, lambda evt, z=zoom: self.set_zoom(z), zoom_item)
+        menu.AppendSubMenu(zoom_menu, "缩放")
+        
+        # 上班激励选项
+        work_incentive_item = menu.Append(wx.ID_ANY, "上班激励")
+        self.Bind(wx.EVT_MENU, self.on_work_incentive, work_incentive_item)
+        
+        # 自定义提示语选项
+        custom_texts_item = menu.Append(wx.ID_ANY, "自定义提示语")
+        self.Bind(wx.EVT_MENU, self.on_custom_texts, custom_texts_item)
+        
+        # 退出选项
+        exit_item = menu.Append(wx.ID_EXIT, "退出")
+        self.Bind(wx.EVT_MENU, self.on_close, exit_item)
+        
+        # 显示菜单 - 在Windows上使用鼠标位置确保正确显示
+        mouse_pos = event.GetPosition()
+        self.PopupMenu(menu, mouse_pos)
+        
+        menu.Destroy()
         event.Skip()
     
-    def on_mouse_enter(self, event):
-        """鼠标进入窗口事件"""
-        # 鼠标悬停时暂停动画并跳转到第一帧
-        self.pause_animation(0)
-        event.Skip()
+    def on_work_incentive(self, event):
+        """上班激励选项点击事件"""
+        # 使用管理器显示配置对话框
+        self.work_incentive_manager.show_config_dialog()
     
-    def on_mouse_leave(self, event):
-        """鼠标离开窗口事件"""
-        # 鼠标离开时恢复动画
-        self.resume_animation()
-        event.Skip()
+    def on_custom_texts(self, event):
+        """自定义提示语选项点击事件"""
+        # 使用管理器显示自定义提示语设置对话框
+        self.work_incentive_manager.show_custom_texts_dialog()
     
     def on_change_image(self, event):
         """更换形象选项点击事件"""
@@ -856,7 +90,7 @@ class FinalGIFDesktopPet(wx.Frame):
             message="选择GIF动画文件",
             defaultDir="",
             defaultFile="",
-            wildcard="GIF文件 (*.gif)|*.gif",
+            wildcard="GIF文件 (*.gif)|*.gif|预编译宠物包 (*.petpack)|*.petpack",
             style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST
         )
         
@@ -868,28 +102,31 @@ class FinalGIFDesktopPet(wx.Frame):
             # 验证文件是否为GIF格式
             if selected_path.lower().endswith('.gif'):
                 try:
-                    # 验证GIF文件是否有效
-                    from PIL import Image
-                    with Image.open(selected_path) as img:
-                        if img.format != 'GIF':
-                            wx.MessageBox("选择的文件不是有效的GIF格式", "错误", wx.OK | wx.ICON_ERROR)
-                            return
+                    # 只读取文件结构做预检（不解码），超出资源预算的文件在这里就拒绝
+                    plan = self.preflight_gif(selected_path, self.variant_scaling(self.current_dpi_scale()))
+                    if plan.adjusted:
+                        wx.MessageBox("该GIF超出资源预算，将按以下方式加载：\n" + "\n".join(plan.notes),
+                                      "提示", wx.OK | wx.ICON_INFORMATION)
+                    
+                    # 更新配置并重新加载宠物形象（沿用这里的预检方案，不再重复预检）
+                    self.change_pet_image(selected_path, plan=plan)
+                except Exception as e:
+                    wx.MessageBox(f"无法加载GIF文件: {e}", "错误", wx.OK | wx.ICON_ERROR)
+            elif selected_path.lower().endswith('.petpack'):
+                try:
+                    # 验证宠物包是否有效
+                    load_petpack(selected_path).close()
                     
                     # 更新配置并重新加载宠物形象
                     self.change_pet_image(selected_path)
                 except Exception as e:
-                    wx.MessageBox(f"无法加载GIF文件: {e}", "错误", wx.OK | wx.ICON_ERROR)
+                    wx.MessageBox(f"无法加载宠物包: {e}", "错误", wx.OK | wx.ICON_ERROR)
             else:
                 wx.MessageBox("请选择GIF格式的文件", "错误", wx.OK | wx.ICON_ERROR)
         
         # 关闭对话框
         file_dialog.Destroy()
     
-    def on_work_incentive(self, event):
-        """上班激励选项点击事件"""
-        # 使用管理器显示配置对话框
-        self.work_incentive_manager.show_config_dialog()
-    
     def __init__(self, gif_path=config.Config.get_gif_path()):
         """初始化桌面宠物
         
@@ -912,11 +149,25 @@ class FinalGIFDesktopPet(wx.Frame):
         self.click_start_pos = wx.Point(0, 0)  # 初始化点击起始位置
         
         # GIF 动画相关变量
-        self.gif_frames = []      # GIF 帧列表
-        self.frame_delays = []    # 帧延迟列表
+        self.zoom = config.Config.PET_ZOOM  # 宠物缩放倍数
+        self.zoom_save_call = None  # 延迟保存缩放倍数（滚轮连续缩放时只保存一次）
+        self.gif_frames = self.create_frame_store()  # GIF 帧存储
+        self.power_profile = power.activate(config.Config.POWER_PROFILE)  # 当前电源模式
+        self.frame_delays = FrameDelays(self.power_profile.normalize_delay)  # 帧延迟列表（保存原始延迟，按电源模式规范化）
         self.current_frame = 0    # 当前播放帧
         self.animation_timer = None  # 动画定时器
+        self.frame_scheduler = None  # 按单调时钟计算每帧截止时间的调度器
         self.is_paused = False    # 动画暂停状态
+        self.is_suspended = False  # 宠物不可见（隐藏、最小化、不在任何屏幕上或锁屏）而挂起播放
+        self.power_timer = None  # 自动电源模式下定期检查供电方式的定时器
+        self.visibility_timer = None  # 定期检查宠物是否可见的定时器
+        self.gif_loader = None    # 后台 GIF 加载器
+        self.pending_image = None  # 正在后台加载、尚未换上的新形象（PendingPetImage）
+        self.is_initial_load = True  # 是否为启动时的首次加载（首帧到达后定位并显示窗口）
+        self.content_offset = (0, 0)  # 窗口左上角相对原始画布的偏移（逻辑坐标，含裁掉的透明边缘和弹跳边距）
+        self.frame_offset = (0, 0)    # 当前形象裁掉透明边缘后画面相对原始画布的偏移（按帧位图像素计）
+        self.frame_scale = 1.0        # 当前帧变体构建时的 DPI 缩放倍数
+        self.frame_variants = FrameVariantCache(config.Config.DPI_VARIANT_CACHE)  # 其他 DPI 的帧变体
         
         # 对话框相关变量
         self.dialog = None  # 保存对话框引用
@@ -924,11 +175,8 @@ class FinalGIFDesktopPet(wx.Frame):
         
         # 弹跳效果相关变量
         self.bounce_timer = None  # 弹跳定时器
-        self.bounce_offset = 0  # 当前弹跳偏移量
-        self.bounce_direction = -1  # 弹跳方向 (-1: 向上, 1: 向下)
-        self.bounce_amplitude = 20  # 弹跳幅度
-        self.bounce_speed = 2  # 弹跳速度
-        self.original_position = wx.Point(0, 0)  # 原始位置
+        self.bounce_step = 0  # 当前弹跳步数
+        self.bounce_max_steps = 0  # 弹跳总步数
         
         # 上班激励功能相关变量
         self.work_incentive_manager = WorkIncentiveManager(self)  # 使用新的管理器类
@@ -936,8 +184,11 @@ class FinalGIFDesktopPet(wx.Frame):
         # 收益提示定时器
         self.income_timer = None  # 每分钟弹出收益提示的定时器
         
-        # 创建图像控件
-        self.image_ctrl = wx.StaticBitmap(self, wx.ID_ANY)
+        # 创建图像控件（支持只重绘变化区域的画布）
+        self.image_ctrl = FrameCanvas(self)
+        
+        # 按当前屏幕的 DPI 构建帧
+        self.frame_scale = self.current_dpi_scale()
         
         # 初始化流程
         self.load_gif()
@@ -947,228 +198,585 @@ class FinalGIFDesktopPet(wx.Frame):
         # 配置已经在WorkIncentiveConfig初始化时加载
         
         # 启动收益提示定时器（每分钟弹出一次）
-        self.income_timer = wx.Timer(self)
-        self.Bind(wx.EVT_TIMER, self.on_income_timer, self.income_timer)
-        self.income_timer.Start(60000)  # 60秒间隔
+        self.income_timer = get_ticker().call_every(60000, self.on_income_timer)  # 60秒间隔
+        
+        # 移出所有屏幕和锁屏没有对应的窗口事件，定期检查
+        self.visibility_timer = get_ticker().call_every(config.Config.VISIBILITY_CHECK_MS, self.update_playback_visibility)
         
-        # 显示窗口
-        self.Show()
+        # 插拔电源没有对应的窗口事件，定期检查（只在自动电源模式下生效）
+        self.power_timer = get_ticker().call_every(config.Config.POWER_CHECK_MS, self.check_power_source)
+        
+        # 窗口在首帧解码完成后显示（见 on_gif_frame_loaded），避免先闪出空白窗口
     
     def bounce(self):
-        """实现史莱姆按压效果"""
+        """实现史莱姆按压效果
+        
+        挤压/拉伸在画布绘制时以缩放变换实现，窗口的位置和尺寸始终不变，
+        每一步只需重绘一次画布；画布两侧预留了拉伸所需的边距（见 fit_window_to_frames）。
+        """
         if self.bounce_timer is None:
-            self.bounce_timer = wx.Timer(self)
-            self.Bind(wx.EVT_TIMER, self.on_bounce_timer, self.bounce_timer)
-            # 记录原始位置和尺寸
-            self.original_position = self.GetPosition()
-            self.original_size = self.GetSize()
             # 重置弹跳参数
             self.bounce_step = 0
-            self.bounce_max_steps = 16  # 弹跳总步数，增加以获得更平滑的效果
-            self.bounce_timer.Start(16)  # 约60fps
+            # 弹跳总时长固定，电源模式的界面动画帧率越高步数越多、效果越平滑
+            self.bounce_max_steps = self.power_profile.ui_steps(BOUNCE_DURATION_MS)
+            self.bounce_timer = get_ticker().call_every(self.power_profile.ui_interval, self.on_bounce_timer)
             return
         
         # 使用正弦函数创建更自然的弹跳效果
-        import math
-        
         # 计算当前弹跳进度 (0-1)
         progress = self.bounce_step / self.bounce_max_steps
         
-        # 使用正弦函数计算弹跳高度，创建缓动效果
+        # 使用正弦函数计算挤压程度，创建缓动效果
         # 前半部分(0-0.5)是按压阶段，后半部分(0.5-1)是回弹阶段
         if progress <= 0.5:
             # 按压阶段：压缩宠物
             compression_progress = progress * 2  # 0-1
             compression_factor = math.sin(compression_progress * math.pi / 2)
-            
-            # 计算新尺寸：垂直压缩，水平略微扩展
-            new_height = int(self.original_size.height * (1 - 0.2 * compression_factor))
-            new_width = int(self.original_size.width * (1 + 0.1 * compression_factor))
-            
-            # 更新窗口位置和尺寸
-            new_pos = wx.Point(
-                self.original_position.x - (new_width - self.original_size.width) // 2,
-                self.original_position.y + (self.original_size.height - new_height)
-            )
-            self.SetPosition(new_pos)
-            self.SetSize((new_width, new_height))
-            self.image_ctrl.SetSize((new_width, new_height))
         else:
-            # 回弹阶段：恢复原始尺寸
+            # 回弹阶段：逐渐恢复原始比例
             rebound_progress = (progress - 0.5) * 2  # 0-1
-            rebound_factor = math.sin(rebound_progress * math.pi / 2)
-            
-            # 计算新尺寸：逐渐恢复原始尺寸
-            new_height = int(self.original_size.height * (1 - 0.2 * (1 - rebound_factor)))
-            new_width = int(self.original_size.width * (1 + 0.1 * (1 - rebound_factor)))
-            
-            # 更新窗口位置和尺寸
-            new_pos = wx.Point(
-                self.original_position.x - (new_width - self.original_size.width) // 2,
-                self.original_position.y + (self.original_size.height - new_height)
-            )
-            self.SetPosition(new_pos)
-            self.SetSize((new_width, new_height))
-            self.image_ctrl.SetSize((new_width, new_height))
+            compression_factor = 1 - math.sin(rebound_progress * math.pi / 2)
+        
+        # 垂直压缩，水平略微扩展（以底边中点为锚点，脚底不动）
+        self.image_ctrl.SetSquash(1 + BOUNCE_STRETCH_X * compression_factor, 1 - BOUNCE_SQUASH_Y * compression_factor)
         
         # 更新步数
         self.bounce_step += 1
         
         # 检查是否完成弹跳
         if self.bounce_step >= self.bounce_max_steps:
-            # 恢复到原始位置和尺寸
-            self.SetPosition(self.original_position)
-            self.SetSize(self.original_size)
-            self.image_ctrl.SetSize(self.original_size)
-            # 清理定时器
-            self.bounce_timer.Stop()
+            self.stop_bounce()
+    
+    def stop_bounce(self):
+        """结束弹跳效果，恢复原始比例"""
+        if self.bounce_timer:
+            self.bounce_timer.stop()
             self.bounce_timer = None
-            self.bounce_step = 0
+        self.bounce_step = 0
+        self.image_ctrl.SetSquash(1.0, 1.0)
     
-    def on_bounce_timer(self, event):
+    def on_bounce_timer(self):
         """弹跳定时器事件"""
         self.bounce()
     
     def load_gif(self):
-        """使用 Pillow 加载 GIF 动画"""
+        """使用 Pillow 在后台线程加载 GIF 动画
+
+        解码、缩放在工作线程中完成，首帧到达后立即显示并开始播放，
+        后续帧陆续加入播放循环。
+        """
         try:
             if not os.path.exists(self.GIF_PATH):
                 raise FileNotFoundError(f"GIF 文件不存在: {self.GIF_PATH}")
             
-            # 使用 Pillow 打开 GIF 图像
-            pil_image = Image.open(self.GIF_PATH)
-            
-            # 检查是否为动画 GIF
-            if not pil_image.is_animated:
-                print("警告: 这是一个静态 GIF 图像")
-            
-            # 获取总帧数
-            num_frames = pil_image.n_frames
-            print(f"GIF 总帧数: {num_frames}")
-            
-            # 提取所有帧
-            for i in range(num_frames):
-                # 定位到当前帧
-                pil_image.seek(i)
-                
-                # 复制当前帧
-                frame = pil_image.copy()
-                
-                # 获取帧延迟（单位：1/1000秒）
-                if 'duration' in pil_image.info:
-                    delay = pil_image.info['duration']
-                else:
-                    delay = 100  # 默认延迟 100ms
-                
-                if delay < 10:  # 最小延迟 10ms
-                    delay = 10
-                
-                # 确保所有帧都转换为 RGBA 模式以处理透明度
-                if frame.mode != 'RGBA':
-                    frame = frame.convert('RGBA')
-                
-                # 将图像缩小为原来的一半
-                new_size = (frame.width // 2, frame.height // 2)
-                frame = frame.resize(new_size, Image.Resampling.LANCZOS)
-                
-                # 打印帧信息（用于调试）
-                print(f"帧 {i+1}/{num_frames}: 模式={frame.mode}, 尺寸={new_size}, 延迟={delay}ms")
-                
-                # 创建 wx.Image
-                wx_image = wx.Image(*new_size)
-                
-                # 设置 RGB 数据
-                rgb_data = frame.convert('RGB').tobytes()
-                wx_image.SetData(rgb_data)
-                
-                # 设置 Alpha 通道
-                if frame.mode == 'RGBA':
-                    alpha_data = frame.getchannel('A').tobytes()
-                    wx_image.SetAlpha(alpha_data)
-                else:
-                    # 如果没有 Alpha 通道，创建完全不透明的通道
-                    alpha_data = bytes([255] * (frame.width * frame.height))
-                    wx_image.SetAlpha(alpha_data)
-                
-                # 转换为 wx.Bitmap
-                wx_bitmap = wx_image.ConvertToBitmap()
-                
-                # 添加到帧列表
-                self.gif_frames.append(wx_bitmap)
-                self.frame_delays.append(delay)
-            
-            # 设置初始帧
-            self.image_ctrl.SetBitmap(self.gif_frames[0])
-            
-            # 调整窗口大小
-            size = self.gif_frames[0].GetSize()
-            self.SetSize(size)
-            self.image_ctrl.SetSize(size)
+            # 取消仍在进行的旧加载任务
+            if self.gif_loader:
+                self.gif_loader.cancel()
             
-            # 启动动画
-            self.start_animation()
+            # 按文件大小选择帧存储（超大文件改为流式播放）
+            self.gif_frames = self.create_frame_store(self.GIF_PATH)
+            if self.GIF_PATH.lower().endswith(".petpack"):
+                # 预编译宠物包的分辨率是固定的，按构建时的 DPI 倍数绘制
+                self.frame_scale = petpack_dpi_scale(self.GIF_PATH)
             
-            print(f"成功加载并启动 GIF 动画: {self.GIF_PATH}")
-            print(f"GIF 尺寸: {size}")
+            # 启动后台加载（命中磁盘帧缓存时无需解码）
+            self.gif_loader = self.start_gif_loader(
+                self.GIF_PATH, self.gif_frames, self.variant_scaling(self.frame_scale),
+                on_frame=self.on_gif_frame_loaded,
+                on_done=self.on_gif_load_done,
+                on_error=self.on_gif_load_error
+            )
+            print(f"开始后台加载 GIF: {self.GIF_PATH}")
             
         except Exception as e:
-            print(f"加载 GIF 失败: {e}")
-            import traceback
-            traceback.print_exc()
-            wx.MessageBox(f"加载 GIF 失败: {e}", "错误", wx.OK | wx.ICON_ERROR)
-            self.Destroy()
+            self.on_gif_load_error(e)
+    
+    def start_gif_loader(self, gif_path, frames, scaling, on_frame, on_done, on_error, plan=None):
+        """预检 GIF 并启动向指定帧存储加载的后台加载器
+        
+        Args:
+            gif_path: GIF 或 .petpack 文件路径
+            frames: 接收帧的帧存储（决定打包、增量编码、图集等加载方式）
+            scaling: 缩放设置（FrameScaling，预检可能进一步缩小）
+            on_frame: 每得到一帧时的回调
+            on_done: 全部完成时的回调
+            on_error: 出错时的回调
+            plan: 调用方已按 scaling 做过的预检方案（PreflightPlan），为 None 时在这里预检
+        
+        Returns:
+            GifLoader: 已启动的加载器
+        
+        Raises:
+            ValueError: 预检发现文件无效或无法在预算内加载
+        """
+        # 解码前预检，按资源预算决定缩放和抽帧（预编译宠物包无需预检）
+        if plan is None and not gif_path.lower().endswith(".petpack"):
+            plan = self.preflight_gif(gif_path, scaling)
+        
+        loader = GifLoader(
+            gif_path,
+            on_frame=on_frame,
+            on_done=on_done,
+            on_error=on_error,
+            frame_cache=self.create_frame_cache(),
+            scaling=plan.scaling if plan else scaling,
+            workers=config.Config.DECODE_WORKERS or default_worker_count(),
+            parallel_min_bytes=config.Config.PARALLEL_DECODE_MIN_KB * 1024,
+            pack_frames=frames.limited,
+            delta_encode=isinstance(frames, DeltaFrameStore),
+            coalesce=config.Config.COALESCE_DUPLICATE_FRAMES,
+            atlas_max_size=config.Config.ATLAS_MAX_SIZE,
+            on_atlas_page=frames.add_page if isinstance(frames, AtlasFrameStore) else None,
+            palette_index=isinstance(frames, IndexedFrameStore),
+            binary_alpha=config.Config.BINARY_ALPHA_MASK and not isinstance(frames, MipmapFrameStore),
+            alpha_threshold=config.Config.BINARY_ALPHA_THRESHOLD,
+            stream=frames if isinstance(frames, StreamingFrameStore) else None,
+            trim=config.Config.TRIM_TRANSPARENT_BORDER,
+            prefer_petpack=config.Config.PREFER_PETPACK,
+            frame_step=plan.frame_step if plan else 1,
+            sandbox=self.create_decode_sandbox()
+        )
+        loader.start()
+        return loader
+    
+    def create_frame_store(self, gif_path=None):
+        """根据配置创建帧存储
+        
+        Args:
+            gif_path: 可选的 GIF 文件路径，文件不小于流式播放阈值时使用流式存储
+        
+        Returns:
+            超大文件为 StreamingFrameStore，增量编码时为 DeltaFrameStore，启用图集时为 AtlasFrameStore，
+            调色板索引存储时为 IndexedFrameStore，mipmap 存储时为 MipmapFrameStore，
+            否则为按内存预算管理位图的 FrameStore
+        """
+        if gif_path and self.should_stream(gif_path):
+            print(f"GIF 文件超过 {config.Config.STREAMING_MIN_MB} MB，使用流式播放")
+            return StreamingFrameStore(config.Config.STREAM_BUFFER_FRAMES)
+        if config.Config.FRAME_ENCODING == "delta":
+            return DeltaFrameStore()
+        if config.Config.FRAME_STORAGE == "atlas":
+            return AtlasFrameStore()
+        if config.Config.FRAME_STORAGE == "indexed":
+            return IndexedFrameStore(config.Config.INDEXED_BITMAP_CACHE)
+        if config.Config.FRAME_STORAGE == "mipmap":
+            return MipmapFrameStore(self.zoom, config.Config.ZOOM_BITMAP_CACHE)
+        return FrameStore(config.Config.FRAME_MEMORY_BUDGET_MB * 1024 * 1024)
+    
+    @staticmethod
+    def should_stream(gif_path):
+        """判断 GIF 是否大到需要流式播放
+        
+        Args:
+            gif_path: GIF 文件路径
+        
+        Returns:
+            bool: 文件不小于流式播放阈值时为 True（预编译宠物包不流式播放）
+        """
+        stream_min_bytes = config.Config.STREAMING_MIN_MB * 1024 * 1024
+        return (bool(stream_min_bytes) and not gif_path.lower().endswith(".petpack")
+                and os.path.getsize(gif_path) >= stream_min_bytes)
+    
+    def preflight_gif(self, gif_path, scaling=None):
+        """预检 GIF（只读文件结构，不解码）并按配置的资源预算制定加载方案
+        
+        流式播放时内存占用与帧数无关，只检查画布大小。
+        
+        Args:
+            gif_path: GIF 文件路径
+            scaling: 要使用的缩放设置，为 None 时使用配置的缩放设置
+        
+        Returns:
+            PreflightPlan: 加载方案（可能调整了缩放设置和抽帧间隔）
+        
+        Raises:
+            ValueError: 文件无效或无法在预算内加载
+        """
+        streaming = self.should_stream(gif_path)
+        info = inspect_gif(gif_path)
+        plan = plan_gif_load(
+            info,
+            scaling or self.create_frame_scaling(),
+            max_frames=0 if streaming else config.Config.PREFLIGHT_MAX_FRAMES,
+            max_decoded_bytes=0 if streaming else config.Config.PREFLIGHT_MAX_DECODED_MB * 1024 * 1024,
+            max_canvas_pixels=int(config.Config.PREFLIGHT_MAX_CANVAS_MP * 1_000_000)
+        )
+        print(f"GIF 预检: {info}")
+        for note in plan.notes:
+            print(f"加载方案调整: {note}")
+        return plan
+    
+    def show_frame(self, index):
+        """显示指定帧
+        
+        Args:
+            index: 帧索引
+        """
+        self.gif_frames.render(index, self.image_ctrl)
+    
+    @staticmethod
+    def create_frame_scaling():
+        """根据配置创建帧缩放设置（宠物形象和托盘图标共用）
+        
+        Returns:
+            FrameScaling: 缩放设置
+        """
+        return FrameScaling(
+            scale=config.Config.RENDER_SCALE,
+            box=config.Config.RENDER_BOX,
+            quality=config.Config.RESAMPLE_QUALITY
+        )
+    
+    def variant_scaling(self, frame_scale):
+        """获取按 DPI 缩放倍数构建帧变体时的缩放设置
+        
+        Args:
+            frame_scale: DPI 缩放倍数
+        
+        Returns:
+            FrameScaling: 在配置的缩放设置基础上再放大 frame_scale 倍
+        """
+        scaling = self.create_frame_scaling()
+        return scaling if frame_scale == 1 else scaling.scaled(frame_scale)
+    
+    def current_dpi_scale(self):
+        """获取窗口当前所在屏幕的 DPI 缩放倍数（按 0.25 取整，减少变体数量）
+        
+        Returns:
+            float: DPI 缩放倍数，未启用按 DPI 构建帧时为 1
+        """
+        if not config.Config.DPI_AWARE_FRAMES:
+            return 1.0
+        return max(0.25, round(self.GetDPIScaleFactor() * 4) / 4)
+    
+    def frame_pixel_scale(self):
+        """获取当前帧变体在当前屏幕上每个逻辑单位对应的位图像素数
+        
+        Windows 上窗口坐标就是物理像素，macOS/GTK 上是逻辑点（GetContentScaleFactor 个物理像素），
+        变体 DPI 与屏幕一致时每个位图像素正好对应一个物理像素。
+        mipmap 存储自己生成缩放后的位图，其他帧存储在绘制时按缩放倍数拉伸。
+        
+        Returns:
+            float: 位图像素密度
+        """
+        scale = 1.0
+        if config.Config.DPI_AWARE_FRAMES:
+            scale = self.frame_scale * self.GetContentScaleFactor() / self.GetDPIScaleFactor()
+        if not isinstance(self.gif_frames, MipmapFrameStore):
+            scale /= self.zoom
+        return scale
+    
+    def set_zoom(self, zoom):
+        """设置宠物缩放倍数（无需重新加载 GIF），窗口以底边中点为基准缩放
+        
+        Args:
+            zoom: 缩放倍数（限制在配置的范围内）
+        """
+        zoom = round(min(max(zoom, config.Config.ZOOM_MIN), config.Config.ZOOM_MAX), 2)
+        if zoom == self.zoom or self.gif_frames.frame_size is None:
+            return
+        
+        self.zoom = zoom
+        if isinstance(self.gif_frames, MipmapFrameStore):
+            self.gif_frames.set_zoom(zoom)
+        
+        x, y = self.GetPosition()
+        old_width, old_height = self.GetSize()
+        self.fit_window_to_frames()
+        width, height = self.GetSize()
+        self.SetPosition((x + (old_width - width) // 2, y + old_height - height))
+        self.show_frame(self.current_frame)
+        self.update_dialog_position()
+        
+        # 滚轮连续缩放时，停止滚动后再保存
+        if self.zoom_save_call:
+            self.zoom_save_call.stop()
+        self.zoom_save_call = get_ticker().call_later(1000, lambda: config.Config.set_pet_zoom(zoom))
+    
+    def on_mouse_wheel(self, event):
+        """鼠标滚轮事件（缩放宠物）"""
+        steps = event.GetWheelRotation() / (event.GetWheelDelta() or 120)
+        self.set_zoom(self.zoom * ZOOM_WHEEL_STEP ** steps)
+    
+    def create_frame_cache(self):
+        """根据配置创建解码帧磁盘缓存
+        
+        Returns:
+            FrameCache: 帧缓存对象，未启用时返回 None
+        """
+        if not config.Config.FRAME_CACHE_ENABLED:
+            return None
+        return FrameCache(config.Config.get_frame_cache_dir(), config.Config.FRAME_CACHE_MAX_MB * 1024 * 1024)
+    
+    @staticmethod
+    def create_decode_sandbox():
+        """根据配置创建解码沙箱
+        
+        Returns:
+            DecodeSandbox: 解码沙箱，未启用时返回 None
+        """
+        if not config.Config.DECODE_SANDBOX:
+            return None
+        return DecodeSandbox(
+            memory_bytes=config.Config.SANDBOX_MEMORY_MB * 1024 * 1024,
+            cpu_seconds=config.Config.SANDBOX_CPU_SECONDS,
+            timeout=config.Config.SANDBOX_TIMEOUT_SECONDS
+        )
+    
+    def on_gif_frame_loaded(self, frame):
+        """后台解码出一帧时的回调（在主线程中执行）
+        
+        Args:
+            frame: 解码后的帧数据（DecodedFrame）
+        """
+        # 在主线程中创建位图并加入播放循环
+        self.gif_frames.append(frame)
+        self.frame_delays.add(frame.raw_delays)
+        
+        # 打印帧信息（用于调试）
+        print(f"帧 {frame.index+1}: 尺寸={(frame.width, frame.height)}, 延迟={self.frame_delays[-1]}ms")
+        
+        if len(self.gif_frames) > 1:
+            if len(self.frame_delays) == 2:
+                self.on_second_frame()
+            return
+        
+        # 首帧：设置初始帧并调整窗口大小
+        self.show_frame(0)
+        self.fit_window_to_frames(frame.offset or (0, 0))
+        
+        # 启动时首帧到达后再定位并显示窗口
+        if self.is_initial_load:
+            self.is_initial_load = False
+            self.set_initial_position()
+            self.Show()
+        
+        # 用已解码的帧启动动画，后续帧到达后播放循环自动变长
+        self.start_animation()
+        print(f"GIF 尺寸: {self.gif_frames.frame_size}")
+    
+    def fit_window_to_frames(self, offset=None):
+        """按当前帧存储的帧尺寸和屏幕像素密度调整窗口大小
+        
+        窗口左右两侧各多出画面宽度的 BOUNCE_STRETCH_X / 2，按压弹跳水平拉伸时画面不会被裁剪。
+        
+        Args:
+            offset: 新形象裁掉透明边缘后画面相对原始画布的偏移（位图像素），为 None 时沿用当前偏移
+        """
+        if offset is None:
+            offset = self.frame_offset
+        self.frame_offset = offset
+        
+        scale = self.frame_pixel_scale()
+        self.image_ctrl.SetPixelScale(scale)
+        width, height = self.gif_frames.frame_size
+        width, height = max(1, round(width / scale)), max(1, round(height / scale))
+        margin = math.ceil(width * BOUNCE_STRETCH_X / 2)
+        size = (width + 2 * margin, height)
+        self.image_ctrl.SetContentMargin(margin)
+        # 偏移按原始帧像素计，mipmap 存储的帧尺寸已经包含了缩放倍数；窗口左边缘在画面左侧边距处
+        offset_scale = scale / self.zoom if isinstance(self.gif_frames, MipmapFrameStore) else scale
+        offset = (round(offset[0] / offset_scale) - margin, round(offset[1] / offset_scale))
+        self.SetSize(size)
+        self.image_ctrl.SetSize(size)
+        
+        # 裁剪了透明边缘时按偏移的变化移动窗口，使画面在屏幕上的位置保持不变
+        if not self.is_initial_load and offset != self.content_offset:
+            x, y = self.GetPosition()
+            self.SetPosition((x + offset[0] - self.content_offset[0], y + offset[1] - self.content_offset[1]))
+        self.content_offset = offset
+    
+    def on_gif_load_done(self, frame_count):
+        """后台解码全部完成时的回调
+        
+        Args:
+            frame_count: 解码出的总帧数
+        """
+        # 流式播放时加载线程仍在循环解码，保留引用以便之后取消
+        if not isinstance(self.gif_frames, StreamingFrameStore):
+            self.gif_loader = None
+        print(f"成功加载并启动 GIF 动画: {self.GIF_PATH}（共 {frame_count} 帧）")
+        print(f"帧存储统计: {self.gif_frames.stats()}")
+    
+    def on_gif_load_error(self, error):
+        """GIF 加载失败时的回调
+        
+        Args:
+            error: 异常对象
+        """
+        self.gif_loader = None
+        
+        # 已经有部分帧可以播放时，只保留已解码的帧
+        if self.gif_frames:
+            print(f"GIF 未能完整加载，将只播放已解码的 {len(self.gif_frames)} 帧: {error}")
+            return
+        
+        print(f"加载 GIF 失败: {error}")
+        wx.MessageBox(f"加载 GIF 失败: {error}", "错误", wx.OK | wx.ICON_ERROR)
+        self.Destroy()
+        # 事件循环尚未启动（构造阶段同步出错）时直接退出进程
+        if wx.GetApp().IsMainLoopRunning():
+            wx.GetApp().ExitMainLoop()
+        else:
             sys.exit(1)
     
     def start_animation(self):
-        """启动 GIF 动画"""
-        if self.animation_timer is None:
-            self.animation_timer = wx.Timer(self)
-            self.Bind(wx.EVT_TIMER, self.on_animation_timer, self.animation_timer)
+        """启动 GIF 动画（从当前帧开始，按调度器计算的截止时间切换帧）"""
+        # 换了形象时帧延迟列表也换了，重新创建调度器
+        if self.frame_scheduler is None or self.frame_scheduler.delays is not self.frame_delays:
+            self.frame_scheduler = FrameScheduler(
+                self.frame_delays,
+                min_interval=self.power_profile.min_frame_interval
+            )
         
-        # 设置定时器间隔并启动
-        self.animation_timer.Start(self.frame_delays[self.current_frame])
+        self.schedule_next_frame(self.frame_scheduler.start(self.current_frame))
         print(f"动画已启动，初始延迟: {self.frame_delays[self.current_frame]}ms")
     
+    def schedule_next_frame(self, wait):
+        """在 wait 毫秒后切换帧；只有一帧或播放已挂起时不启动定时器
+        
+        Args:
+            wait: 等待时间（毫秒）
+        """
+        if len(self.frame_delays) < 2 or self.is_suspended:
+            if self.animation_timer:
+                self.animation_timer.stop()
+            return
+        if self.animation_timer is None:
+            # 帧调度器按截止时间切换帧，提前触发只会让它再等几毫秒，登记为精确任务
+            self.animation_timer = get_ticker().call_later(wait, self.on_animation_timer, exact=True)
+        else:
+            self.animation_timer.start(wait)
+    
+    def on_second_frame(self):
+        """正在播放的形象加载出第二帧：此前只有一帧不需要定时器，现在开始切换帧"""
+        if self.frame_scheduler is not None and not self.is_paused and not self.is_suspended:
+            # 沿用首帧开始显示时的时间线
+            self.continue_animation()
+    
+    def continue_animation(self):
+        """按调度器原来的时间线继续播放（跳到此刻应当显示的帧）"""
+        frame, wait = self.frame_scheduler.resume()
+        if frame != self.current_frame:
+            self.current_frame = frame
+            self.show_frame(self.current_frame)
+        self.schedule_next_frame(wait)
+    
+    def is_pet_visible(self):
+        """宠物窗口此刻是否可能被看到
+        
+        Returns:
+            bool: 窗口已显示、未最小化、至少部分位于某个屏幕上且会话未锁屏时为 True
+        """
+        if not self.IsShown() or self.IsIconized():
+            return False
+        if wx.Display.GetFromWindow(self) == wx.NOT_FOUND:
+            return False
+        return not is_session_locked()
+    
+    def update_playback_visibility(self):
+        """宠物不可见时挂起动画，重新可见时按时间线恢复到应当显示的帧"""
+        if not self:
+            # 延后的检查到达时窗口可能已经销毁
+            return
+        visible = self.is_pet_visible()
+        if visible == (not self.is_suspended):
+            return
+        
+        self.is_suspended = not visible
+        if self.frame_scheduler is None:
+            return
+        if self.is_suspended:
+            if self.animation_timer:
+                self.animation_timer.stop()
+            self.frame_scheduler.stop()
+            print("宠物不可见，动画已挂起")
+        elif not self.is_paused:
+            self.continue_animation()
+            print(f"宠物重新可见，动画从第 {self.current_frame+1} 帧继续")
+    
+    def set_power_profile(self, setting):
+        """切换电源模式并保存配置（立即生效）
+        
+        Args:
+            setting: "auto" 或电源模式名称
+        """
+        config.Config.set_power_profile(setting)
+        self.apply_power_profile()
+    
+    def check_power_source(self):
+        """自动电源模式下按当前供电方式切换电源模式"""
+        if config.Config.POWER_PROFILE == power.AUTO:
+            self.apply_power_profile()
+    
+    def apply_power_profile(self):
+        """按配置启用电源模式，并把新的帧率上限和延迟规范化应用到正在播放的动画"""
+        profile = power.activate(config.Config.POWER_PROFILE)
+        if profile is self.power_profile:
+            return
+        self.power_profile = profile
+        print(f"电源模式: {profile.label}（最高 {profile.max_fps} 帧/秒）")
+        
+        # 帧延迟按保存的原始延迟原地重新规范化，不重新加载，当前帧和弹跳动画都不受影响；
+        # 正在加载的新形象和缓存的变体在换上时再按当前电源模式规范化
+        delays_changed = self.frame_delays.set_normalize(profile.normalize_delay)
+        if self.frame_scheduler is not None:
+            if delays_changed and self.frame_scheduler.delays is self.frame_delays:
+                self.frame_scheduler.reload_delays()
+            wait = self.frame_scheduler.set_min_interval(profile.min_frame_interval)
+            if wait is not None:
+                self.schedule_next_frame(wait)
+    
+    def on_visibility_event(self, event):
+        """显示/隐藏、最小化/还原、显示器变化时检查可见性"""
+        event.Skip()
+        # 事件发出时窗口状态可能尚未更新，在事件处理完后再检查
+        wx.CallAfter(self.update_playback_visibility)
+    
     def pause_animation(self, frame_index=None):
         """暂停 GIF 动画
         
         Args:
             frame_index: 可选参数，指定暂停时显示的帧索引
         """
-        if self.animation_timer and self.animation_timer.IsRunning():
-            self.animation_timer.Stop()
+        if self.animation_timer and self.animation_timer.running:
+            self.animation_timer.stop()
+            self.frame_scheduler.stop()
             self.is_paused = True
             
-            # 如果指定了帧索引，跳转到该帧
-            if frame_index is not None and 0 <= frame_index < len(self.gif_frames):
+            # 如果指定了帧索引，跳转到该帧（流式播放只能顺序前进，保持当前画面）
+            if (frame_index is not None and 0 <= frame_index < len(self.gif_frames)
+                    and not isinstance(self.gif_frames, StreamingFrameStore)):
                 self.current_frame = frame_index
-                self.image_ctrl.SetBitmap(self.gif_frames[self.current_frame])
+                self.show_frame(self.current_frame)
                 print(f"动画已暂停在第 {frame_index+1} 帧")
             else:
                 print("动画已暂停")
     
     def resume_animation(self):
         """恢复 GIF 动画"""
-        if self.animation_timer and not self.animation_timer.IsRunning():
-            self.animation_timer.Start(self.frame_delays[self.current_frame])
+        if self.is_paused:
+            # 从暂停时显示的帧重新计时（宠物不可见时只记录时间线，等可见后再切换帧）
+            self.schedule_next_frame(self.frame_scheduler.start(self.current_frame))
             self.is_paused = False
             print("动画已恢复")
     
-    def on_animation_timer(self, event):
+    def on_animation_timer(self):
         """动画定时器事件"""
         if self.is_paused:
             return
         
-        # 切换到下一帧
-        self.current_frame = (self.current_frame + 1) % len(self.gif_frames)
-        
-        # 更新图像
-        self.image_ctrl.SetBitmap(self.gif_frames[self.current_frame])
+        # 切换到当前时间应当显示的帧（落后时跳过中间的帧）
+        frame, wait = self.frame_scheduler.tick()
+        if frame != self.current_frame:
+            self.current_frame = frame
+            self.show_frame(self.current_frame)
+            
+            # 预先准备后续帧，避免播放到被淘汰的帧时临时重建
+            self.gif_frames.prefetch(self.current_frame + 1, config.Config.FRAME_PREFETCH)
         
-        # 重新设置定时器间隔
-        if self.animation_timer and self.animation_timer.IsRunning():
-            self.animation_timer.Stop()
-        self.animation_timer.Start(self.frame_delays[self.current_frame])
+        # 在下一帧的截止时间再次触发
+        self.schedule_next_frame(wait)
     
     def setup_transparent_window(self):
         """设置窗口透明"""
@@ -1198,9 +806,51 @@ class FinalGIFDesktopPet(wx.Frame):
         self.Bind(wx.EVT_ENTER_WINDOW, self.on_mouse_enter)
         self.Bind(wx.EVT_LEAVE_WINDOW, self.on_mouse_leave)
         self.Bind(wx.EVT_RIGHT_DOWN, self.on_mouse_right_down)  # 添加右键点击事件
+        self.Bind(wx.EVT_MOUSEWHEEL, self.on_mouse_wheel)  # 滚轮缩放
         
         # 窗口事件
         self.Bind(wx.EVT_CLOSE, self.on_close)
+        self.Bind(wx.EVT_DPI_CHANGED, self.on_dpi_changed)
+        self.Bind(wx.EVT_SHOW, self.on_visibility_event)
+        self.Bind(wx.EVT_ICONIZE, self.on_visibility_event)
+        self.Bind(wx.EVT_DISPLAY_CHANGED, self.on_visibility_event)
+    
+    def on_dpi_changed(self, event):
+        """窗口移动到 DPI 不同的显示器上时切换帧变体"""
+        event.Skip()
+        if self.gif_frames.frame_size is None:
+            return
+        # 新变体就绪前，先按新屏幕的像素密度显示当前变体
+        self.fit_window_to_frames()
+        self.switch_frame_variant(self.current_dpi_scale())
+    
+    def switch_frame_variant(self, frame_scale):
+        """切换到指定 DPI 缩放倍数的帧变体（已缓存时立即切换，否则在后台构建）
+        
+        Args:
+            frame_scale: DPI 缩放倍数
+        """
+        if self.GIF_PATH.lower().endswith(".petpack"):
+            return
+        
+        pending = self.pending_image
+        building = pending is not None and pending.path == self.GIF_PATH
+        if frame_scale == self.frame_scale:
+            # 又回到了当前变体的屏幕，不再需要正在构建的变体
+            if building:
+                self.cancel_pending_image()
+            return
+        if building and pending.frame_scale == frame_scale:
+            return
+        
+        variant = self.frame_variants.take(frame_scale)
+        if variant is not None:
+            print(f"切换到已缓存的 {frame_scale:g}x 帧变体")
+            self.commit_pending_image(variant)
+            return
+        
+        print(f"后台构建 {frame_scale:g}x 帧变体")
+        self.change_pet_image(self.GIF_PATH, frame_scale)
     
     def on_mouse_left_down(self, event):
         """鼠标左键按下事件（开始拖拽）"""
@@ -1258,16 +908,29 @@ class FinalGIFDesktopPet(wx.Frame):
         """窗口关闭事件"""
         self.Hide()
         # 清理资源
+        if self.gif_loader:
+            self.gif_loader.cancel()
+        self.cancel_pending_image()
         if self.animation_timer:
-            self.animation_timer.Stop()
+            self.animation_timer.stop()
+        if self.frame_scheduler:
+            print(f"播放计时统计: {self.frame_scheduler.stats()}")
         if self.income_timer:
-            self.income_timer.Stop()
+            self.income_timer.stop()
+        if self.visibility_timer:
+            self.visibility_timer.stop()
+        if self.power_timer:
+            self.power_timer.stop()
         # 移除对auto_close_timer的管理，因为它由WorkIncentiveManager负责管理
         # if self.auto_close_timer:
         #     self.auto_close_timer.Stop()
         #     self.auto_close_timer.Destroy()
         if self.bounce_timer:
-            self.bounce_timer.Stop()
+            self.bounce_timer.stop()
+        if self.zoom_save_call and self.zoom_save_call.running:
+            # 退出前立即保存尚未写入的缩放倍数
+            self.zoom_save_call.stop()
+            config.Config.set_pet_zoom(self.zoom)
         
         # 调用上班激励管理器的stop方法，清理其管理的资源
         if hasattr(self, 'work_incentive_manager') and self.work_incentive_manager:
@@ -1358,14 +1021,11 @@ class FinalGIFDesktopPet(wx.Frame):
         
         # 设置自动关闭定时器，使用用户自定义的消失时间
         if self.auto_close_timer:
-            self.auto_close_timer.Stop()
-            self.auto_close_timer.Destroy()
+            self.auto_close_timer.stop()
         
-        self.auto_close_timer = wx.Timer(self)
-        self.Bind(wx.EVT_TIMER, self.on_dialog_auto_close, self.auto_close_timer)
-        self.auto_close_timer.Start(self.work_incentive_manager.config.dialog_duration, oneShot=True)  # 使用自定义的消失时间
+        self.auto_close_timer = get_ticker().call_later(self.work_incentive_manager.config.dialog_duration, self.on_dialog_auto_close)  # 使用自定义的消失时间
     
-    def on_dialog_auto_close(self, event):
+    def on_dialog_auto_close(self):
         """对话框自动关闭事件处理"""
         if self.dialog and self.dialog.IsShown():
             self.dialog.hide_with_animation()
@@ -1396,49 +1056,186 @@ class FinalGIFDesktopPet(wx.Frame):
         
         self.dialog.SetPosition((dialog_pos_x, dialog_pos_y))
     
-    def on_income_timer(self, event):
+    def on_income_timer(self):
         """收益提示定时器事件处理"""
         # 当有月薪配置时才自动弹出收益提示
         if self.work_incentive_manager.config.salary > 0:
             self.show_cute_dialog()
 
-    def change_pet_image(self, new_gif_path):
+    def change_pet_image(self, new_gif_path, frame_scale=None, plan=None):
         """更换宠物形象
         
+        新形象在后台完整加载到独立的帧存储中，期间旧形象照常播放；加载完成后在事件循环中
+        一次性换上（包括调整窗口大小和保持位置），加载失败时丢弃新形象，继续播放旧形象。
+        流式播放的形象无法预先加载完整，首帧到达后即换上。
+        同一形象不同 DPI 的帧变体也通过这里构建。
+        
         Args:
             new_gif_path: 新的GIF文件路径
+            frame_scale: 构建帧时的 DPI 缩放倍数，为 None 时使用窗口当前所在屏幕的倍数
+            plan: 调用方已按同一缩放设置做过的预检方案，为 None 时加载前重新预检
         """
+        # 之前还没换上的新形象作废
+        self.cancel_pending_image()
+        
+        is_petpack = new_gif_path.lower().endswith(".petpack")
+        pending = PendingPetImage(new_gif_path, 1.0 if is_petpack else frame_scale or self.current_dpi_scale())
+        self.pending_image = pending
         try:
-            # 保存当前位置
-            current_pos = self.GetPosition()
-            
-            # 停止当前动画
-            if self.animation_timer:
-                self.animation_timer.Stop()
-                self.animation_timer = None
-            
-            # 清空帧列表
-            self.gif_frames.clear()
-            self.frame_delays.clear()
-            self.current_frame = 0
-            
-            # 更新GIF路径
-            self.GIF_PATH = new_gif_path
-            
-            # 保存用户配置
-            import config
-            config.Config.set_gif_path(new_gif_path)
-            
-            # 重新加载GIF
-            self.load_gif()
-            
-            # 恢复位置
-            self.SetPosition(current_pos)
+            if not os.path.exists(new_gif_path):
+                raise FileNotFoundError(f"GIF 文件不存在: {new_gif_path}")
+            if is_petpack:
+                # 预编译宠物包的分辨率是固定的，按构建时的 DPI 倍数绘制
+                pending.frame_scale = petpack_dpi_scale(new_gif_path)
             
-            # 显示成功消息
-            # wx.MessageBox("宠物形象已成功更换！", "成功", wx.OK | wx.ICON_INFORMATION)
+            pending.frames = self.create_frame_store(new_gif_path)
+            pending.loader = self.start_gif_loader(
+                new_gif_path, pending.frames, self.variant_scaling(pending.frame_scale),
+                on_frame=lambda frame: self.on_pending_frame_loaded(pending, frame),
+                on_done=lambda frame_count: self.on_pending_load_done(pending, frame_count),
+                on_error=lambda error: self.on_pending_load_error(pending, error),
+                plan=plan
+            )
+            print(f"开始后台加载新形象: {new_gif_path}")
         except Exception as e:
-            print(f"更换宠物形象失败: {e}")
-            wx.MessageBox(f"更换宠物形象失败: {e}", "错误", wx.OK | wx.ICON_ERROR)
+            self.on_pending_load_error(pending, e)
+    
+    def on_pending_frame_loaded(self, pending, frame):
+        """新形象解码出一帧时的回调（在主线程中执行）
+        
+        Args:
+            pending: 新形象（PendingPetImage）
+            frame: 解码后的帧数据（DecodedFrame）
+        """
+        # 流式播放的形象在首帧到达后就已换上，之后的帧照常登记
+        committed = pending.frames is self.gif_frames
+        if pending is not self.pending_image and not committed:
+            return
+        
+        pending.frames.append(frame)
+        pending.delays.add(frame.raw_delays)
+        if frame.index == 0:
+            pending.offset = frame.offset or (0, 0)
+            # 流式播放的帧经环形缓冲交付，必须开始播放才能继续解码
+            if isinstance(pending.frames, StreamingFrameStore):
+                self.commit_pending_image(pending)
+        elif committed and len(pending.delays) == 2:
+            self.on_second_frame()
+    
+    def on_pending_load_done(self, pending, frame_count):
+        """新形象全部加载完成时的回调：换上新形象
+        
+        Args:
+            pending: 新形象（PendingPetImage）
+            frame_count: 解码出的总帧数
+        """
+        if pending is self.pending_image:
+            self.commit_pending_image(pending)
+        if pending.frames is self.gif_frames:
+            print(f"成功加载新形象: {pending.path}（共 {frame_count} 帧）")
+            print(f"帧存储统计: {self.gif_frames.stats()}")
+    
+    def on_pending_load_error(self, pending, error):
+        """新形象加载失败时的回调：丢弃新形象，继续播放旧形象
+        
+        Args:
+            pending: 新形象（PendingPetImage）
+            error: 异常对象
+        """
+        if pending.frames is self.gif_frames:
+            # 流式播放的形象已经换上，按普通加载失败处理
+            self.on_gif_load_error(error)
+            return
+        if pending is not self.pending_image:
+            return
+        
+        self.cancel_pending_image()
+        print(f"更换宠物形象失败，继续使用原形象: {error}")
+        wx.MessageBox(f"更换宠物形象失败: {error}", "错误", wx.OK | wx.ICON_ERROR)
+    
+    def cancel_pending_image(self):
+        """取消正在后台加载的新形象并释放其帧存储"""
+        pending, self.pending_image = self.pending_image, None
+        if pending is None:
+            return
+        if pending.loader:
+            pending.loader.cancel()
+        if pending.frames is not None:
+            pending.frames.clear()
+    
+    def commit_pending_image(self, pending):
+        """在事件循环中一次性换上新形象
+        
+        Args:
+            pending: 已加载好的新形象（PendingPetImage）
+        """
+        self.pending_image = None
+        
+        # 停止旧形象的动画和加载（流式播放的旧形象仍在循环解码）
+        if self.animation_timer:
+            self.animation_timer.stop()
+        if self.gif_loader:
+            self.gif_loader.cancel()
+        
+        # 新形象从原始比例开始显示
+        self.stop_bounce()
+        
+        # 同一形象其他 DPI 的帧变体留在缓存中，拖回原来的屏幕时可以立即切换
+        old = PendingPetImage(self.GIF_PATH, self.frame_scale)
+        old.frames, old.delays, old.offset = self.gif_frames, self.frame_delays, self.frame_offset
+        same_image = pending.path == old.path
+        if not same_image:
+            self.frame_variants.clear()
+        
+        self.gif_frames = pending.frames
+        self.frame_delays = pending.delays
+        # 缓存的变体可能是在其他电源模式下加载的
+        self.frame_delays.set_normalize(self.power_profile.normalize_delay)
+        self.frame_scale = pending.frame_scale
+        if isinstance(self.gif_frames, MipmapFrameStore):
+            # 缓存的变体可能是在其他缩放倍数下显示的
+            self.gif_frames.set_zoom(self.zoom)
+        self.current_frame = 0
+        self.gif_loader = pending.loader if isinstance(pending.frames, StreamingFrameStore) else None
+        self.GIF_PATH = pending.path
+        
+        # 新形象可用后才保存用户配置
+        if not same_image:
+            config.Config.set_gif_path(pending.path)
+        
+        self.show_frame(0)
+        self.fit_window_to_frames(pending.offset)
+        self.update_dialog_position()
+        self.start_animation()
+        
+        if (same_image and old.frame_scale != pending.frame_scale and old.frames is not None
+                and not isinstance(old.frames, StreamingFrameStore)):
+            self.frame_variants.put(old.frame_scale, old)
+        elif old.frames is not None:
+            old.frames.clear()
+        
+        if same_image:
+            print(f"已切换到 {pending.frame_scale:g}x 帧变体: {pending.path}")
+        else:
+            print(f"宠物形象已更换: {pending.path}")
+        
+        # 加载期间窗口可能已经被拖到了 DPI 不同的屏幕上
+        self.switch_frame_variant(self.current_dpi_scale())
 
 
+class PendingPetImage:
+    """正在后台加载、尚未换上的新形象（也用于保存暂不显示的帧变体）"""
+    
+    def __init__(self, path, frame_scale=1.0):
+        """初始化新形象
+        
+        Args:
+            path: GIF 或 .petpack 文件路径
+            frame_scale: 构建帧时的 DPI 缩放倍数
+        """
+        self.path = path
+        self.frame_scale = frame_scale
+        self.frames = None   # 独立的帧存储，换上前不参与播放
+        self.delays = FrameDelays()  # 帧延迟列表（保存原始延迟，换上时按当前电源模式规范化）
+        self.offset = (0, 0)  # 裁掉透明边缘后画面相对原始画布的偏移
+        self.loader = None   # 后台加载器
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""电源模式模块
+
+不同电源模式下动画的耗电取舍不同：
+- 最高播放帧率：GIF 帧延迟再短，切换帧的频率也不超过该帧率（按时间线跳帧，整体速度不变）
+- 极短延迟规范化：与浏览器一致，把作者写得过短（通常是 0 或 10ms）的帧延迟当作 100ms
+- 界面动画帧率：按压弹跳、气泡出现/消失动画的刷新频率（总时长不变）
+
+设置为自动时，电脑使用电池供电则切换到省电模式，否则使用均衡模式。
+"""
+
+import glob
+import os
+import sys
+
+AUTO = "auto"
+
+# 极短延迟被规范化后的延迟（毫秒）
+NORMALIZED_DELAY_MS = 100
+
+
+class PowerProfile:
+    """电源模式"""
+
+    def __init__(self, name, label, max_fps, tiny_delay_ms, ui_fps):
+        """初始化电源模式
+
+        Args:
+            name: 配置中使用的名称
+            label: 菜单中显示的名称
+            max_fps: 最高播放帧率
+            tiny_delay_ms: 小于该值的帧延迟规范化为 NORMALIZED_DELAY_MS，0 表示不规范化
+            ui_fps: 弹跳、气泡等界面动画的帧率
+        """
+        self.name = name
+        self.label = label
+        self.max_fps = max_fps
+        self.tiny_delay_ms = tiny_delay_ms
+        self.ui_fps = ui_fps
+
+    @property
+    def min_frame_interval(self):
+        """两次切换帧之间的最短间隔（毫秒）"""
+        return 1000 / self.max_fps
+
+    @property
+    def ui_interval(self):
+        """界面动画每一步的间隔（毫秒）"""
+        return max(1, round(1000 / self.ui_fps))
+
+    def ui_steps(self, duration):
+        """在指定时长内完成的界面动画步数
+
+        Args:
+            duration: 动画总时长（毫秒）
+
+        Returns:
+            int: 步数（至少 2 步）
+        """
+        return max(2, round(duration / self.ui_interval))
+
+    def normalize_delay(self, delay):
+        """按浏览器的做法规范化帧延迟
+
+        Args:
+            delay: GIF 中的帧延迟（毫秒）
+
+        Returns:
+            int: 播放时使用的延迟（毫秒）
+        """
+        if delay < self.tiny_delay_ms:
+            return NORMALIZED_DELAY_MS
+        return max(1, delay)
+
+
+PROFILES = {
+    "performance": PowerProfile("performance", "性能", max_fps=60, tiny_delay_ms=11, ui_fps=60),
+    "balanced": PowerProfile("balanced", "均衡", max_fps=30, tiny_delay_ms=20, ui_fps=30),
+    "battery": PowerProfile("battery", "省电", max_fps=15, tiny_delay_ms=20, ui_fps=20),
+}
+
+
+def _linux_on_battery():
+    """Linux：读取 /sys/class/power_supply，没有外接电源在线且电池正在放电时视为电池供电"""
+    discharging = False
+    for supply in glob.glob("/sys/class/power_supply/*"):
+        try:
+            with open(os.path.join(supply, "type")) as f:
+                kind = f.read().strip()
+            if kind == "Battery":
+                with open(os.path.join(supply, "status")) as f:
+                    discharging = discharging or f.read().strip() == "Discharging"
+            else:
+                with open(os.path.join(supply, "online")) as f:
+                    if f.read().strip() == "1":
+                        return False
+        except OSError:
+            continue
+    return discharging
+
+
+def on_battery():
+    """电脑当前是否使用电池供电
+
+    Returns:
+        bool: 使用电池供电时为 True，无法判断时为 False
+    """
+    # 只有这里需要 wx，电源模式本身（帧率上限、延迟规范化）不依赖界面
+    import wx
+    try:
+        power_type = wx.GetPowerType()
+    except Exception:
+        power_type = wx.POWER_UNKNOWN
+    if power_type != wx.POWER_UNKNOWN:
+        return power_type == wx.POWER_BATTERY
+    if sys.platform.startswith("linux"):
+        return _linux_on_battery()
+    return False
+
+
+def resolve_profile(setting):
+    """把配置中的电源模式解析为具体模式
+
+    Args:
+        setting: "auto" 或 PROFILES 中的名称
+
+    Returns:
+        PowerProfile: 电源模式（未知名称按均衡模式处理）
+    """
+    if setting == AUTO:
+        return PROFILES["battery"] if on_battery() else PROFILES["balanced"]
+    return PROFILES.get(setting, PROFILES["balanced"])
+
+
+_active = PROFILES["balanced"]
+
+
+def active_profile():
+    """获取当前生效的电源模式
+
+    Returns:
+        PowerProfile: 电源模式
+    """
+    return _active
+
+
+def activate(setting):
+    """解析并启用电源模式
+
+    Args:
+        setting: "auto" 或 PROFILES 中的名称
+
+    Returns:
+        PowerProfile: 启用的电源模式
+    """
+    global _active
+    _active = resolve_profile(setting)
+    return _active
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""会话状态模块
+
+检测当前用户会话是否处于锁屏状态。锁屏时宠物不可见，没有必要继续播放动画。
+各平台的检测方式不同，无法检测的平台一律视为未锁屏。
+Linux 上订阅 systemd-logind 会话对象的 Lock / Unlock 信号和 LockedHint 属性变化
+（一个常驻的 gdbus monitor 子进程，由后台线程读取其输出），状态变化时才更新缓存的结果，
+平时不唤醒、不创建子进程；无法订阅时退回按需查询 loginctl，调用方询问时才查询，
+两次查询至少相隔 LINUX_POLL_SECONDS 秒。调用方只读取缓存的结果，界面线程不会被子进程阻塞。
+"""
+
+import atexit
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+# Linux 上无法订阅 logind 信号时，两次查询锁屏状态的最短间隔（秒）
+LINUX_POLL_SECONDS = 30
+
+_LOGIND_SERVICE = "org.freedesktop.login1"
+_LOCKED_HINT_PATTERN = re.compile(r"'LockedHint': <(true|false)>")
+
+
+def _windows_locked():
+    """Windows：锁屏时无法打开接收输入的桌面"""
+    import ctypes
+    user32 = ctypes.windll.user32
+    desktop = user32.OpenInputDesktop(0, False, 0x0100)  # DESKTOP_SWITCHDESKTOP
+    if not desktop:
+        return True
+    user32.CloseDesktop(desktop)
+    return False
+
+
+def _macos_locked():
+    """macOS：读取窗口服务器的会话信息（需要 pyobjc）"""
+    from Quartz import CGSessionCopyCurrentDictionary
+    session = CGSessionCopyCurrentDictionary()
+    return bool(session and session.get("CGSSessionScreenIsLocked", False))
+
+
+def _loginctl(*args):
+    """执行 loginctl show-session 并返回去掉首尾空白的输出"""
+    result = subprocess.run(
+        ["loginctl", "show-session", *args],
+        capture_output=True, text=True, timeout=1, check=True
+    )
+    return result.stdout.strip()
+
+
+def _linux_locked():
+    """Linux：读取 systemd-logind 的 LockedHint"""
+    session_id = os.environ.get("XDG_SESSION_ID", "auto")
+    return _loginctl(session_id, "-p", "LockedHint", "--value") == "yes"
+
+
+def _session_object_path():
+    """Linux：当前会话在 logind 中的 D-Bus 对象路径（信号从这个路径发出）"""
+    session_id = os.environ.get("XDG_SESSION_ID") or _loginctl("auto", "-p", "Id", "--value")
+    return f"/org/freedesktop/login1/session/{bus_path_escape(session_id)}"
+
+
+def bus_path_escape(label):
+    """按 systemd 的规则把会话 ID 转义为对象路径的一段
+
+    字母和数字保持不变，其余字符以及开头的数字转义为 "_" 加两位十六进制。
+
+    Args:
+        label: 会话 ID
+
+    Returns:
+        str: 可用作对象路径一段的字符串
+    """
+    if not label:
+        return "_"
+    return "".join(
+        char if char.isascii() and char.isalnum() and not (index == 0 and char.isdigit())
+        else f"_{ord(char):02x}"
+        for index, char in enumerate(label)
+    )
+
+
+def parse_lock_signal(line):
+    """从 gdbus monitor 输出的一行中解析锁屏状态的变化
+
+    Args:
+        line: gdbus monitor 的一行输出
+
+    Returns:
+        bool: 锁屏（Lock 信号或 LockedHint 变为 true）为 True，解锁为 False；与锁屏无关的行为 None
+    """
+    if "org.freedesktop.login1.Session.Lock " in line:
+        return True
+    if "org.freedesktop.login1.Session.Unlock " in line:
+        return False
+    if "PropertiesChanged" in line:
+        match = _LOCKED_HINT_PATTERN.search(line)
+        if match:
+            return match.group(1) == "true"
+    return None
+
+
+class _LogindDetector:
+    """订阅 logind 会话信号的锁屏检测器，调用时只返回缓存的结果"""
+
+    def __init__(self, poll_interval):
+        """初始化检测器（后台线程在第一次调用时才启动）
+
+        Args:
+            poll_interval: 无法订阅信号时两次查询之间的最短间隔（秒）
+        """
+        self.poll_interval = poll_interval
+        self.locked = False
+        self.error = None
+        self._started = False
+        self._monitoring = False
+        self._polling = False
+        self._last_poll = 0.0
+
+    def __call__(self):
+        """获取最近一次得到的锁屏状态
+
+        订阅不可用时，距上次查询超过间隔才在后台线程中再查询一次。
+
+        Returns:
+            bool: 是否锁屏（第一次查询完成前为 False）
+
+        Raises:
+            Exception: 后台查询出错时抛出该错误
+        """
+        if not self._started:
+            self._started = True
+            threading.Thread(target=self._run, name="SessionLockMonitor", daemon=True).start()
+        elif not self._monitoring and not self._polling and self.error is None:
+            if time.monotonic() - self._last_poll >= self.poll_interval:
+                self._polling = True
+                threading.Thread(target=self._poll, name="SessionLockPoller", daemon=True).start()
+        if self.error is not None:
+            raise self.error
+        return self.locked
+
+    def _poll(self):
+        """查询一次锁屏状态，出错时记录错误"""
+        try:
+            self.locked = _linux_locked()
+        except Exception as e:
+            self.error = e
+        finally:
+            self._last_poll = time.monotonic()
+            self._polling = False
+
+    def _run(self):
+        """后台线程：查询初始状态后订阅信号，订阅不可用或中断时退回按需查询"""
+        self._polling = True
+        self._poll()
+        if self.error is not None:
+            return
+
+        try:
+            process = subprocess.Popen(
+                ["gdbus", "monitor", "--system", "--dest", _LOGIND_SERVICE,
+                 "--object-path", _session_object_path()],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"无法订阅锁屏信号，改为每 {self.poll_interval} 秒按需查询: {e}")
+            return
+
+        atexit.register(process.terminate)
+        self._monitoring = True
+        try:
+            for line in process.stdout:
+                locked = parse_lock_signal(line)
+                if locked is not None:
+                    self.locked = locked
+        finally:
+            self._monitoring = False
+            process.stdout.close()
+        print(f"锁屏信号订阅已结束，改为每 {self.poll_interval} 秒按需查询")
+
+
+if sys.platform == "win32":
+    _detector = _windows_locked
+elif sys.platform == "darwin":
+    _detector = _macos_locked
+elif sys.platform.startswith("linux"):
+    _detector = _LogindDetector(LINUX_POLL_SECONDS)
+else:
+    _detector = None
+
+
+def is_session_locked():
+    """当前会话是否处于锁屏状态
+
+    Returns:
+        bool: 是否锁屏；当前平台无法检测时返回 False
+    """
+    global _detector
+    if _detector is None:
+        return False
+    try:
+        return _detector()
+    except Exception as e:
+        # 缺少依赖或系统不支持时不再重复尝试
+        print(f"无法检测锁屏状态，将不再检测: {e}")
+        _detector = None
+        return False
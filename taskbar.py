@@ -9,6 +9,9 @@ import wx
 import os
 import sys
 
+import config
+import power
+
 
 class PetTaskBarIcon:
     """宠物应用的托盘图标类（兼容模式）"""
@@ -80,6 +83,21 @@ class PetTaskBarIcon:
             custom_texts_item.setEnabled_(True)
             menu.addItem_(custom_texts_item)
             
+            # 创建电源模式子菜单
+            power_item = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_("电源模式", None, "")
+            power_menu = NSMenu.alloc().init()
+            self._power_items = {}
+            for name, label in self.power_profile_choices():
+                action = "onPower" + name.capitalize()
+                item = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_(label, action, "")
+                item.setTarget_(self)
+                item.setEnabled_(True)
+                item.setState_(1 if name == config.Config.POWER_PROFILE else 0)
+                power_menu.addItem_(item)
+                self._power_items[name] = item
+            power_item.setSubmenu_(power_menu)
+            menu.addItem_(power_item)
+            
             # 创建退出菜单项
             exit_item = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_("退出", "onExit", "")
             exit_item.setTarget_(self)
@@ -94,6 +112,7 @@ class PetTaskBarIcon:
             self._change_image_item = change_image_item
             self._work_incentive_item = work_incentive_item
             self._custom_texts_item = custom_texts_item
+            self._power_item = power_item
             self._exit_item = exit_item
             
             self.taskbar_supported = True
@@ -123,6 +142,22 @@ class PetTaskBarIcon:
         """自定义提示语菜单项的回调方法"""
         self.on_custom_texts(None)
     
+    def onPowerAuto(self):
+        """电源模式「自动」菜单项的回调方法"""
+        self.on_power_profile(power.AUTO)
+    
+    def onPowerPerformance(self):
+        """电源模式「性能」菜单项的回调方法"""
+        self.on_power_profile("performance")
+    
+    def onPowerBalanced(self):
+        """电源模式「均衡」菜单项的回调方法"""
+        self.on_power_profile("balanced")
+    
+    def onPowerBattery(self):
+        """电源模式「省电」菜单项的回调方法"""
+        self.on_power_profile("battery")
+    
     def onExit(self):
         """退出菜单项的回调方法"""
         self.on_exit(None)
@@ -154,16 +189,15 @@ class PetTaskBarIcon:
                     try:
                         # 使用PIL从GIF文件创建静态图标（取第一帧）
                         from PIL import Image
+                        from gif_player import image_to_bitmap, resize_image, resolve_quality
                         img = Image.open(icon_path)
-                        # 转换为RGB模式
-                        img = img.convert('RGB')
-                        # 调整大小适合托盘
-                        img = img.resize((16, 16), Image.Resampling.LANCZOS)
-                        # 转换为wx.Image
-                        wx_img = wx.Image(img.width, img.height)
-                        wx_img.SetData(img.tobytes())
-                        # 转换为图标
-                        icon = wx.Icon(wx_img.ConvertToBitmap())
+                        # 转换为RGBA模式（保留透明度）
+                        img = img.convert('RGBA')
+                        # 调整大小适合托盘（与宠物形象使用相同的缩放质量设置）
+                        quality = resolve_quality(self.frame.create_frame_scaling().quality, 1, img.width, img.height)
+                        img = resize_image(img, (16, 16), quality)
+                        # 直接从RGBA数据创建位图并转换为图标
+                        icon = wx.Icon(image_to_bitmap(img))
                     except Exception as e:
                         print(f"使用PIL创建托盘图标失败: {e}")
                         # 回退到wxPython的GIF加载
@@ -186,13 +220,16 @@ class PetTaskBarIcon:
                 # 获取事件类型
                 if taskbar_module == wx:
                     evt_taskbar_left_down = wx.EVT_TASKBAR_LEFT_DOWN
+                    evt_taskbar_right_down = wx.EVT_TASKBAR_RIGHT_DOWN
                     evt_menu = wx.EVT_MENU
                 else:
                     evt_taskbar_left_down = wx.adv.EVT_TASKBAR_LEFT_DOWN
+                    evt_taskbar_right_down = wx.adv.EVT_TASKBAR_RIGHT_DOWN
                     evt_menu = wx.EVT_MENU
                 
                 # 绑定点击事件
                 self.taskbar_icon.Bind(evt_taskbar_left_down, self.on_left_click)
+                self.taskbar_icon.Bind(evt_taskbar_right_down, self.on_right_click)
                 
                 # 保存事件类型供后续使用
                 self.evt_menu = evt_menu
@@ -220,12 +257,48 @@ class PetTaskBarIcon:
         custom_texts_item = menu.Append(wx.ID_ANY, "自定义提示语")
         self.taskbar_icon.Bind(self.evt_menu, self.on_custom_texts, custom_texts_item)
         
+        # 电源模式子菜单（立即生效）
+        power_menu = wx.Menu()
+        for name, label in self.power_profile_choices():
+            power_item = power_menu.AppendRadioItem(wx.ID_ANY, label)
+            power_item.Check(name == config.Config.POWER_PROFILE)
+            self.taskbar_icon.Bind(self.evt_menu, lambda evt, n=name: self.on_power_profile(n), power_item)
+        menu.AppendSubMenu(power_menu, "电源模式")
+        
         # 退出菜单项
         exit_item = menu.Append(wx.ID_EXIT, "退出")
         self.taskbar_icon.Bind(self.evt_menu, self.on_exit, exit_item)
         
         return menu
     
+    @staticmethod
+    def power_profile_choices():
+        """电源模式菜单的选项
+        
+        Returns:
+            list: (配置名称, 菜单文字) 列表
+        """
+        return [(power.AUTO, "自动（电池供电时省电）")] + [(profile.name, profile.label) for profile in power.PROFILES.values()]
+    
+    def on_right_click(self, event):
+        """托盘图标右键点击事件（显示菜单）"""
+        menu = self.CreatePopupMenu()
+        if menu:
+            self.taskbar_icon.PopupMenu(menu)
+            menu.Destroy()
+    
+    def on_power_profile(self, name):
+        """电源模式菜单项点击事件"""
+        if not self.taskbar_supported:
+            return
+        
+        # 切换主窗口的电源模式
+        self.frame.set_power_profile(name)
+        
+        # macOS 菜单常驻，更新勾选状态
+        for item_name, item in getattr(self, "_power_items", {}).items():
+            item.setState_(1 if item_name == name else 0)
+    
     def on_left_click(self, event):
         """托盘图标左键点击事件"""
         if not self.taskbar_supported:
@@ -236,6 +309,8 @@ class PetTaskBarIcon:
             self.frame.Hide()
         else:
             self.frame.Show()
+        # 隐藏时挂起动画，重新显示时恢复（部分平台 Show/Hide 不产生 EVT_SHOW）
+        self.frame.update_playback_visibility()
     
     def on_work_incentive(self, event):
         """上班激励菜单项点击事件"""
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""重复帧合并测试（不依赖 wx）"""
+
+from PIL import Image
+
+from gif_player.decoder import DecodedFrame
+from gif_player.dedupe import coalesce_frames
+
+RED = (255, 0, 0, 255)
+GREEN = (0, 255, 0, 255)
+BLUE = (0, 0, 255, 255)
+
+
+def make_sequence(colors_and_delays):
+    """按 (颜色, 延迟) 列表生成 (图像, DecodedFrame) 序列"""
+    frames = []
+    for index, (color, delay) in enumerate(colors_and_delays):
+        image = Image.new("RGBA", (4, 4), color)
+        frames.append((image, DecodedFrame.from_image(index, image, delay)))
+    return frames
+
+
+def summarize(frames):
+    """把合并结果整理为 (编号, 延迟, 共享的帧编号) 列表"""
+    return [(frame.index, frame.delay, frame.alias_of) for _, frame in frames]
+
+
+def test_consecutive_duplicates_are_merged():
+    """连续相同的帧合并为一帧，延迟相加"""
+    frames = make_sequence([(RED, 10), (RED, 20), (RED, 30), (GREEN, 40), (BLUE, 50), (BLUE, 60)])
+    result = list(coalesce_frames(frames))
+    assert summarize(result) == [(0, 60, None), (1, 40, None), (2, 110, None)]
+
+
+def test_total_duration_is_preserved():
+    """合并前后的总播放时长不变"""
+    frames = make_sequence([(RED, 10), (GREEN, 20), (GREEN, 30), (RED, 40), (RED, 50)])
+    total = sum(frame.delay for _, frame in frames)
+    assert sum(frame.delay for _, frame in coalesce_frames(frames)) == total
+
+
+def test_non_adjacent_duplicates_share_bitmap():
+    """不相邻的重复帧引用第一次出现的帧，不再携带像素数据"""
+    frames = make_sequence([(RED, 10), (GREEN, 20), (RED, 30)])
+    result = list(coalesce_frames(frames))
+    assert summarize(result) == [(0, 10, None), (1, 20, None), (2, 30, 0)]
+    assert result[2][1].rgba == b""
+
+
+def test_sharing_disabled_keeps_pixels():
+    """增量编码时不共享位图，不相邻的重复帧仍保留完整像素"""
+    frames = make_sequence([(RED, 10), (GREEN, 20), (RED, 30)])
+    result = list(coalesce_frames(frames, share_duplicates=False))
+    assert summarize(result) == [(0, 10, None), (1, 20, None), (2, 30, None)]
+    assert len(result[2][1].rgba) == 4 * 4 * 4
+
+
+def test_single_frame_and_empty_input():
+    """单帧原样产出，空序列不产出任何帧"""
+    assert summarize(coalesce_frames(make_sequence([(RED, 70)]))) == [(0, 70, None)]
+    assert list(coalesce_frames([])) == []
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""解码帧磁盘缓存测试（不依赖 wx）"""
+
+import os
+
+from PIL import Image
+
+from gif_player.cache import CachedFrames, FrameCache, FrameFileWriter
+from gif_player.scaling import FrameScaling
+
+
+def make_frames(count=3, size=(8, 6)):
+    """生成每帧颜色不同的 RGBA 测试帧"""
+    return [Image.new("RGBA", size, (index * 40, 255 - index * 40, 7, 255)) for index in range(count)]
+
+
+def write_gif(path, color):
+    """写一个单帧 GIF 作为缓存的源文件"""
+    Image.new("RGB", (4, 4), color).save(path)
+
+
+def test_cache_round_trip(tmp_path):
+    """写入后读回的帧数据、帧延迟与写入时一致"""
+    gif_path = str(tmp_path / "pet.gif")
+    write_gif(gif_path, (255, 0, 0))
+    cache = FrameCache(str(tmp_path / "cache"), 1024 * 1024)
+    key = cache.make_key(gif_path, FrameScaling())
+    frames = make_frames()
+
+    writer = cache.open_writer(key, gif_path)
+    for index, image in enumerate(frames):
+        writer.append(image, 10 * (index + 1))
+    writer.commit()
+
+    cached = cache.load(key)
+    assert cached is not None
+    assert len(cached) == 3
+    assert cached.delays == [10, 20, 30]
+    for (image, frame), expected in zip(cached.iter_frames(), frames):
+        assert (frame.width, frame.height) == expected.size
+        assert image.tobytes() == expected.tobytes()
+    cached.close()
+
+    # 缓存目录中不残留临时文件
+    assert [name for name in os.listdir(cache.cache_dir) if name.endswith(".tmp")] == []
+
+
+def test_trim_is_applied_when_writing(tmp_path):
+    """启用裁剪时写入器把帧裁剪到所有帧不透明区域的并集，并记录偏移"""
+    path = str(tmp_path / "frames.cache")
+    first = Image.new("RGBA", (10, 10), (0, 0, 0, 0))
+    first.paste((255, 0, 0, 255), (2, 3, 5, 6))
+    second = Image.new("RGBA", (10, 10), (0, 0, 0, 0))
+    second.paste((0, 255, 0, 255), (4, 4, 7, 8))
+
+    writer = FrameFileWriter(path, trim=True)
+    writer.append(first, 50)
+    writer.append(second, 50)
+    writer.finish({})
+
+    cached = CachedFrames(path)
+    assert (cached.width, cached.height) == (5, 5)
+    assert cached.meta["trim"] == {"box": [2, 3, 7, 8], "offset": [2, 3]}
+    images = [image.copy() for image, _ in cached.iter_frames()]
+    cached.close()
+    assert images[0].tobytes() == first.crop((2, 3, 7, 8)).tobytes()
+    assert images[1].tobytes() == second.crop((2, 3, 7, 8)).tobytes()
+
+
+def test_stale_entry_removed_when_source_changes(tmp_path):
+    """源文件内容变化后写入新缓存时，删除同一源文件的旧缓存"""
+    gif_path = str(tmp_path / "pet.gif")
+    cache = FrameCache(str(tmp_path / "cache"), 1024 * 1024)
+    scaling = FrameScaling()
+
+    write_gif(gif_path, (255, 0, 0))
+    old_key = cache.make_key(gif_path, scaling)
+    writer = cache.open_writer(old_key, gif_path)
+    writer.append(make_frames(1)[0], 100)
+    writer.commit()
+    assert os.path.exists(cache.entry_path(old_key))
+
+    write_gif(gif_path, (0, 0, 255))
+    new_key = cache.make_key(gif_path, scaling)
+    assert new_key != old_key
+    writer = cache.open_writer(new_key, gif_path)
+    assert not os.path.exists(cache.entry_path(old_key))
+    writer.append(make_frames(1)[0], 100)
+    writer.commit()
+    assert cache.load(old_key) is None
+    cached = cache.load(new_key)
+    assert cached is not None
+    cached.close()
+
+
+def test_corrupt_entry_is_discarded(tmp_path):
+    """写入未完成（缺少文件尾）的缓存文件读取时视为未命中并被删除"""
+    gif_path = str(tmp_path / "pet.gif")
+    write_gif(gif_path, (255, 0, 0))
+    cache = FrameCache(str(tmp_path / "cache"), 1024 * 1024)
+    key = cache.make_key(gif_path, FrameScaling())
+    writer = cache.open_writer(key, gif_path)
+    writer.append(make_frames(1)[0], 100)
+    writer.commit()
+
+    path = cache.entry_path(key)
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 4)
+
+    assert cache.load(key) is None
+    assert not os.path.exists(path)
+
+
+def test_concurrent_writers_use_separate_temp_files(tmp_path):
+    """同一进程内同时写入同一目标时各自使用独立的临时文件，先提交的结果不被破坏"""
+    path = str(tmp_path / "frames.cache")
+    red, blue = make_frames(2)
+    first = FrameFileWriter(path)
+    second = FrameFileWriter(path)
+    assert first.tmp_path != second.tmp_path
+
+    first.append(red, 10)
+    second.append(blue, 20)
+    first.finish({})
+    cached = CachedFrames(path)
+    assert cached.delays == [10]
+    assert next(cached.iter_frames())[0].tobytes() == red.tobytes()
+    cached.close()
+
+    second.finish({})
+    cached = CachedFrames(path)
+    assert cached.delays == [20]
+    cached.close()
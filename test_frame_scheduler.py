@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""帧调度器测试（不依赖 wx）"""
+
+from gif_player.scheduler import FrameScheduler
+
+
+class FakeClock:
+    """可以手动拨动的单调时钟（秒），内部按整数毫秒计时，避免浮点误差累积"""
+
+    def __init__(self):
+        self.ms = 0
+
+    def __call__(self):
+        return self.ms / 1000
+
+    def advance(self, ms):
+        self.ms += ms
+
+
+def test_start_waits_until_first_deadline():
+    """起播后等待到第一帧结束，每次按时触发都前进一帧"""
+    clock = FakeClock()
+    scheduler = FrameScheduler([100, 50, 200], clock=clock)
+    assert scheduler.start() == 100
+
+    clock.advance(100)
+    assert scheduler.tick() == (1, 50)
+    clock.advance(50)
+    assert scheduler.tick() == (2, 200)
+    clock.advance(200)
+    assert scheduler.tick() == (0, 100)
+    assert scheduler.stats()["skipped"] == 0
+    assert scheduler.stats()["cycle_ms"] == 350
+
+
+def test_deadlines_do_not_accumulate_lateness():
+    """定时器晚触发时下一帧的等待时间相应缩短，截止时间不随之后移"""
+    clock = FakeClock()
+    scheduler = FrameScheduler([100, 100, 100], clock=clock)
+    scheduler.start()
+
+    clock.advance(130)
+    assert scheduler.tick() == (1, 70)
+    stats = scheduler.stats()
+    assert stats["max_late_ms"] == 30
+    assert stats["avg_late_ms"] == 30
+
+
+def test_late_tick_skips_to_current_frame():
+    """落后超过一帧时直接跳到当前应当显示的帧，并统计跳过的帧数"""
+    clock = FakeClock()
+    scheduler = FrameScheduler([100] * 5, clock=clock)
+    scheduler.start()
+
+    clock.advance(350)
+    assert scheduler.tick() == (3, 50)
+    assert scheduler.skipped == 2
+
+    # 跨过循环末尾时按播放顺序计数
+    clock.advance(250)
+    assert scheduler.tick() == (1, 100)
+    assert scheduler.skipped == 4
+
+
+def test_resume_follows_original_timeline():
+    """停止后 resume 得到的帧就像播放从未中断，停止期间经过的帧不计入跳帧"""
+    clock = FakeClock()
+    scheduler = FrameScheduler([100, 100, 100], clock=clock)
+    scheduler.start()
+    scheduler.stop()
+    assert not scheduler.running
+
+    clock.advance(1020)
+    assert scheduler.resume() == (1, 80)
+    assert scheduler.running
+    assert scheduler.skipped == 0
+
+
+def test_start_restarts_timeline_at_frame():
+    """start 从指定帧的开始处重新计时"""
+    clock = FakeClock()
+    scheduler = FrameScheduler([100, 40, 60], clock=clock)
+    scheduler.start()
+    clock.advance(500)
+    assert scheduler.start(2) == 60
+    clock.advance(60)
+    assert scheduler.tick() == (0, 100)
+
+
+def test_appended_delays_join_the_cycle():
+    """后台加载追加到延迟列表的帧自动加入循环"""
+    clock = FakeClock()
+    delays = [100]
+    scheduler = FrameScheduler(delays, clock=clock)
+    scheduler.start()
+
+    delays.append(50)
+    clock.advance(100)
+    assert scheduler.tick() == (1, 50)
+    assert scheduler.stats()["cycle_ms"] == 150
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""二值透明转换测试（不依赖 wx）"""
+
+from PIL import Image
+
+from gif_player.decoder import DecodedFrame
+from gif_player.mask import apply_binary_alpha
+from gif_player.scaling import QUALITY_NEAREST, resize_image
+
+
+def make_frame(image):
+    """由 RGBA 图像生成帧数据"""
+    return DecodedFrame.from_image(0, image, 100)
+
+
+def sprite():
+    """透明背景上一个不透明方块的 8x8 图像（Alpha 只有 0 和 255）"""
+    image = Image.new("RGBA", (8, 8), (0, 0, 0, 0))
+    image.paste((200, 50, 50, 255), (2, 2, 6, 6))
+    return image
+
+
+def test_binary_frame_uses_mask():
+    """Alpha 只有 0 和 255 的帧改为 RGB 加掩码"""
+    image = sprite()
+    frame = make_frame(image)
+    assert apply_binary_alpha(frame, image) == "mask"
+    assert frame.rgba == b""
+    assert len(frame.rgb) == 8 * 8 * 3
+
+
+def test_opaque_frame_needs_no_mask():
+    """完全不透明的帧不需要掩码"""
+    image = Image.new("RGBA", (4, 4), (1, 2, 3, 255))
+    frame = make_frame(image)
+    assert apply_binary_alpha(frame, image) == "opaque"
+    assert frame.mask is None
+
+
+def test_smoothed_edges_keep_full_alpha():
+    """LANCZOS 缩放在边缘产生半透明像素的帧保留完整 Alpha，不丢失抗锯齿边缘"""
+    image = sprite().resize((5, 5), Image.Resampling.LANCZOS)
+    assert any(image.getchannel("A").histogram()[1:255])
+    frame = make_frame(image)
+    rgba = frame.rgba
+    assert apply_binary_alpha(frame, image) == "rgba"
+    assert frame.rgba == rgba
+
+
+def test_nearest_scaling_keeps_mask_path():
+    """最近邻缩放不产生半透明像素，缩放后的帧仍走掩码路径"""
+    image = resize_image(sprite(), (5, 5), QUALITY_NEAREST)
+    frame = make_frame(image)
+    assert apply_binary_alpha(frame, image) == "mask"
+
+
+def test_threshold_forces_mask():
+    """启用阈值时半透明像素按 50% 归入掩码，所有帧都走掩码路径"""
+    image = sprite().resize((5, 5), Image.Resampling.LANCZOS)
+    frame = make_frame(image)
+    assert apply_binary_alpha(frame, image, threshold=True) == "mask"
+    expected = image.getchannel("A").point(lambda value: 255 if value >= 128 else 0).convert("1")
+    assert frame.mask == expected.tobytes()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""电源模式测试：帧延迟规范化和帧率上限（不依赖 wx）"""
+
+from gif_player.decoder import DecodedFrame
+from gif_player.dedupe import coalesce_frames
+from gif_player.scheduler import FrameDelays, FrameScheduler
+from power import NORMALIZED_DELAY_MS, PROFILES, resolve_profile
+
+
+def test_tiny_delays_are_normalized():
+    """低于阈值的延迟按浏览器的做法当作 100ms，其余保持不变"""
+    balanced = PROFILES["balanced"]
+    assert balanced.normalize_delay(0) == NORMALIZED_DELAY_MS
+    assert balanced.normalize_delay(10) == NORMALIZED_DELAY_MS
+    assert balanced.normalize_delay(19) == NORMALIZED_DELAY_MS
+    assert balanced.normalize_delay(20) == 20
+    assert balanced.normalize_delay(250) == 250
+
+
+def test_performance_profile_keeps_short_delays():
+    """性能模式的阈值更低，只把 0 和 10ms 这类延迟规范化"""
+    performance = PROFILES["performance"]
+    assert performance.normalize_delay(10) == NORMALIZED_DELAY_MS
+    assert performance.normalize_delay(11) == 11
+    assert performance.normalize_delay(16) == 16
+
+
+def played_delays(colors, normalize_delay):
+    """把每帧 5ms 的帧序列合并重复帧后，按原始延迟规范化得到的播放延迟列表"""
+    frames = [(None, DecodedFrame(index, 1, 1, bytes(color), 5)) for index, color in enumerate(colors)]
+    delays = FrameDelays(normalize_delay)
+    for _, frame in coalesce_frames(frames):
+        delays.add(frame.raw_delays)
+    return delays
+
+
+def test_normalizing_before_coalescing_is_independent_of_duplicates():
+    """逐个规范化原始延迟再求和：3 帧相同的 5ms 帧与 3 帧不同的 5ms 帧总时长一致"""
+    normalize_delay = PROFILES["balanced"].normalize_delay
+    identical = played_delays([(1, 1, 1, 255)] * 3, normalize_delay)
+    distinct = played_delays([(1, 1, 1, 255), (2, 2, 2, 255), (3, 3, 3, 255)], normalize_delay)
+    assert identical == [3 * NORMALIZED_DELAY_MS]
+    assert sum(distinct) == sum(identical)
+
+
+def test_switching_profile_renormalizes_in_place():
+    """更换规范化规则时按保存的原始延迟原地重新计算，列表仍是同一个对象"""
+    delays = played_delays([(1, 1, 1, 255)] * 2 + [(2, 2, 2, 255)], PROFILES["balanced"].normalize_delay)
+    assert delays == [2 * NORMALIZED_DELAY_MS, NORMALIZED_DELAY_MS]
+    assert delays.raw == [(5, 5), (5,)]
+
+    same = delays
+    assert delays.set_normalize(None)
+    assert same == [10, 5]
+    assert not delays.set_normalize(None)
+
+
+def test_reload_delays_keeps_current_frame():
+    """帧延迟原地修改后调度器从当前帧的开始处按新的延迟重新计时"""
+    now = [0]
+    delays = FrameDelays()
+    for raw in ([10], [10], [10]):
+        delays.add(raw)
+    scheduler = FrameScheduler(delays, clock=lambda: now[0] / 1000)
+    scheduler.start()
+    now[0] = 15
+    assert scheduler.tick() == (1, 5)
+
+    delays.set_normalize(PROFILES["balanced"].normalize_delay)
+    assert scheduler.reload_delays() == NORMALIZED_DELAY_MS
+    assert scheduler.stats()["cycle_ms"] == 3 * NORMALIZED_DELAY_MS
+    now[0] += NORMALIZED_DELAY_MS
+    assert scheduler.tick() == (2, NORMALIZED_DELAY_MS)
+
+
+def test_min_interval_limits_frame_switches():
+    """帧延迟短于最短切换间隔时，按时间线跳帧，等待时间不短于该间隔"""
+    now = [0]
+    scheduler = FrameScheduler([10] * 10, clock=lambda: now[0] / 1000,
+                               min_interval=PROFILES["battery"].min_frame_interval)
+    assert scheduler.start() >= 66
+
+    now[0] = 67
+    frame, wait = scheduler.tick()
+    assert frame == 6
+    assert wait >= 66
+    assert scheduler.skipped == 5
+
+
+def test_set_min_interval_restarts_from_current_frame():
+    """切换电源模式后从当前帧的开始处按新的间隔重新计时"""
+    now = [0]
+    scheduler = FrameScheduler([10] * 10, clock=lambda: now[0] / 1000, min_interval=0)
+    assert scheduler.start() == 10
+    assert scheduler.set_min_interval(PROFILES["balanced"].min_frame_interval) == 34
+
+
+def test_unknown_setting_falls_back_to_balanced():
+    """未知的电源模式名称按均衡模式处理"""
+    assert resolve_profile("turbo") is PROFILES["balanced"]
+    assert resolve_profile("battery") is PROFILES["battery"]
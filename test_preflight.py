@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""GIF 预检和抽帧测试（不依赖 wx）"""
+
+import random
+
+import pytest
+from PIL import Image
+
+from gif_player.decoder import decimate_frames, iter_decoded_frames
+from gif_player.preflight import GifInfo, inspect_gif, plan_gif_load
+from gif_player.scaling import FrameScaling
+
+DELAYS = [30, 40, 50, 60, 70]
+
+
+@pytest.fixture
+def gif_bytes(tmp_path):
+    """5 帧 32x32 的噪点 GIF（噪点使每帧的像素数据足够长，便于在帧中间截断）"""
+    rng = random.Random(1)
+    frames = [Image.frombytes("RGB", (32, 32), bytes(rng.randrange(256) for _ in range(32 * 32 * 3)))
+              for _ in DELAYS]
+    path = tmp_path / "noise.gif"
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=DELAYS, loop=0)
+    return path.read_bytes()
+
+
+def write(tmp_path, data, name="cut.gif"):
+    """把字节写入临时 GIF 文件并返回路径"""
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def decodable_frames(path):
+    """Pillow 在遇到截断前能够解码出的帧数"""
+    count = 0
+    try:
+        for _ in iter_decoded_frames(path):
+            count += 1
+    except OSError:
+        pass
+    return count
+
+
+def test_inspect_complete_gif(tmp_path, gif_bytes):
+    """完整文件：读出画布尺寸、帧数和总时长"""
+    path = write(tmp_path, gif_bytes)
+    info = inspect_gif(path)
+    assert (info.width, info.height) == (32, 32)
+    assert info.frame_count == 5
+    assert info.duration == sum(DELAYS)
+    assert info.file_size == len(gif_bytes)
+
+
+def test_inspect_gif_truncated_inside_frame(tmp_path, gif_bytes):
+    """在帧的像素数据中间截断：只计入之前完整的帧，与 Pillow 能解码出的帧数一致"""
+    path = write(tmp_path, gif_bytes[:int(len(gif_bytes) * 0.7)])
+    info = inspect_gif(path)
+    assert 0 < info.frame_count < 5
+    assert info.frame_count == decodable_frames(path)
+    assert info.duration == sum(DELAYS[:info.frame_count])
+
+
+@pytest.mark.parametrize("length", [6, 12, 13, 200, 700])
+def test_inspect_gif_truncated_before_first_frame(tmp_path, gif_bytes, length):
+    """在文件头、颜色表或首帧之前截断：以 ValueError 拒绝"""
+    path = write(tmp_path, gif_bytes[:length])
+    with pytest.raises(ValueError):
+        inspect_gif(path)
+
+
+def test_inspect_rejects_non_gif(tmp_path):
+    """不是 GIF 的文件以 ValueError 拒绝"""
+    path = write(tmp_path, b"\x89PNG\r\n\x1a\n" + b"\0" * 32, "fake.gif")
+    with pytest.raises(ValueError):
+        inspect_gif(path)
+
+
+def test_decimate_keeps_total_duration():
+    """抽帧时被丢弃帧的延迟累加到保留的帧上，总时长不变，保留的帧重新编号"""
+    composed = [(index, f"frame{index}", delay) for index, delay in enumerate([10, 20, 30, 40, 50, 60, 70])]
+    kept = list(decimate_frames(composed, 3))
+    assert kept == [(0, "frame0", 60), (1, "frame3", 150), (2, "frame6", 70)]
+    assert sum(delay for _, _, delay in kept) == sum(delay for _, _, delay in composed)
+
+
+def test_decimate_step_one_keeps_everything():
+    """抽帧间隔为 1 时原样保留所有帧"""
+    composed = [(index, index, 10 + index) for index in range(4)]
+    assert list(decimate_frames(composed, 1)) == composed
+
+
+def test_plan_decimates_when_over_frame_limit():
+    """帧数超出上限时按抽帧间隔保留，不超过上限"""
+    info = GifInfo(100, 100, 1001, 100100, 0)
+    plan = plan_gif_load(info, FrameScaling(1.0), max_frames=400)
+    assert plan.frame_step == 3
+    assert plan.adjusted
+    assert plan.scaling.target_size(100, 100) == (100, 100)
+
+
+def test_plan_scales_down_to_decoded_budget():
+    """解码后总字节数超出预算时自动缩小到预算内"""
+    info = GifInfo(1000, 1000, 10, 1000, 0)
+    budget = 8 * 1024 * 1024
+    plan = plan_gif_load(info, FrameScaling(1.0), max_decoded_bytes=budget)
+    width, height = plan.scaling.target_size(1000, 1000)
+    assert width * height * 4 * 10 <= budget
+    assert plan.frame_step == 1
+
+
+def test_plan_rejects_oversized_canvas():
+    """画布超出像素上限时拒绝加载"""
+    info = GifInfo(5000, 5000, 1, 100, 0)
+    with pytest.raises(ValueError):
+        plan_gif_load(info, FrameScaling(0.5), max_canvas_pixels=16_000_000)
+
+
+def test_plan_without_limits_is_unchanged():
+    """不设预算时不调整加载方案"""
+    info = GifInfo(360, 392, 101, 5050, 0)
+    plan = plan_gif_load(info, FrameScaling(0.5))
+    assert not plan.adjusted
+    assert plan.frame_step == 1
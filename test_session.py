@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""锁屏信号解析测试（不依赖 wx）"""
+
+from session import bus_path_escape, parse_lock_signal
+
+SESSION_PATH = "/org/freedesktop/login1/session/_32"
+
+
+def test_session_id_is_escaped_like_systemd():
+    """开头的数字和非字母数字字符转义为 "_" 加十六进制"""
+    assert bus_path_escape("2") == "_32"
+    assert bus_path_escape("c1") == "c1"
+    assert bus_path_escape("a-b") == "a_2db"
+    assert bus_path_escape("") == "_"
+
+
+def test_lock_and_unlock_signals():
+    """Lock / Unlock 信号分别表示锁屏和解锁"""
+    assert parse_lock_signal(f"{SESSION_PATH}: org.freedesktop.login1.Session.Lock ()\n") is True
+    assert parse_lock_signal(f"{SESSION_PATH}: org.freedesktop.login1.Session.Unlock ()\n") is False
+
+
+def test_locked_hint_property_change():
+    """LockedHint 属性变化给出当前的锁屏状态"""
+    line = (f"{SESSION_PATH}: org.freedesktop.DBus.Properties.PropertiesChanged "
+            "('org.freedesktop.login1.Session', {'LockedHint': <true>}, @as [])\n")
+    assert parse_lock_signal(line) is True
+    assert parse_lock_signal(line.replace("<true>", "<false>")) is False
+
+
+def test_unrelated_lines_are_ignored():
+    """其他属性变化和 gdbus 的提示信息不改变状态"""
+    line = (f"{SESSION_PATH}: org.freedesktop.DBus.Properties.PropertiesChanged "
+            "('org.freedesktop.login1.Session', {'IdleHint': <true>}, @as [])\n")
+    assert parse_lock_signal(line) is None
+    assert parse_lock_signal("The name org.freedesktop.login1 is owned by :1.3\n") is None
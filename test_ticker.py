@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""统一定时调度测试（用手动触发的定时器代替 wx.Timer，不依赖 wx）"""
+
+from gif_player.scheduler import FrameScheduler
+from ticker import Ticker
+
+
+class FakeClock:
+    """可以手动拨动的单调时钟（秒），内部按整数毫秒计时"""
+
+    def __init__(self):
+        self.ms = 0
+
+    def __call__(self):
+        return self.ms / 1000
+
+
+class ManualTimer:
+    """记录设定时间、由测试手动触发的一次性定时器"""
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.delay = None
+        self.starts = 0
+
+    def StartOnce(self, delay):
+        self.delay = delay
+        self.starts += 1
+
+    def Stop(self):
+        self.delay = None
+
+    def IsRunning(self):
+        return self.delay is not None
+
+
+def make_ticker(coalesce_ms=4):
+    """创建使用假时钟和手动定时器的调度器
+
+    Returns:
+        tuple: (调度器, 时钟, 获取当前定时器的函数)
+    """
+    clock = FakeClock()
+    timers = []
+
+    def factory(callback):
+        timers.append(ManualTimer(callback))
+        return timers[-1]
+
+    return Ticker(coalesce_ms, clock, factory), clock, lambda: timers[-1] if timers else None
+
+
+def fire(clock, timer):
+    """把时钟拨到定时器设定的唤醒时间并触发"""
+    clock.ms += timer.delay
+    timer.delay = None
+    timer.callback()
+
+
+def test_close_deadlines_share_one_wakeup():
+    """截止时间相差不超过合并窗口的任务在同一次唤醒中执行"""
+    ticker, clock, timer = make_ticker(coalesce_ms=4)
+    calls = []
+    ticker.call_later(100, lambda: calls.append("a"))
+    ticker.call_later(103, lambda: calls.append("b"))
+    ticker.call_later(110, lambda: calls.append("c"))
+    assert timer().delay == 100
+
+    fire(clock, timer())
+    assert calls == ["a", "b"]
+    assert timer().delay == 10
+
+    fire(clock, timer())
+    assert calls == ["a", "b", "c"]
+    assert ticker.stats() == {"wakeups": 2, "runs": 3, "scheduled": 0}
+    assert not timer().IsRunning()
+
+
+def test_periodic_task_keeps_its_cadence():
+    """周期任务以原截止时间为基准推进，晚触发不会让之后的节奏后移"""
+    ticker, clock, timer = make_ticker()
+    calls = []
+    ticker.call_every(50, lambda: calls.append(clock.ms))
+
+    clock.ms += 53
+    timer().callback()
+    assert timer().delay == 47
+    fire(clock, timer())
+    assert calls == [53, 100]
+
+
+def test_stopping_last_task_stops_timer():
+    """取消最后一个任务时立即停止定时器，不再产生空的唤醒"""
+    ticker, clock, timer = make_ticker()
+    task = ticker.call_every(30, lambda: None)
+    assert timer().IsRunning()
+    task.stop()
+    assert not timer().IsRunning()
+    assert ticker.stats()["scheduled"] == 0
+
+
+def test_rescheduled_task_runs_once_at_new_time():
+    """重新安排的任务只按新时间执行一次，堆中的旧条目失效，也不会在旧时间空唤醒"""
+    ticker, clock, timer = make_ticker()
+    calls = []
+    task = ticker.call_later(20, lambda: calls.append(clock.ms))
+    task.start(60)
+    assert timer().delay == 60
+
+    fire(clock, timer())
+    assert calls == [60]
+    assert ticker.stats()["wakeups"] == 1
+
+
+def test_task_scheduled_during_run_arms_after_batch():
+    """任务回调中安排的新任务在这一批执行完后统一设定定时器"""
+    ticker, clock, timer = make_ticker()
+    calls = []
+    ticker.call_later(10, lambda: ticker.call_later(25, lambda: calls.append(clock.ms)))
+
+    fire(clock, timer())
+    assert timer().delay == 25
+    fire(clock, timer())
+    assert calls == [35]
+
+
+def test_exact_task_is_not_run_early():
+    """精确任务不在合并窗口内提前执行，普通任务推迟到它的截止时间一起执行"""
+    ticker, clock, timer = make_ticker(coalesce_ms=4)
+    calls = []
+    ticker.call_later(98, lambda: calls.append(("ui", clock.ms)))
+    ticker.call_later(100, lambda: calls.append(("frame", clock.ms)), exact=True)
+    assert timer().delay == 100
+
+    fire(clock, timer())
+    assert calls == [("ui", 100), ("frame", 100)]
+    assert ticker.stats()["wakeups"] == 1
+
+
+def test_animation_with_periodic_task_needs_no_extra_wakeups():
+    """动画（精确任务）与周期任务同时运行：每次唤醒都切换一帧，不产生补等几毫秒的唤醒"""
+    ticker, clock, timer = make_ticker(coalesce_ms=4)
+    scheduler = FrameScheduler([100] * 10, clock=clock)
+    frames = []
+    ui_runs = []
+
+    def on_frame():
+        frame, wait = scheduler.tick()
+        frames.append(frame)
+        animation.start(wait)
+
+    animation = ticker.call_later(scheduler.start(), on_frame, exact=True)
+    ticker.call_every(98, lambda: ui_runs.append(clock.ms))
+
+    for _ in range(4):
+        fire(clock, timer())
+    # 周期任务在 98、196 时推迟到帧的截止时间一起执行，294 与 300 相差超过合并窗口，单独唤醒
+    assert frames == [1, 2, 3]
+    assert ui_runs == [100, 200, 294]
+    assert clock.ms == 300
+    assert ticker.stats()["wakeups"] == 4
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""透明边缘裁剪测试（不依赖 wx）"""
+
+from PIL import Image
+
+from gif_player.decoder import DecodedFrame
+from gif_player.trim import trim_frames
+
+
+def make_frames(boxes, size=(10, 10)):
+    """生成每帧只有 box 区域不透明的 (图像, DecodedFrame) 序列"""
+    frames = []
+    for index, box in enumerate(boxes):
+        image = Image.new("RGBA", size, (0, 0, 0, 0))
+        image.paste((index * 40, 0, 0, 255), box)
+        frames.append((image, DecodedFrame.from_image(index, image, 10 * (index + 1))))
+    return frames
+
+
+def test_frames_are_cropped_to_union_box():
+    """所有帧裁剪到不透明区域的并集，帧编号和延迟保持不变"""
+    frames = make_frames([(2, 3, 5, 6), (4, 4, 7, 8)])
+    originals = [image.copy() for image, _ in frames]
+    box, trimmed = trim_frames(iter(frames))
+    assert box == (2, 3, 7, 8)
+
+    trimmed = list(trimmed)
+    assert [(frame.index, frame.delay) for _, frame in trimmed] == [(0, 10), (1, 20)]
+    for original, (image, frame) in zip(originals, trimmed):
+        assert (frame.width, frame.height) == image.size == (5, 5)
+        assert frame.rgba == original.crop(box).tobytes()
+
+
+def test_nothing_to_trim_keeps_frames():
+    """不透明区域铺满整帧时不裁剪，帧原样产出"""
+    frames = make_frames([(0, 0, 10, 10), (3, 3, 4, 4)])
+    box, trimmed = trim_frames(iter(frames))
+    assert box is None
+    assert [frame for _, frame in trimmed] == [frame for _, frame in frames]
+
+
+def test_empty_sequence():
+    """空序列没有包围盒，也不产出帧"""
+    box, trimmed = trim_frames(iter([]))
+    assert box is None
+    assert list(trimmed) == []
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""统一定时调度模块
+
+宠物的 GIF 动画、按压弹跳、气泡的出现/消失动画、气泡自动关闭和收益提示原本各用一个
+wx.Timer，彼此独立地唤醒进程。这里把所有周期任务和一次性任务复用到同一个定时器上：
+到点时把截止时间相差不到几毫秒的任务合并在同一次唤醒中执行，然后只睡到下一个真实的
+截止时间；没有任务时定时器完全停止，宠物空闲时不再产生无用的唤醒。
+对截止时间敏感的任务（如按时间线切换帧）登记为精确任务：它们从不提前执行（提前执行时
+帧调度器会发现截止时间未到，再等 1~4ms，反而多一次唤醒），合并窗口内的普通任务改为
+推迟到精确任务的截止时间一起执行。
+调度逻辑本身不依赖 wx，底层的一次性定时器可以替换（默认使用 wx.Timer）。
+"""
+
+import heapq
+import time
+import traceback
+
+import config
+
+
+class TickTask:
+    """挂在统一定时器上的任务（周期或一次性）"""
+
+    def __init__(self, ticker, callback, interval=0, exact=False):
+        """初始化任务
+
+        Args:
+            ticker: 所属的 Ticker
+            callback: 到点时调用的函数（无参数）
+            interval: 周期（毫秒），0 表示一次性任务
+            exact: 是否为精确任务（不在截止时间之前执行）
+        """
+        self.ticker = ticker
+        self.callback = callback
+        self.interval = interval
+        self.exact = exact
+        self.deadline = None    # 下一次执行的截止时间（毫秒，单调时钟），None 表示未启动
+        self._generation = 0    # 每次重新安排时递增，使堆中旧的条目失效
+
+    @property
+    def running(self):
+        """是否已安排执行"""
+        return self.deadline is not None
+
+    def start(self, delay=None):
+        """安排任务（已安排时改为新的时间）
+
+        Args:
+            delay: 距离首次执行的毫秒数，为 None 时使用周期
+        """
+        self.ticker._schedule(self, self.interval if delay is None else delay)
+
+    def stop(self):
+        """取消任务"""
+        self.deadline = None
+        self._generation += 1
+        self.ticker._disarm_if_idle()
+
+
+class Ticker:
+    """用单个 wx.Timer 复用所有定时任务的调度器"""
+
+    def __init__(self, coalesce_ms=4, clock=time.monotonic, timer_factory=None):
+        """初始化调度器
+
+        Args:
+            coalesce_ms: 截止时间相差不超过该毫秒数的任务合并到同一次唤醒中执行
+            clock: 返回秒数的单调时钟
+            timer_factory: 创建底层定时器的函数，参数为到点时调用的函数，返回支持 StartOnce / Stop / IsRunning 的对象；为 None 时使用 wx.Timer
+        """
+        self.coalesce_ms = coalesce_ms
+        self.clock = clock
+        self.timer_factory = timer_factory or _create_wx_timer
+        self._heap = []         # (截止时间, 序号, 任务代数, 任务)
+        self._counter = 0
+        self._timer = None
+        self._armed_at = None   # 定时器当前设定的唤醒时间
+        self._running_tasks = False
+        self.wakeups = 0        # 定时器唤醒次数
+        self.runs = 0           # 任务执行次数
+
+    def _now(self):
+        return self.clock() * 1000
+
+    def call_later(self, delay, callback, exact=False):
+        """安排一次性任务
+
+        Args:
+            delay: 延迟（毫秒）
+            callback: 到点时调用的函数
+            exact: 是否为精确任务（不在截止时间之前执行，合并窗口内的普通任务推迟到它一起执行）
+
+        Returns:
+            TickTask: 任务，可再次 start 重新安排
+        """
+        task = TickTask(self, callback, exact=exact)
+        task.start(delay)
+        return task
+
+    def call_every(self, interval, callback, exact=False):
+        """安排周期任务（第一次在一个周期后执行）
+
+        Args:
+            interval: 周期（毫秒）
+            callback: 每次到点时调用的函数
+            exact: 同 call_later
+
+        Returns:
+            TickTask: 任务
+        """
+        task = TickTask(self, callback, max(1, interval), exact)
+        task.start()
+        return task
+
+    def _schedule(self, task, delay):
+        """把任务放入堆中并按需提前唤醒时间"""
+        task._generation += 1
+        task.deadline = self._now() + max(0, delay)
+        self._counter += 1
+        heapq.heappush(self._heap, (task.deadline, self._counter, task._generation, task))
+        # 正在执行任务时由 _on_timer 在结束后统一设置定时器
+        if not self._running_tasks:
+            self._arm()
+
+    def _next_deadline(self):
+        """丢弃堆顶已取消或已重新安排的条目，返回最近的截止时间"""
+        heap = self._heap
+        while heap and heap[0][2] != heap[0][3]._generation:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def _wake_time(self):
+        """下一次唤醒的时间
+
+        通常是最近的截止时间；最近的任务是普通任务、而合并窗口内还有精确任务时，
+        推迟到最早的那个精确任务的截止时间，两者在同一次唤醒中执行。
+
+        Returns:
+            float: 唤醒时间（毫秒，单调时钟），没有任务时为 None
+        """
+        first = self._next_deadline()
+        if first is None or self._heap[0][3].exact:
+            return first
+        limit = first + self.coalesce_ms
+        exact_deadlines = [deadline for deadline, _, generation, task in self._heap
+                           if task.exact and generation == task._generation and deadline <= limit]
+        return min(exact_deadlines) if exact_deadlines else first
+
+    def _disarm_if_idle(self):
+        """没有任务时立即停止定时器，不再产生一次空的唤醒"""
+        if not self._running_tasks and self._next_deadline() is None:
+            self._arm()
+
+    def _arm(self):
+        """把定时器设置到下一个截止时间，没有任务时停止定时器"""
+        wake = self._wake_time()
+        if wake is None:
+            if self._timer is not None and self._timer.IsRunning():
+                self._timer.Stop()
+            self._armed_at = None
+            return
+
+        # 唤醒时间没有变化时无需重设
+        if self._armed_at == wake and self._timer.IsRunning():
+            return
+
+        if self._timer is None:
+            self._timer = self.timer_factory(self._on_timer)
+        self._armed_at = wake
+        self._timer.StartOnce(max(1, int(wake - self._now() + 0.999)))
+
+    def _on_timer(self):
+        """定时器到点：执行所有在合并窗口内到期的普通任务和已经到期的精确任务"""
+        self.wakeups += 1
+        self._armed_at = None
+        self._running_tasks = True
+        try:
+            now = self._now()
+            limit = now + self.coalesce_ms
+            due = []
+            not_yet = []
+            while True:
+                deadline = self._next_deadline()
+                if deadline is None or deadline > limit:
+                    break
+                entry = heapq.heappop(self._heap)
+                if entry[3].exact and deadline > now:
+                    # 精确任务不提前执行，放回堆中
+                    not_yet.append(entry)
+                else:
+                    due.append(entry[2:])
+            for entry in not_yet:
+                heapq.heappush(self._heap, entry)
+
+            for generation, task in due:
+                # 同一批中先执行的任务可能取消或重新安排了后面的任务
+                if task._generation == generation:
+                    self._run(task)
+        finally:
+            self._running_tasks = False
+            self._arm()
+
+    def _run(self, task):
+        """执行一个到期的任务，周期任务按原定节奏安排下一次"""
+        if task.interval:
+            # 以原截止时间为基准推进，避免误差累积；落后超过一个周期时从现在重新计时
+            next_deadline = task.deadline + task.interval
+            now = self._now()
+            task.start(next_deadline - now if next_deadline > now else task.interval)
+        else:
+            task.deadline = None
+
+        self.runs += 1
+        try:
+            task.callback()
+        except Exception as e:
+            print(f"定时任务执行失败: {e}")
+            traceback.print_exc()
+
+    def stats(self):
+        """获取调度统计
+
+        Returns:
+            dict: 定时器唤醒次数、任务执行次数、当前安排的任务数
+        """
+        self._next_deadline()
+        return {
+            "wakeups": self.wakeups,
+            "runs": self.runs,
+            "scheduled": len({id(entry[3]) for entry in self._heap if entry[2] == entry[3]._generation}),
+        }
+
+
+def _create_wx_timer(callback):
+    """创建 Ticker 使用的 wx.Timer（在这里才导入 wx）
+
+    Args:
+        callback: 定时器到点时调用的函数
+
+    Returns:
+        wx.Timer: 定时器
+    """
+    import wx
+
+    class _TickTimer(wx.Timer):
+        def Notify(self):
+            callback()
+
+    return _TickTimer()
+
+
+_ticker = None
+
+
+def get_ticker():
+    """获取全局共享的调度器（在主线程中使用）
+
+    Returns:
+        Ticker: 调度器
+    """
+    global _ticker
+    if _ticker is None:
+        _ticker = Ticker(config.Config.TICK_COALESCE_MS)
+    return _ticker
@@ -1,5 +1,6 @@
 import datetime
 import wx
+from ticker import get_ticker
 from .config import WorkIncentiveConfig
 from .dialog import WorkIncentiveDialog
 from .custom_texts_dialog import CustomTextsDialog
@@ -29,15 +30,12 @@ class WorkIncentiveManager:
             
             # 检查是否需要重启收益提示定时器
             if self.income_timer:
-                self.income_timer.Stop()
-                self.income_timer.Destroy()
+                self.income_timer.stop()
                 self.income_timer = None
             
             # 如果设置了薪资，启动收益提示定时器
             if self.config.salary > 0:
-                self.income_timer = wx.Timer(self.pet)
-                self.pet.Bind(wx.EVT_TIMER, self.on_income_timer, self.income_timer)
-                self.income_timer.Start(self.config.remind_interval * 1000)  # 转换为毫秒
+                self.income_timer = get_ticker().call_every(self.config.remind_interval * 1000, self.on_income_timer)  # 转换为毫秒
         
         dlg.Destroy()
     
@@ -72,22 +70,19 @@ class WorkIncentiveManager:
             traceback.print_exc()
         
         if self.auto_close_timer:
-            self.auto_close_timer.Stop()
-            self.auto_close_timer.Destroy()
+            self.auto_close_timer.stop()
             self.auto_close_timer = None
     
     def stop(self):
         """停止并清理资源"""
         if self.auto_close_timer:
-            self.auto_close_timer.Stop()
-            self.auto_close_timer.Destroy()
+            self.auto_close_timer.stop()
             self.auto_close_timer = None
         
         if self.income_timer:
-            self.income_timer.Stop()
-            self.income_timer.Destroy()
+            self.income_timer.stop()
             self.income_timer = None
     
-    def on_income_timer(self, event):
+    def on_income_timer(self):
         """收益提示定时器事件处理"""
         self.show_income_hint()
\ No newline at end of file